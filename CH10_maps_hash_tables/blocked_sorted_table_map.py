@@ -0,0 +1,192 @@
+from map_base_abc import MapBase
+
+from bisect import bisect_left, bisect_right
+
+class BlockedSortedTableMap(MapBase):
+    """Sorted map stored as a list of bounded-size sorted blocks.
+
+    Offers the same find_* accessors as SortedTableMap. Keys and values are
+    kept in parallel lists of blocks, self._keys and self._values, and
+    self._maxes holds the largest key of each block. A search bisects
+    self._maxes to pick a block, then bisects inside that block. An insert or
+    delete only shifts the items of one block, so with blocks of about
+    sqrt(n) items it costs O(sqrt(n)) instead of the O(n) of one big list.
+    Scans still walk contiguous lists.
+    """
+
+    ### nonpublic behaviors ###
+    def _locate(self, k, right=False):
+        """Return (block, index) position of the first key >= k, or of the
+        first key > k if right is True. Return (len(self._keys), 0) if no key
+        qualifies."""
+        search = bisect_right if right else bisect_left
+        b = search(self._maxes, k)
+        if b == len(self._maxes):
+            return (b, 0)
+        return (b, search(self._keys[b], k)) # in range, since _maxes[b] >= k
+
+    def _previous(self, b, i):
+        """Return position just before (b, i), or None if (b, i) is first."""
+        if i > 0:
+            return (b, i - 1)
+        if b > 0:
+            return (b - 1, len(self._keys[b - 1]) - 1)
+        return None
+
+    def _pair(self, pos):
+        """Return (key, value) pair at position pos, or None if pos is past
+        the end of the map (or is None)."""
+        if pos is None or pos[0] == len(self._keys):
+            return None
+        b, i = pos
+        return (self._keys[b][i], self._values[b][i])
+
+    def _split(self, b: int) -> None:
+        """Split block b into two halves."""
+        keys, values = self._keys[b], self._values[b]
+        half = len(keys) // 2
+        self._keys.insert(b + 1, keys[half:])
+        self._values.insert(b + 1, values[half:])
+        del keys[half:]
+        del values[half:]
+        self._maxes[b] = keys[-1]
+        self._maxes.insert(b + 1, self._keys[b + 1][-1])
+
+    def _merge(self, b: int) -> None:
+        """Merge block b into the block before it (b must be at least 1)."""
+        self._keys[b - 1].extend(self._keys[b])
+        self._values[b - 1].extend(self._values[b])
+        del self._keys[b]
+        del self._values[b]
+        del self._maxes[b]
+        self._maxes[b - 1] = self._keys[b - 1][-1]
+        if len(self._keys[b - 1]) > 2 * self._load:
+            self._split(b - 1)
+
+    ### public behaviors ###
+    def __init__(self, load=1000):
+        """Create an empty map.
+
+        Args:
+            load (int): Target block size. Blocks split when they grow past
+                2 * load items, and merge with a neighbor when they shrink to
+                load // 2 items or fewer.
+        """
+        self._load = load
+        self._keys = [] # list of sorted key blocks
+        self._values = [] # self._values[b][i] goes with self._keys[b][i]
+        self._maxes = [] # self._maxes[b] is the last key of block b
+        self._n = 0
+
+    def __len__(self):
+        """Return number of items in the map."""
+        return self._n
+
+    def __getitem__(self, k):
+        """Return value associated with key k (raise KeyError if not found)."""
+        b, i = self._locate(k)
+        if b == len(self._keys) or self._keys[b][i] != k:
+            raise KeyError('Key Error: ' + repr(k))
+        return self._values[b][i]
+
+    def __setitem__(self, k, v):
+        """Assign value v to key k, overwriting existing value if present."""
+        if not self._maxes: # first item starts the first block
+            self._keys.append([k])
+            self._values.append([v])
+            self._maxes.append(k)
+            self._n = 1
+            return
+        b, i = self._locate(k)
+        if b == len(self._keys): # k is a new maximum; append to last block
+            b -= 1
+            self._keys[b].append(k)
+            self._values[b].append(v)
+            self._maxes[b] = k
+        elif self._keys[b][i] == k: # key k is already in the map
+            self._values[b][i] = v
+            return
+        else:
+            self._keys[b].insert(i, k) # only shifts this block
+            self._values[b].insert(i, v)
+        self._n += 1
+        if len(self._keys[b]) > 2 * self._load:
+            self._split(b)
+
+    def __delitem__(self, k):
+        """Remove item associated with key k (raise KeyError if not found)."""
+        b, i = self._locate(k)
+        if b == len(self._keys) or self._keys[b][i] != k:
+            raise KeyError('Key Error: ' + repr(k))
+        keys = self._keys[b]
+        del keys[i]
+        del self._values[b][i]
+        self._n -= 1
+        if len(keys) > self._load // 2:
+            self._maxes[b] = keys[-1]
+        elif len(self._keys) > 1: # block is small; merge with a neighbor
+            self._merge(b if b > 0 else 1)
+        elif keys:
+            self._maxes[b] = keys[-1]
+        else: # map is now empty
+            self._keys.clear()
+            self._values.clear()
+            self._maxes.clear()
+
+    def __iter__(self):
+        """Generate the keys of the map ordered from minimum to maximum."""
+        for keys in self._keys:
+            yield from keys
+
+    def __reversed__(self):
+        """Generate keys of the map ordered from maximum to minimum."""
+        for keys in reversed(self._keys):
+            yield from reversed(keys)
+
+    def find_min(self):
+        """Return (key, value) pair with minimum key (or None if empty)."""
+        if self._n > 0:
+            return (self._keys[0][0], self._values[0][0])
+        else:
+            return None
+
+    def find_max(self):
+        """Return (key, value) pair with maximum key (or None if empty)."""
+        if self._n > 0:
+            return (self._keys[-1][-1], self._values[-1][-1])
+        else:
+            return None
+
+    def find_ge(self, k):
+        """Return (key, value) pair with least key greater than or equal to k."""
+        return self._pair(self._locate(k))
+
+    def find_le(self, k):
+        """Return (key, value) pair with greatest key less than or equal to k."""
+        return self._pair(self._previous(*self._locate(k, right=True)))
+
+    def find_lt(self, k):
+        """Return (key, value) pair with greatest key strictly less than k."""
+        return self._pair(self._previous(*self._locate(k)))
+
+    def find_gt(self, k):
+        """Return (key, value) pair with least key strictly greater than k."""
+        return self._pair(self._locate(k, right=True))
+
+    def find_range(self, start, stop):
+        """Iterate all (key, value) pairs such that start <= key < stop.
+
+        If start is None, iteration begins with minimum key of map.
+        If stop is None, iteration continues through the maximum key of map.
+        """
+        b, i = (0, 0) if start is None else self._locate(start)
+        if stop is None:
+            end_b, end_i = len(self._keys), 0
+        else:
+            end_b, end_i = self._locate(stop)
+        while (b, i) < (end_b, end_i):
+            keys, values = self._keys[b], self._values[b]
+            stop_i = end_i if b == end_b else len(keys)
+            for j in range(i, stop_i):
+                yield (keys[j], values[j])
+            b, i = b + 1, 0
@@ -6,10 +6,11 @@ class ChainHashMap(HashMapBase):
     """Hash map implemented with separate chaining for collision resolution."""
 
     
-    def _bucket_getitem(self, j, k):
+    def _bucket_getitem(self, j, k, h=None):
         """
         Args:
             j (int): the hash value for key k.
+            h (int): the full, uncompressed hash code of key k.
         """
         bucket = self._table[j] # Each bucket gets its own table (python list).
                                 #   This is the heart of what makes this a chaining
@@ -17,27 +18,42 @@ class ChainHashMap(HashMapBase):
                                 #   one _table.
         if bucket is None:
             raise KeyError('Key Error: ' + repr(k)) # no match found
-        return bucket[k] # may raise KeyError
+        if h is None:
+            h = self._hash_code(k)
+        return bucket._getitem_hashed(k, h) # may raise KeyError
+
+    def _bucket_setitem(self, j, k, v, h=None) -> bool:
+        """Return True if key k was new to the map, False if overwritten.
 
-    def _bucket_setitem(self, j, k, v) -> None:
-        """
         Args:
             v (object): The new value to set. 
         """
-        if self._table[j] is None:
-            self._table[j] = UnsortedTableMap() # bucket is new to the table
-        oldsize = len(self._table[j])
-        self._table[j][k] = v
-        if len(self._table[j]) > oldsize: # key was new to the table
+        bucket = self._table[j]
+        if bucket is None:
+            bucket = self._table[j] = UnsortedTableMap() # bucket is new to the table
+        if h is None:
+            h = self._hash_code(k)
+        if bucket._setitem_hashed(k, v, h): # key was new to the table
             self._n += 1 # increase overall map size
+            return True
+        return False
 
-    def _bucket_delitem(self, j, k):
+    def _bucket_delitem(self, j, k, h=None):
         bucket = self._table[j]
         if bucket is None:
             raise KeyError('Key Error: ' + repr(k)) # no match found
-        del bucket[k] # may raise KeyError (this recursively calls this function
+        if h is None:
+            h = self._hash_code(k)
+        bucket._delitem_hashed(k, h) # may raise KeyError
+
+    def _bucket_items(self, j):
+        """Return list of the items stored in the bucket at index j."""
+        bucket = self._table[j]
+        if bucket is None:
+            return []
+        return list(bucket._table) # copy, since caller may delete from bucket
 
-    def __iter__(self):
+    def _iter_keys(self):
         for bucket in self._table:
             if bucket is not None: # a nonempty slot
                 for key in bucket:
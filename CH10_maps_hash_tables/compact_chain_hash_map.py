@@ -0,0 +1,104 @@
+from chain_hash_map import ChainHashMap
+
+class CompactChainHashMap(ChainHashMap):
+    """Hash map implemented with separate chaining, using light buckets.
+
+    A slot holding a single item stores that _HashItem inline. Only slots
+    with two or more colliding keys get a _Chain, which keeps the keys,
+    values and hash codes in flat parallel lists. At load factor 0.5 most
+    nonempty slots hold one item, so most need no bucket object at all.
+    """
+
+    class _Chain:
+        """Bucket of two or more colliding items, stored column-wise."""
+        __slots__ = '_keys', '_values', '_hashes'
+
+        def __init__(self, keys, values, hashes):
+            self._keys = keys
+            self._values = values
+            self._hashes = hashes
+
+        def _index(self, k, h):
+            """Return index of key k having hash code h, or -1 if absent."""
+            keys = self._keys
+            for i, stored in enumerate(self._hashes):
+                if stored == h and k == keys[i]:
+                    return i
+            return -1
+
+    def _bucket_getitem(self, j, k, h=None):
+        slot = self._table[j]
+        if slot is not None:
+            if h is None:
+                h = self._hash_code(k)
+            if slot.__class__ is CompactChainHashMap._Chain:
+                i = slot._index(k, h)
+                if i >= 0:
+                    return slot._values[i]
+            elif slot._hash == h and k == slot._key:
+                return slot._value
+        raise KeyError('Key Error: ' + repr(k))
+
+    def _bucket_setitem(self, j, k, v, h=None) -> bool:
+        """Return True if key k was new to the map, False if overwritten."""
+        if h is None:
+            h = self._hash_code(k)
+        slot = self._table[j]
+        if slot is None:
+            self._table[j] = self._HashItem(k, v, h) # singleton stored inline
+        elif slot.__class__ is CompactChainHashMap._Chain:
+            i = slot._index(k, h)
+            if i >= 0:
+                slot._values[i] = v
+                return False
+            slot._keys.append(k)
+            slot._values.append(v)
+            slot._hashes.append(h)
+        elif slot._hash == h and k == slot._key:
+            slot._value = v
+            return False
+        else: # second key in this slot; promote singleton to a chain
+            self._table[j] = self._Chain([slot._key, k], [slot._value, v],
+                                         [slot._hash, h])
+        self._n += 1
+        return True
+
+    def _bucket_delitem(self, j, k, h=None):
+        slot = self._table[j]
+        if slot is not None:
+            if h is None:
+                h = self._hash_code(k)
+            if slot.__class__ is CompactChainHashMap._Chain:
+                i = slot._index(k, h)
+                if i >= 0:
+                    slot._keys.pop(i)
+                    slot._values.pop(i)
+                    slot._hashes.pop(i)
+                    if len(slot._keys) == 1: # demote back to a singleton
+                        self._table[j] = self._HashItem(slot._keys[0],
+                                                        slot._values[0],
+                                                        slot._hashes[0])
+                    return
+            elif slot._hash == h and k == slot._key:
+                self._table[j] = None
+                return
+        raise KeyError('Key Error: ' + repr(k))
+
+    def _bucket_items(self, j):
+        """Return list of the items stored in the slot at index j."""
+        slot = self._table[j]
+        if slot is None:
+            return []
+        if slot.__class__ is CompactChainHashMap._Chain:
+            return [self._HashItem(k, v, h) for (k, v, h)
+                    in zip(slot._keys, slot._values, slot._hashes)]
+        return [slot]
+
+    def _iter_keys(self):
+        for slot in self._table:
+            if slot is None:
+                continue
+            if slot.__class__ is CompactChainHashMap._Chain:
+                yield from slot._keys
+            else:
+                yield slot._key
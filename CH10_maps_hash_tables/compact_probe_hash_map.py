@@ -0,0 +1,118 @@
+from array import array
+
+from hash_map_base_abc import HashMapBase
+
+class CompactProbeHashMap(HashMapBase):
+    """Hash map using linear probing over a compact index array, with keys,
+    values and full hash codes kept in parallel entry lists.
+
+    Like CPython's dict, the probed table holds only small integers that
+    point into the entry lists, so no _Item object is allocated per entry and
+    probes reject most mismatches by comparing stored hash codes.
+    """
+    _EMPTY = -1 # index slot never used
+    _DUMMY = -2 # index slot whose entry was deleted
+    _DELETED = object() # sentinel left in the entry lists after a deletion
+
+    def _reset_table(self, c: int) -> None:
+        self._table = array('q', [CompactProbeHashMap._EMPTY]) * c
+        self._keys = [] # entries in insertion order
+        self._values = []
+        self._hashes = array('q') # full hash code of each entry's key
+        self._n = 0
+        self._deleted = 0 # dead entries in the entry lists. Each _DUMMY slot
+            # has one, and reusing the slot leaves it behind, so counting the
+            # entries makes HashMapBase's cleanup threshold compact the lists.
+
+    def _find_slot(self, j, k, h):
+        """Search for key k, having hash code h, starting at index j.
+
+        Return (success, index) tuple as follows:
+            If match found, success is True and index denotes the index-array
+                slot pointing to the match.
+            If no match found, success is False and index denotes first
+                available slot.
+        """
+        table = self._table
+        keys = self._keys
+        hashes = self._hashes
+        first_avail = None
+        while True:
+            e = table[j]
+            if e == CompactProbeHashMap._EMPTY:
+                return (False, j if first_avail is None else first_avail)
+            if e == CompactProbeHashMap._DUMMY:
+                if first_avail is None:
+                    first_avail = j
+            elif hashes[e] == h and (keys[e] is k or keys[e] == k):
+                return (True, j) # only call __eq__ when the hashes agree
+            j = (j + 1) % len(table)
+
+    def _bucket_getitem(self, j, k, h=None):
+        if h is None:
+            h = self._hash_code(k)
+        found, s = self._find_slot(j, k, h)
+        if not found:
+            raise KeyError('Key Error: ' + repr(k))
+        return self._values[self._table[s]]
+
+    def _bucket_setitem(self, j, k, v, h=None):
+        if h is None:
+            h = self._hash_code(k)
+        found, s = self._find_slot(j, k, h)
+        if not found: # a reused _DUMMY slot's dead entry still counts
+            self._table[s] = len(self._keys) # new entry goes at the end
+            self._keys.append(k)
+            self._values.append(v)
+            self._hashes.append(h)
+            self._n += 1
+        else:
+            self._values[self._table[s]] = v
+
+    def _bucket_delitem(self, j, k, h=None):
+        if h is None:
+            h = self._hash_code(k)
+        found, s = self._find_slot(j, k, h)
+        if not found:
+            raise KeyError('Key Error: ' + repr(k))
+        e = self._table[s]
+        self._table[s] = CompactProbeHashMap._DUMMY
+        self._deleted += 1
+        self._keys[e] = CompactProbeHashMap._DELETED
+        self._values[e] = None # release reference to the value
+
+    def _bucket_items(self, j):
+        """Return list of the items stored at index j."""
+        e = self._table[j]
+        if e < 0:
+            return []
+        return [self._HashItem(self._keys[e], self._values[e], self._hashes[e])]
+
+    def _rehash(self, c: int) -> None:
+        """Rebuild index array at capacity c, dropping deleted entries.
+
+        Keys are placed from their stored hash codes, so nothing is rehashed
+        and no key comparisons are needed.
+        """
+        live = [e for e in range(len(self._keys))
+                if self._keys[e] is not CompactProbeHashMap._DELETED]
+        keys = [self._keys[e] for e in live]
+        values = [self._values[e] for e in live]
+        hashes = array('q', (self._hashes[e] for e in live))
+        self._reset_table(c)
+        table = self._table
+        for e in range(len(keys)):
+            j = self._compress(hashes[e])
+            while table[j] != CompactProbeHashMap._EMPTY:
+                j = (j + 1) % c
+            table[j] = e
+        self._keys = keys
+        self._values = values
+        self._hashes = hashes
+        self._n = len(keys)
+
+    def _iter_keys(self):
+        """Generate keys in insertion order."""
+        for k in self._keys:
+            if k is not CompactProbeHashMap._DELETED:
+                yield k
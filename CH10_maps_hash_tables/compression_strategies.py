@@ -0,0 +1,127 @@
+"""Compression functions mapping a full hash code to a table index.
+
+A HashMapBase map takes one of these as its compression argument. Each
+strategy provides:
+    compress(h, n): index in range(n) for hash code h
+    compress_many(hashes, n): list of indices for a batch of hash codes
+    capacity(c): smallest table capacity >= c that the strategy can work with
+The map passes every capacity it resizes to through capacity(), so a strategy
+that needs, say, power-of-two tables always gets one.
+"""
+
+import random
+
+try:
+    import numpy as np
+except ImportError: # compress_many falls back to a pure-Python loop
+    np = None
+
+_MASK64 = (1 << 64) - 1
+
+def _int64_array(hashes):
+    """Return hashes as a NumPy int64 array, or None if NumPy is missing or a
+    code doesn't fit in 64 bits."""
+    if np is None or len(hashes) < 2:
+        return None
+    try:
+        return np.array(hashes, dtype=np.int64)
+    except OverflowError: # hash codes wider than 64 bits
+        return None
+
+class MADCompression:
+    """Multiply-add-divide: ((h * scale + shift) mod p) mod n, with p prime
+    and scale and shift drawn at random.
+
+    Because p is prime, the result spreads well for any table size n, so any
+    capacity is valid. Costs two modulo operations per index.
+    """
+
+    def __init__(self, p=109345121, scale=None, shift=None):
+        """Create a MAD function for prime p.
+
+        Args:
+            p (int): A large prime number.
+            scale (int): Scale from 1 to p-1; random if None.
+            shift (int): Shift from 0 to p-1; random if None.
+        """
+        self._prime = p
+        self._scale = 1 + random.randrange(p - 1) if scale is None else scale
+        self._shift = random.randrange(p) if shift is None else shift
+
+    def capacity(self, c: int) -> int:
+        return max(c, 1)
+
+    def compress(self, h: int, n: int) -> int:
+        return (h * self._scale + self._shift) % self._prime % n
+
+    def compress_many(self, hashes, n: int) -> list:
+        p = self._prime
+        # Reducing mod p first leaves the same residue, and keeps
+        #   (h * scale + shift) inside int64 as long as p and scale are small
+        #   enough; NumPy would wrap around silently otherwise.
+        arr = None
+        if (p - 1) * self._scale + self._shift < 1 << 63:
+            arr = _int64_array(hashes)
+        if arr is None:
+            return [self.compress(h, n) for h in hashes]
+        return (((arr % p) * self._scale + self._shift) % p % n).tolist()
+
+class FibonacciCompression:
+    """Multiplicative ("Fibonacci") hashing into a power-of-two table.
+
+    Multiplies the hash code by 2**64 divided by the golden ratio, mod 2**64,
+    and keeps the top log2(n) bits. That takes a multiply and a shift, with
+    no modulo, and mixes the high bits of h into the index too.
+    """
+    _GOLDEN = 0x9E3779B97F4A7C15 # 2**64 / golden ratio, rounded to odd
+
+    def capacity(self, c: int) -> int:
+        return 1 << max(c - 1, 0).bit_length() # next power of two
+
+    def compress(self, h: int, n: int) -> int:
+        return ((h * self._GOLDEN) & _MASK64) >> (65 - n.bit_length())
+
+    def compress_many(self, hashes, n: int) -> list:
+        arr = _int64_array(hashes)
+        if arr is None or n == 1: # NumPy can't shift a uint64 by 64 bits
+            return [self.compress(h, n) for h in hashes]
+        shift = np.uint64(65 - n.bit_length())
+        return ((arr.view(np.uint64) * np.uint64(self._GOLDEN)) >> shift).tolist()
+
+class TabulationCompression:
+    """Simple tabulation hashing into a power-of-two table.
+
+    Splits the low 64 bits of h into 8 bytes, looks each byte up in its own
+    table of random 64-bit words, and xors the 8 words together. The result
+    is 3-independent, a stronger guarantee than MAD or Fibonacci hashing give,
+    for 8 table lookups per index.
+    """
+
+    def __init__(self, seed=None):
+        """Fill the lookup tables from a generator seeded with seed."""
+        rng = random.Random(seed)
+        self._tables = [[rng.getrandbits(64) for _ in range(256)]
+                        for _ in range(8)]
+        self._arrays = None # NumPy copies of the tables, made on first use
+
+    def capacity(self, c: int) -> int:
+        return 1 << max(c - 1, 0).bit_length() # next power of two
+
+    def compress(self, h: int, n: int) -> int:
+        x = 0
+        for table in self._tables:
+            x ^= table[h & 0xFF] # negative h works too: two's complement bytes
+            h >>= 8
+        return x & (n - 1)
+
+    def compress_many(self, hashes, n: int) -> list:
+        arr = _int64_array(hashes)
+        if arr is None:
+            return [self.compress(h, n) for h in hashes]
+        if self._arrays is None:
+            self._arrays = np.array(self._tables, dtype=np.uint64)
+        arr = arr.view(np.uint64)
+        x = np.zeros(len(arr), dtype=np.uint64)
+        for i in range(8):
+            x ^= self._arrays[i][(arr >> np.uint64(8 * i)) & np.uint64(0xFF)]
+        return (x & np.uint64(n - 1)).tolist()
@@ -0,0 +1,108 @@
+from chain_hash_map import ChainHashMap
+from map_base_abc import MapBase
+
+import threading
+
+class ConcurrentHashMap(MapBase):
+    """Thread-safe hash map made of independently locked ChainHashMap segments.
+
+    A key's full hash code picks its segment, so threads writing to different
+    segments never wait on each other, and each segment resizes on its own.
+    Writers hold the segment's lock and bump its version counter before and
+    after every change (a "seqlock"). Readers take no lock. They record the
+    version, read the bucket, and accept the result only if the version was
+    even and unchanged. Otherwise a write overlapped the read, and the read is
+    repeated under the lock. Under CPython a read never sees a half-built
+    object, so at worst it sees a stale bucket, and the version check catches
+    that.
+
+    len() and iteration visit the segments one after another, so they are not
+    a single atomic snapshot while other threads are writing.
+    """
+
+    class _Segment(ChainHashMap):
+        """ChainHashMap with a lock and a version counter."""
+
+        def __init__(self, cap, compression):
+            super().__init__(cap, compression=compression)
+            self._lock = threading.Lock()
+            self._version = 0 # odd while a write is in progress
+
+        def _lookup(self, k, h, default):
+            """Return value for key k with hash code h, or default, without
+            locking. The caller must validate against _version."""
+            table = self._table # one read, in case a resize swaps it
+            bucket = table[self._compression.compress(h, len(table))]
+            if bucket is not None:
+                for item in bucket._table:
+                    if item._hash == h and k == item._key:
+                        return item._value
+            return default
+
+    def __init__(self, segments=16, cap=11, compression=None):
+        """Create an empty map.
+
+        Args:
+            segments (int): Number of independently locked segments.
+            cap (int): Initial capacity of each segment.
+            compression: Compression strategy shared by the segments, as for
+                HashMapBase. Each segment gets its own MADCompression if None.
+        """
+        self._segments = [self._Segment(cap, compression)
+                          for _ in range(segments)]
+
+    def _segment(self, h):
+        return self._segments[h % len(self._segments)]
+
+    def get(self, k, default=None):
+        """Return value for key k, or default if k isn't in the map."""
+        h = hash(k)
+        seg = self._segment(h)
+        version = seg._version
+        if not version & 1: # no write in progress; try without the lock
+            value = seg._lookup(k, h, default)
+            if seg._version == version:
+                return value
+        with seg._lock: # a write overlapped the read
+            return seg._lookup(k, h, default)
+
+    def __getitem__(self, k):
+        """Return value associated with key k. Raise KeyError if not found."""
+        missing = object()
+        value = self.get(k, missing)
+        if value is missing:
+            raise KeyError('Key Error: ' + repr(k))
+        return value
+
+    def __contains__(self, k):
+        missing = object()
+        return self.get(k, missing) is not missing
+
+    def __setitem__(self, k, v):
+        """Assign value v to key k, overwriting existing value if present."""
+        seg = self._segment(hash(k))
+        with seg._lock:
+            seg._version += 1
+            try:
+                seg[k] = v
+            finally:
+                seg._version += 1
+
+    def __delitem__(self, k):
+        """Remove item associated with key k. Raise KeyError if not found."""
+        seg = self._segment(hash(k))
+        with seg._lock:
+            seg._version += 1
+            try:
+                del seg[k] # may raise KeyError
+            finally:
+                seg._version += 1
+
+    def __len__(self):
+        return sum(len(seg) for seg in self._segments)
+
+    def __iter__(self):
+        for seg in self._segments:
+            with seg._lock:
+                keys = list(seg) # snapshot one segment at a time
+            yield from keys
@@ -0,0 +1,80 @@
+"""Multi-threaded stress test and throughput benchmark for ConcurrentHashMap.
+
+Runs the same mixed read/write workload against ConcurrentHashMap and against
+a ChainHashMap guarded by a single global lock, for increasing thread counts.
+Each thread writes only its own keys and checks them at the end, so lost or
+corrupted updates show up as failures instead of just slower numbers.
+"""
+
+import random
+import threading
+from time import perf_counter
+
+from chain_hash_map import ChainHashMap
+from concurrent_hash_map import ConcurrentHashMap
+
+class GlobalLockMap:
+    """ChainHashMap behind one lock, as the baseline to compare against."""
+
+    def __init__(self):
+        self._map = ChainHashMap()
+        self._lock = threading.Lock()
+
+    def get(self, k, default=None):
+        with self._lock:
+            return self._map.get(k, default)
+
+    def __setitem__(self, k, v):
+        with self._lock:
+            self._map[k] = v
+
+    def __delitem__(self, k):
+        with self._lock:
+            del self._map[k]
+
+def worker(hmap, thread_id, ops, read_share, keys_per_thread, failures):
+    """Run ops random operations; record any inconsistency in failures."""
+    rng = random.Random(thread_id)
+    mine = {} # what this thread's keys should map to
+    for op in range(ops):
+        if rng.random() < read_share:
+            other = rng.randrange(keys_per_thread)
+            hmap.get((rng.randrange(8), other)) # anyone's key
+        else:
+            k = (thread_id, rng.randrange(keys_per_thread))
+            if k in mine and rng.random() < 0.2:
+                del hmap[k]
+                del mine[k]
+            else:
+                hmap[k] = op
+                mine[k] = op
+    for (k, v) in mine.items():
+        if hmap.get(k) != v:
+            failures.append((k, v, hmap.get(k)))
+
+def run(hmap, threads, ops, read_share=0.9, keys_per_thread=2000):
+    """Return (ops per second, failures) for one configuration."""
+    failures = []
+    pool = [threading.Thread(target=worker,
+                             args=(hmap, t, ops, read_share, keys_per_thread,
+                                   failures))
+            for t in range(threads)]
+    start = perf_counter()
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+    elapsed = perf_counter() - start
+    return (threads * ops / elapsed, failures)
+
+def main():
+    ops = 50000
+    print(f'{"threads":>8}{"global lock":>16}{"concurrent":>16}  failures')
+    for threads in (1, 2, 4, 8):
+        baseline, f1 = run(GlobalLockMap(), threads, ops)
+        striped, f2 = run(ConcurrentHashMap(), threads, ops)
+        print(f'{threads:>8}{baseline:>14,.0f}/s{striped:>14,.0f}/s'
+              f'  {len(f1) + len(f2)}')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,114 @@
+from array import array
+import math
+import random
+
+from compression_strategies import MADCompression
+from string_hash_families import FNV1aHash
+
+try:
+    import numpy as np
+except ImportError: # add_many falls back to a pure-Python loop
+    np = None
+
+class CountMinSketch:
+    """Approximate item counts in a fixed amount of memory.
+
+    Holds depth rows of width counters. Each row maps an item's hash code to
+    one of its counters with its own MAD compression function. Adding an item
+    increments one counter per row, and its estimate is the smallest of those
+    counters. Estimates never fall below the true count. With width
+    ceil(e / epsilon) and depth ceil(ln(1 / delta)), an estimate exceeds the
+    true count by more than epsilon times the total count with probability
+    at most delta.
+
+    Hash codes come from a string hash family rather than from hash(), which
+    differs between processes for str keys. That way sketches built in
+    different processes with the same width, depth and seed can be merged.
+    """
+
+    def __init__(self, width=2048, depth=4, seed=0, hash_code=None):
+        """Create an empty sketch.
+
+        Args:
+            width (int): Counters per row.
+            depth (int): Number of rows.
+            seed (int): Seed for the rows' compression functions. Only
+                sketches with equal seeds can be merged.
+            hash_code (callable): Hash code of an item; FNV1aHash() if None.
+        """
+        self._width = width
+        self._depth = depth
+        self._seed = seed
+        self._hash_code = FNV1aHash() if hash_code is None else hash_code
+        rng = random.Random(seed)
+        p = 109345121 # MADCompression's default prime
+        self._rows = [MADCompression(p, 1 + rng.randrange(p - 1),
+                                     rng.randrange(p)) for _ in range(depth)]
+        self._counts = [array('q', [0]) * width for _ in range(depth)]
+        self._total = 0
+
+    @classmethod
+    def from_error(cls, epsilon, delta, **kwargs):
+        """Return a sketch sized so that, with probability at least 1 - delta,
+        no estimate exceeds the true count by more than epsilon * total."""
+        return cls(width=math.ceil(math.e / epsilon),
+                   depth=math.ceil(math.log(1 / delta)), **kwargs)
+
+    def __len__(self):
+        """Return the total count added to the sketch."""
+        return self._total
+
+    def nbytes(self) -> int:
+        """Return the memory used by the counters, in bytes."""
+        return self._width * self._depth * self._counts[0].itemsize
+
+    def add(self, item, count=1) -> None:
+        """Add count occurrences of item."""
+        h = self._hash_code(item)
+        for (row, counts) in zip(self._rows, self._counts):
+            counts[row.compress(h, self._width)] += count
+        self._total += count
+
+    def add_many(self, items) -> None:
+        """Add one occurrence of each of items."""
+        items = list(items)
+        if not items:
+            return
+        many = getattr(self._hash_code, 'many', None)
+        hashes = many(items) if many else [self._hash_code(x) for x in items]
+        for (row, counts) in zip(self._rows, self._counts):
+            indices = row.compress_many(hashes, self._width)
+            if np is not None:
+                view = np.frombuffer(counts, dtype=np.int64) # shares memory
+                view += np.bincount(indices, minlength=self._width)
+            else:
+                for j in indices:
+                    counts[j] += 1
+        self._total += len(items)
+
+    def estimate(self, item) -> int:
+        """Return an upper bound on the number of times item was added."""
+        h = self._hash_code(item)
+        return min(counts[row.compress(h, self._width)]
+                   for (row, counts) in zip(self._rows, self._counts))
+
+    def __getitem__(self, item):
+        return self.estimate(item)
+
+    def merge(self, other) -> None:
+        """Add the counts of sketch other into this sketch.
+
+        Raise ValueError unless both sketches have the same width, depth and
+        seed. Both should also use the same hash_code function.
+        """
+        if (self._width, self._depth, self._seed) != \
+           (other._width, other._depth, other._seed):
+            raise ValueError('sketches must share width, depth and seed')
+        for (mine, theirs) in zip(self._counts, other._counts):
+            if np is not None:
+                np.frombuffer(mine, dtype=np.int64)[:] += \
+                    np.frombuffer(theirs, dtype=np.int64)
+            else:
+                for j in range(self._width):
+                    mine[j] += theirs[j]
+        self._total += other._total
@@ -0,0 +1,82 @@
+"""Lookup cost of CuckooHashMap against ProbeHashMap and ChainHashMap at high
+load factors.
+
+Each map is filled with the same random keys to a fixed share of its slots
+(items per slot for the probing and cuckoo maps, items per bucket for the
+chaining map), with _MAX_LOAD raised so it doesn't grow first. The benchmark
+times successful and unsuccessful lookups and reports the most items any
+unsuccessful search has to examine, which is where linear probing degrades:
+its clusters get long as the table fills, while a cuckoo lookup never looks
+past two buckets and the stash.
+
+A cuckoo map still grows if its stash overflows, whatever _MAX_LOAD says, so
+each row also shows the load the map actually ended up at, and marks with *
+the rows where the table grew past its initial size.
+"""
+
+import math
+import random
+from time import perf_counter
+
+from chain_hash_map import ChainHashMap
+from cuckoo_hash_map import CuckooHashMap
+from probe_hash_map import ProbeHashMap
+
+def at_load(cls, n, load):
+    """Return an empty map of class cls sized to hold n items at load."""
+    slots = getattr(cls, '_SLOTS', 1) # items per table entry at full load
+    loaded = type(cls.__name__, (cls,), {'_MAX_LOAD': slots * (load + 0.01)})
+    return loaded(cap=math.ceil(n / (slots * load)))
+
+def actual_load(hmap) -> float:
+    """Return hmap's items per slot (per bucket for the chaining map)."""
+    slots = getattr(hmap, '_SLOTS', 1)
+    return len(hmap) / (slots * len(hmap._table))
+
+def worst_miss(hmap) -> int:
+    """Return the most items an unsuccessful search in hmap examines."""
+    table = hmap._table
+    if isinstance(hmap, CuckooHashMap):
+        pairs = (hmap._buckets(item._hash)
+                 for j in range(len(table)) for item in hmap._bucket_items(j))
+        return max(len(table[j] or ()) + len(table[alt] or ())
+                   for (j, alt) in pairs) + len(hmap._stash)
+    if isinstance(hmap, ChainHashMap):
+        return max(len(bucket) for bucket in table if bucket is not None)
+    run = longest = 0 # linear probing: longest run of occupied slots
+    for slot in table + table: # twice, for a run that wraps around
+        run = run + 1 if slot is not None else 0
+        longest = max(longest, min(run, len(table)))
+    return longest
+
+def time_lookups(hmap, keys) -> float:
+    """Return mean seconds per hmap.get() over keys."""
+    get = hmap.get
+    start = perf_counter()
+    for k in keys:
+        get(k)
+    return (perf_counter() - start) / len(keys)
+
+def main():
+    n = 20000
+    rng = random.Random(1)
+    keys = rng.sample(range(10 ** 12), 2 * n)
+    present, absent = keys[:n], keys[n:]
+    print(f'{n} random integer keys; lookup times in ns')
+    print(f'{"target":>6}{"map":>15}{"table":>9}{"actual":>8}{"hit":>8}'
+          f'{"miss":>8}{"worst miss":>12}')
+    for load in (0.5, 0.7, 0.8, 0.9, 0.95):
+        for cls in (ProbeHashMap, ChainHashMap, CuckooHashMap):
+            hmap = at_load(cls, n, load)
+            cap = len(hmap._table)
+            for k in present:
+                hmap[k] = k
+            grew = '*' if len(hmap._table) > cap else ' '
+            hit = time_lookups(hmap, present) * 1e9
+            miss = time_lookups(hmap, absent) * 1e9
+            print(f'{load:>6}{cls.__name__:>15}{len(hmap._table):>8}{grew}'
+                  f'{actual_load(hmap):>8.2f}{hit:>8.0f}{miss:>8.0f}'
+                  f'{worst_miss(hmap):>12}')
+
+if __name__ == '__main__':
+    main()
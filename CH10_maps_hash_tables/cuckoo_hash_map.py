@@ -0,0 +1,175 @@
+from hash_map_base_abc import HashMapBase
+
+import random
+
+class CuckooHashMap(HashMapBase):
+    """Hash map implemented with bucketized cuckoo hashing and a stash.
+
+    Every key has two candidate buckets of _SLOTS items each: its primary
+    bucket, from the compressed hash code, and an alternate bucket, from the
+    compressed hash code after a second mixing step. A key is always in one
+    of its two buckets or in a small stash, so a lookup examines at most
+    2 * _SLOTS + _STASH_SIZE items however full the table is.
+
+    An insertion into two full buckets evicts a random resident, which moves
+    to its own other bucket, possibly evicting another in turn (a random
+    walk). A walk longer than _MAX_KICKS parks the item being carried in the
+    stash, and a stash holding more than _STASH_SIZE items makes the table
+    grow.
+    """
+    _SLOTS = 4 # items per bucket
+    _STASH_SIZE = 4 # stashed items allowed before the table grows
+    _MAX_KICKS = 100 # evictions tried before an item goes to the stash
+    _MAX_LOAD = 0.9 * _SLOTS # grow once 90% of the slots are in use
+    _MASK = (1 << 64) - 1
+
+    def __init__(self, *args, seed=None, **kwargs):
+        """Create an empty cuckoo hash map.
+
+        Args:
+            seed: Seed for choosing which items to evict; random if None.
+            *args, **kwargs: Passed through to HashMapBase.
+        """
+        self._rng = random.Random(seed)
+        self._stash_limit = self._STASH_SIZE # raised only for equal hashes
+        super().__init__(*args, **kwargs)
+
+    def _reset_table(self, c: int) -> None:
+        super()._reset_table(c)
+        self._stash = [] # a new list, since _old may still share the old one
+
+    def _alt_hash(self, h: int) -> int:
+        """Return hash code h mixed again, to pick the alternate bucket."""
+        h &= self._MASK
+        h = ((h ^ (h >> 31)) * 0xD6E8FEB86659FD93) & self._MASK
+        return h ^ (h >> 32)
+
+    def _buckets(self, h):
+        """Return the (primary, alternate) bucket indices for hash code h."""
+        return (self._compress(h), self._compress(self._alt_hash(h)))
+
+    def _find_item(self, k, h, j=None):
+        """Return the item with key k and hash code h, or None if not found.
+
+        Args:
+            j (int): The primary bucket index of h, if already known.
+        """
+        if j is None:
+            j = self._compress(h)
+        for j in (j, self._compress(self._alt_hash(h))):
+            bucket = self._table[j]
+            if bucket is not None:
+                for item in bucket:
+                    if item._hash == h and k == item._key:
+                        return item
+        for item in self._stash:
+            if item._hash == h and k == item._key:
+                return item
+        return None
+
+    def _bucket_getitem(self, j, k, h=None):
+        if h is None:
+            h = self._hash_code(k)
+        item = self._find_item(k, h, j)
+        if item is None:
+            raise KeyError('Key Error: ' + repr(k)) # no match found
+        return item._value
+
+    def _bucket_setitem(self, j, k, v, h=None):
+        if h is None:
+            h = self._hash_code(k)
+        item = self._find_item(k, h, j)
+        if item is not None:
+            item._value = v # overwrite existing
+            return
+        self._place(self._HashItem(k, v, h))
+        self._n += 1
+
+    def _place(self, item) -> None:
+        """Put item, whose key is not in the table, in one of its buckets,
+        evicting other items along a random walk if both are full."""
+        table = self._table
+        j, alt = self._buckets(item._hash)
+        for i in (j, alt):
+            if table[i] is None:
+                table[i] = [item]
+                return
+            if len(table[i]) < self._SLOTS:
+                table[i].append(item)
+                return
+        i = self._rng.choice((j, alt))
+        for _ in range(self._MAX_KICKS):
+            bucket = table[i]
+            s = self._rng.randrange(self._SLOTS)
+            item, bucket[s] = bucket[s], item # evict a resident
+            j, alt = self._buckets(item._hash)
+            i = alt if i == j else j # the evicted item's other bucket
+            if table[i] is None:
+                table[i] = [item]
+                return
+            if len(table[i]) < self._SLOTS:
+                table[i].append(item)
+                return
+        self._stash.append(item) # walk too long; caller grows the table
+
+    def _bucket_delitem(self, j, k, h=None):
+        if h is None:
+            h = self._hash_code(k)
+        item = self._find_item(k, h, j)
+        if item is None:
+            raise KeyError('Key Error: ' + repr(k)) # no match found
+        for i in self._buckets(h):
+            bucket = self._table[i]
+            for s in range(len(bucket) if bucket is not None else 0):
+                if bucket[s] is item: # identity; no call to the key's __eq__
+                    del bucket[s]
+                    if not bucket:
+                        self._table[i] = None
+                    return
+        self._stash.remove(item)
+
+    def _bucket_items(self, j):
+        """Return list of the items stored in the bucket at index j. The
+        stashed items are reported along with bucket 0."""
+        bucket = self._table[j]
+        items = [] if bucket is None else list(bucket) # caller may delete
+        if j == 0:
+            items.extend(self._stash)
+        return items
+
+    #### Stash overflow ####
+        # _place never fails; it overfills the stash instead, and the public
+        #   methods that insert grow the table once they are done. Overflow is
+        #   rare, so the table is rehashed all at once even when incremental.
+        #   Items moved by an incremental migration during a lookup or deletion
+        #   can also overfill the stash; the next insertion fixes that. Keys
+        #   whose hash codes are outright equal share both buckets at any
+        #   capacity, so if growing doesn't shrink the stash, the stash is
+        #   allowed to get longer instead.
+
+    def _grow_while_stash_full(self) -> None:
+        while len(self._stash) > self._stash_limit:
+            before = len(self._stash)
+            self._rehash(self._compression.capacity(2 * len(self._table) - 1))
+            if len(self._stash) >= before: # growing didn't help
+                self._stash_limit = 2 * len(self._stash)
+
+    def __setitem__(self, k, v):
+        super().__setitem__(k, v)
+        self._grow_while_stash_full()
+
+    def update_many(self, items, size_hint=None) -> None:
+        super().update_many(items, size_hint)
+        self._grow_while_stash_full()
+
+    def set_many(self, keys, values) -> None:
+        super().set_many(keys, values)
+        self._grow_while_stash_full()
+
+    def _iter_keys(self):
+        for bucket in self._table:
+            if bucket is not None:
+                for item in bucket:
+                    yield item._key
+        for item in self._stash:
+            yield item._key
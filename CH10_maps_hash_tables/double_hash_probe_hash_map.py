@@ -0,0 +1,21 @@
+from hash_map_base_abc import _next_prime
+from probe_hash_map import ProbeHashMap
+
+class DoubleHashProbeHashMap(ProbeHashMap):
+    """Hash map implemented with double hashing for collision resolution.
+
+    The probe step is derived from the raw hash code, independently of the
+    MAD-compressed home index, so keys sharing a home index usually follow
+    different probe sequences. With N prime, every step size from 1 to N-1
+    visits all N slots.
+    """
+
+    def _reset_table(self, c: int) -> None:
+        c = _next_prime(c) # capacity must be prime
+        if self._compression.capacity(c) != c:
+            raise ValueError('compression strategy needs a non-prime capacity')
+        super()._reset_table(c)
+
+    def _next_slot(self, j, i, h):
+        n = len(self._table)
+        return (j + 1 + h % (n - 1)) % n # step in range 1 to n-1
@@ -1,54 +1,348 @@
+from compression_strategies import MADCompression
 from map_base_abc import MapBase
 
-import random
+from collections.abc import ItemsView, Mapping, ValuesView
+import copy
+
+def _next_prime(n: int) -> int:
+    """Return the smallest prime number greater than or equal to n."""
+    n = max(n, 2)
+    while any(n % d == 0 for d in range(2, int(n ** 0.5) + 1)):
+        n += 1
+    return n
 
 class HashMapBase(MapBase):
-    """Abstract base class for map using hash table with multiply-add-divide
-    compression."""
+    """Abstract base class for map using hash table with a pluggable
+    compression function (multiply-add-divide by default).
+
+    Subclasses implement the bucket hooks _bucket_getitem(j, k, h),
+    _bucket_setitem(j, k, v, h), _bucket_delitem(j, k, h) and
+    _bucket_items(j), where h is the full hash code of key k and j its
+    compressed table index. Items report their cached hash as item._hash.
+    """
+    _MIGRATE_STEP = 4 # old-table buckets moved per operation while rehashing
+    _MAX_LOAD = 0.5 # items per table entry allowed before the table grows
 
-    def __init__(self, cap=11, p=109345121):
+    def __init__(self, cap=11, p=109345121, incremental=False, hash_code=None,
+                 compression=None):
         """Create an empty hash table map.
 
         Args:
             cap (int): Capacity of the map
             p (int): A large prime number
+            incremental (bool): If True, resizing moves a bounded number of
+                buckets per operation instead of rehashing everything at once.
+            hash_code (callable): Function returning the hash code of a key,
+                used instead of hash(). If it has a many() method, such as the
+                families in string_hash_families, batch methods call that to
+                hash all of their keys at once.
+            compression: Compression strategy from compression_strategies.
+                Defaults to MADCompression(p).
         """
-        self._table = cap * [None]
-        self._n = 0
-        self._prime = p # prime for MAD compression function
-        self._scale = 1 + random.randrange(p - 1) # scale from 1 to p-1 for MAD
-        self._shift = random.randrange(p) # shift from 0 to p-1 for MAD
+        if hash_code is not None:
+            self._hash_code = hash_code # instance attribute shadows method
+        if compression is None:
+            compression = MADCompression(p)
+        self._compression = compression
+        cap = compression.capacity(cap)
+        self._reset_table(cap)
+        self._min_capacity = cap # table never shrinks below this
+        self._incremental = incremental
+        self._old = None # map over the previous table while it's being drained
+        self._migrate_index = 0 # next bucket of the old table to be moved
 
     def _hash_function(self, k):
-        return (hash(k) * self._scale + self._shift) % \
-               self._prime % len(self._table)
+        return self._compress(self._hash_code(k))
+
+    def _hash_code(self, k) -> int:
+        """Return the full hash code of key k, before compression."""
+        return hash(k)
+
+    def _compress(self, h: int) -> int:
+        """Return table index for an already-computed hash code h."""
+        return self._compression.compress(h, len(self._table))
 
     def __len__(self):
+        if self._old is not None: # items not yet moved still count
+            return self._n + self._old._n
         return self._n
 
     def __getitem__(self, k):
         """Return value associated with key k. Raise KeyError if not found."""
-        j = self._hash_function(k)
-        return self._bucket_getitem(j, k) # may raise KeyError
+        h = self._hash_code(k) # computed once, then passed to the bucket
+        if self._old is not None:
+            self._migrate()
+            if self._old is not None:
+                old = self._old
+                try:
+                    return old._bucket_getitem(old._compress(h), k, h)
+                except KeyError:
+                    pass # not in the old table, so check the current one
+        j = self._compress(h)
+        return self._bucket_getitem(j, k, h) # may raise KeyError
 
     def __setitem__(self, k, v):
         """Assign value v to key k, overwriting existing value if present."""
-        j = self._hash_function(k)
-        self._bucket_setitem(j, k, v) # subroutine maintains self._n
-        if self._n > len(self._table) // 2: # If load factor > 0.5
-            self._resize(2 * len(self._table) - 1) # number 2^x - 1 is often prime
-                # (?) So we just hope it's prime and leave it at that?
+        h = self._hash_code(k)
+        if self._old is not None:
+            self._migrate()
+            if self._old is not None:
+                self._old_discard(k, h) # key moves over to the current table
+        j = self._compress(h)
+        self._bucket_setitem(j, k, v, h) # subroutine maintains self._n
+        limit = self._load_limit(len(self._table))
+        if self._n > limit: # If load factor > _MAX_LOAD
+            self._resize(2 * len(self._table) - 1) # _resize rounds this to a
+                # capacity the compression strategy accepts
+        elif self._n + self._deleted > limit:
+            # Deletion markers still lengthen unsuccessful searches, so rehash
+            #   to clear them. Grow as well if the live items alone would fill
+            #   the table back up quickly, so cleanups can't come back to back.
+            if self._n > limit // 2:
+                self._resize(2 * len(self._table) - 1)
+            else:
+                self._resize(len(self._table))
 
     def __delitem__(self, k):
         """Remove item associated with key k. Raise KeyError if not found."""
-        j = self._hash_function(k)
-        self._bucket_delitem(j, k) # may raise KeyError
+        h = self._hash_code(k)
+        if self._old is not None:
+            self._migrate()
+            if self._old is not None and self._old_discard(k, h):
+                return
+        j = self._compress(h)
+        self._bucket_delitem(j, k, h) # may raise KeyError
         self._n -= 1
+        if self._old is None and len(self._table) > self._min_capacity and \
+           self._n < self._load_limit(len(self._table)) // 4:
+            # mostly empty, so shrink by half
+            self._resize(max(self._min_capacity, (len(self._table) + 1) // 2))
+
+    #### Iteration ####
+        # During an incremental migration every lookup moves buckets from the
+        #   old table into the current one, so a loop that reads the map while
+        #   walking either table could skip or repeat items. Iteration started
+        #   mid-migration therefore walks a snapshot of both tables. Otherwise
+        #   reads move nothing, and iteration walks the live table.
+        #   MutableMapping's default views would look every key up again, so
+        #   items() and values() read the stored items directly.
+
+    def __iter__(self):
+        if self._old is not None:
+            return iter([*self._iter_keys(), *self._old._iter_keys()])
+        return self._iter_keys()
+
+    def _iter_keys(self):
+        """Generate the keys stored in the current table."""
+        for j in range(len(self._table)):
+            for item in self._bucket_items(j):
+                yield item._key
+
+    class _ItemsView(ItemsView):
+        def __iter__(self):
+            for item in self._mapping._iter_items():
+                yield (item._key, item._value)
+
+    class _ValuesView(ValuesView):
+        def __iter__(self):
+            for item in self._mapping._iter_items():
+                yield item._value
+
+    def items(self):
+        """Return a view of the map's (key, value) pairs."""
+        return self._ItemsView(self)
+
+    def values(self):
+        """Return a view of the map's values."""
+        return self._ValuesView(self)
+
+    def _iter_items(self):
+        """Return an iterator over the stored items of both tables, over a
+        snapshot if a migration is in progress."""
+        if self._old is not None:
+            return iter([*self._table_items(), *self._old._table_items()])
+        return self._table_items()
+
+    def _table_items(self):
+        """Generate the stored items of the current table."""
+        for j in range(len(self._table)):
+            yield from self._bucket_items(j)
+
+    def _load_limit(self, c: int) -> int:
+        """Return the most items a table of capacity c holds before growing."""
+        return int(c * self._MAX_LOAD)
+
+    def _capacity_for(self, n: int) -> int:
+        """Return the least capacity whose load limit is at least n."""
+        return int(n / self._MAX_LOAD) + 1
+
+    def _reset_table(self, c: int) -> None:
+        """Replace the bucket array with an empty one of capacity c."""
+        self._table = c * [None]
+        self._n = 0
+        self._deleted = 0 # deletion markers in the table (open addressing)
 
     def _resize(self, c: int) -> None:
-        """Resize bucket array ("slots") to capacity c."""
-        old = list(self.items()) # use iteration to record existing items
-        self._table = c * [None] # then reset table to desired capacity
-        self._n = 0 # n recomputed during subsequent adds
-        for (k, v) in old:
-            self[k] = v # reinsert old key-value pair
+        """Resize bucket array ("slots") to capacity c, rounded up to one the
+        compression strategy can use."""
+        c = self._compression.capacity(c)
+        if self._incremental:
+            self._start_migration(c)
+        else:
+            self._rehash(c)
+
+    def _rehash(self, c: int) -> None:
+        """Move every item into a new table of capacity c, all at once."""
+        old = [item for j in range(len(self._table))
+               for item in self._bucket_items(j)] # record existing items
+        self._reset_table(c) # then reset table to desired capacity
+        for item in old: # reinsert from the cached hash; no call to hash()
+            self._bucket_setitem(self._compress(item._hash), item._key,
+                                 item._value, item._hash)
+
+    #### Bulk loading ####
+
+    @classmethod
+    def from_items(cls, items, size_hint=None, **kwargs):
+        """Return a new map holding the (key, value) pairs of items.
+
+        Args:
+            items: Iterable of (key, value) pairs, or a mapping.
+            size_hint (int): Expected number of pairs, used to size the table
+                when items has no len().
+            **kwargs: Passed through to the map's constructor.
+        """
+        hmap = cls(**kwargs)
+        hmap.update_many(items, size_hint)
+        return hmap
+
+    def update_many(self, items, size_hint=None) -> None:
+        """Insert the (key, value) pairs of items, overwriting existing values.
+
+        The table is sized once for the expected total instead of doubling
+        repeatedly, and the pairs are then placed without going through
+        __setitem__. If items turns out to hold more than len(items) or
+        size_hint promised, the table still grows as needed.
+        """
+        if isinstance(items, Mapping):
+            items = items.items()
+        expected = len(items) if hasattr(items, '__len__') else (size_hint or 0)
+        if self._old is not None: # bulk path works on a single table
+            self._finish_migration()
+        capacity = self._compression.capacity
+        if self._capacity_for(self._n + expected) > len(self._table):
+            self._rehash(capacity(self._capacity_for(self._n + expected)))
+        limit = self._load_limit(len(self._table))
+        for (k, v) in items:
+            h = self._hash_code(k)
+            self._bucket_setitem(self._compress(h), k, v, h)
+            if self._n + self._deleted > limit: # underestimated; grow anyway
+                self._rehash(capacity(2 * len(self._table) - 1))
+                limit = self._load_limit(len(self._table))
+
+    #### Batch access ####
+        # Each batch computes hash codes and compressed indices for all of its
+        #   keys in one pass (the compression strategy vectorizes the latter
+        #   when NumPy is installed), then goes straight to the bucket hooks.
+        #   During an incremental migration, keys could be in either table,
+        #   so batches use the per-key path.
+
+    def _hash_codes(self, keys) -> list:
+        """Return list of the hash codes of keys."""
+        many = getattr(self._hash_code, 'many', None)
+        if many is not None:
+            return many(keys)
+        return [self._hash_code(k) for k in keys]
+
+    def _compress_many(self, hashes) -> list:
+        """Return list of table indices for the hash codes in hashes."""
+        return self._compression.compress_many(hashes, len(self._table))
+
+    def get_many(self, keys, default=None) -> list:
+        """Return list of the values for keys, with default for missing ones."""
+        keys = list(keys)
+        if self._old is not None:
+            return [self.get(k, default) for k in keys]
+        hashes = self._hash_codes(keys)
+        bucket_getitem = self._bucket_getitem
+        values = []
+        for (k, j, h) in zip(keys, self._compress_many(hashes), hashes):
+            try:
+                values.append(bucket_getitem(j, k, h))
+            except KeyError:
+                values.append(default)
+        return values
+
+    def contains_many(self, keys) -> list:
+        """Return list of bools telling whether each of keys is in the map."""
+        missing = object()
+        return [v is not missing for v in self.get_many(keys, missing)]
+
+    def set_many(self, keys, values) -> None:
+        """Assign each of values to the corresponding one of keys.
+
+        Raise ValueError if keys and values differ in length.
+        """
+        keys = list(keys)
+        values = list(values)
+        if len(keys) != len(values):
+            raise ValueError('keys and values must have the same length')
+        if self._old is not None:
+            for (k, v) in zip(keys, values):
+                self[k] = v
+            return
+        if self._capacity_for(self._n + self._deleted + len(keys)) > \
+           len(self._table):
+            c = self._capacity_for(self._n + len(keys)) # no resize mid-batch
+            self._rehash(self._compression.capacity(c))
+        hashes = self._hash_codes(keys)
+        bucket_setitem = self._bucket_setitem
+        for (k, v, j, h) in zip(keys, values, self._compress_many(hashes),
+                                hashes):
+            bucket_setitem(j, k, v, h)
+
+    #### Incremental rehashing ####
+        # While a migration is in progress, self._old is a shallow copy of
+        #   this map that still owns the previous table. Every key lives in
+        #   exactly one of the two tables, and self._n only counts the items in
+        #   the current one. Each get/set/del moves _MIGRATE_STEP buckets over.
+
+    def _start_migration(self, c: int) -> None:
+        """Begin moving every item into a new table of capacity c."""
+        if self._old is not None: # previous migration must finish first
+            self._finish_migration()
+        self._old = copy.copy(self) # shares the old table, has _old None
+        self._migrate_index = 0
+        self._reset_table(c)
+
+    def _migrate(self) -> None:
+        """Move up to _MIGRATE_STEP buckets from the old table."""
+        old = self._old
+        stop = min(self._migrate_index + self._MIGRATE_STEP, len(old._table))
+        for j in range(self._migrate_index, stop):
+            items = old._bucket_items(j)
+            while items: # deleting may shift later items into bucket j
+                for item in items:
+                    old._bucket_delitem(j, item._key, item._hash)
+                    old._n -= 1
+                    self._bucket_setitem(self._compress(item._hash),
+                                         item._key, item._value, item._hash)
+                items = old._bucket_items(j)
+        self._migrate_index = stop
+        if stop == len(old._table):
+            self._old = None # migration complete; old table can be collected
+
+    def _finish_migration(self) -> None:
+        """Move every remaining item out of the old table."""
+        while self._old is not None:
+            self._migrate()
+
+    def _old_discard(self, k, h) -> bool:
+        """Remove key k from the old table. Return False if it wasn't there."""
+        old = self._old
+        try:
+            old._bucket_delitem(old._compress(h), k, h)
+        except KeyError:
+            return False
+        old._n -= 1
+        return True
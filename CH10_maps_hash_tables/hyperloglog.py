@@ -0,0 +1,110 @@
+import math
+
+from compression_strategies import TabulationCompression
+from string_hash_families import FNV1aHash
+
+try:
+    import numpy as np
+except ImportError: # add_many falls back to a pure-Python loop
+    np = None
+
+class HyperLogLog:
+    """Approximate count of distinct items in 2**p bytes (HyperLogLog).
+
+    Each item's hash code is mixed into 64 random-looking bits by tabulation
+    hashing. The top p bits pick one of m = 2**p registers, which keeps the
+    largest rank seen, where rank is the position of the first 1 bit in the
+    remaining 64 - p bits. The estimate has a relative standard error of
+    about 1.04 / sqrt(m). Small counts are estimated by linear counting of
+    the empty registers instead.
+
+    Sketches with the same p and seed can be merged by taking the largest
+    value of each register, giving the sketch of the combined streams.
+    """
+
+    def __init__(self, p=14, seed=0, hash_code=None):
+        """Create an empty sketch.
+
+        Args:
+            p (int): Number of index bits, from 4 to 16; uses 2**p registers.
+            seed (int): Seed for the tabulation tables. Only sketches with
+                equal seeds can be merged.
+            hash_code (callable): Hash code of an item; FNV1aHash() if None.
+        """
+        if not 4 <= p <= 16:
+            raise ValueError('p must be between 4 and 16')
+        self._p = p
+        self._seed = seed
+        self._hash_code = FNV1aHash() if hash_code is None else hash_code
+        self._mix = TabulationCompression(seed)
+        self._registers = bytearray(1 << p)
+
+    def nbytes(self) -> int:
+        """Return the memory used by the registers, in bytes."""
+        return len(self._registers)
+
+    def add(self, item) -> None:
+        """Record one occurrence of item."""
+        x = self._mix.compress(self._hash_code(item), 1 << 64)
+        j = x >> (64 - self._p)
+        w = x & ((1 << (64 - self._p)) - 1)
+        rank = 64 - self._p - w.bit_length() + 1
+        if rank > self._registers[j]:
+            self._registers[j] = rank
+
+    def add_many(self, items) -> None:
+        """Record one occurrence of each of items."""
+        items = list(items)
+        if np is None:
+            for item in items:
+                self.add(item)
+            return
+        if not items:
+            return
+        many = getattr(self._hash_code, 'many', None)
+        hashes = many(items) if many else [self._hash_code(x) for x in items]
+        x = np.array(self._mix.compress_many(hashes, 1 << 64), dtype=np.uint64)
+        q = 64 - self._p
+        j = (x >> np.uint64(q)).astype(np.intp)
+        w = x & np.uint64((1 << q) - 1)
+        # frexp gives the exponent e with w = f * 2**e, 0.5 <= f < 1, which is
+        #   w's bit length. Halves of 32 bits convert to float64 exactly.
+        high = np.frexp((w >> np.uint64(32)).astype(np.float64))[1]
+        low = np.frexp((w & np.uint64(0xFFFFFFFF)).astype(np.float64))[1]
+        bits = np.where(high > 0, high + 32, low)
+        rank = (q + 1 - bits).astype(np.uint8)
+        registers = np.frombuffer(self._registers, dtype=np.uint8)
+        np.maximum.at(registers, j, rank)
+
+    def __len__(self):
+        """Return the estimated number of distinct items, rounded."""
+        return round(self.estimate())
+
+    def estimate(self) -> float:
+        """Return the estimated number of distinct items."""
+        m = len(self._registers)
+        if m >= 128:
+            alpha = 0.7213 / (1 + 1.079 / m) # bias correction constant
+        else:
+            alpha = {16: 0.673, 32: 0.697, 64: 0.709}[m]
+        raw = alpha * m * m / sum(2.0 ** -r for r in self._registers)
+        zeros = self._registers.count(0)
+        if raw <= 2.5 * m and zeros: # small range: linear counting
+            return m * math.log(m / zeros)
+        return raw
+
+    def merge(self, other) -> None:
+        """Fold sketch other into this sketch.
+
+        Raise ValueError unless both sketches have the same p and seed. Both
+        should also use the same hash_code function.
+        """
+        if (self._p, self._seed) != (other._p, other._seed):
+            raise ValueError('sketches must share p and seed')
+        if np is not None:
+            registers = np.frombuffer(self._registers, dtype=np.uint8)
+            np.maximum(registers, np.frombuffer(other._registers,
+                                                dtype=np.uint8), out=registers)
+        else:
+            self._registers = bytearray(map(max, self._registers,
+                                            other._registers))
@@ -22,4 +22,11 @@ class MapBase(MutableMapping):
 
         def __lt__(self, other):
             return self._key < other._key
-    
+
+    class _HashItem(_Item):
+        """Map item that also caches the full hash code of its key."""
+        __slots__ = '_hash'
+
+        def __init__(self, k, v, h):
+            super().__init__(k, v)
+            self._hash = h
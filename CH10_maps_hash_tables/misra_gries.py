@@ -0,0 +1,74 @@
+class MisraGries:
+    """Frequent-items summary in the style of Misra-Gries, with room for k
+    counters.
+
+    Items get a counter when they arrive. Once there are more than 2k
+    counters, the (k+1)-th largest count is subtracted from every counter,
+    and counters left at zero or below are dropped. That leaves at most k.
+    Batching the cuts this way costs O(log k) per item, amortized, instead of
+    one pass over all counters per new item.
+
+    A reported count is never more than the true count, and never less than
+    it by more than n / (k + 1), where n is the total count seen. Every item
+    occurring more than n / (k + 1) times keeps a counter.
+
+    Summaries can be merged, and the merged summary has the same error bound
+    for the combined stream.
+    """
+
+    def __init__(self, k=100):
+        """Create an empty summary with room for k counters."""
+        self._k = k
+        self._counts = {}
+        self._total = 0
+
+    def __len__(self):
+        """Return the total count added to the summary."""
+        return self._total
+
+    def add(self, item, count=1) -> None:
+        """Add count occurrences of item."""
+        self._total += count
+        self._counts[item] = self._counts.get(item, 0) + count
+        if len(self._counts) > 2 * self._k:
+            self._reduce()
+
+    def add_many(self, items) -> None:
+        """Add one occurrence of each of items."""
+        for item in items:
+            self.add(item)
+
+    def _reduce(self) -> None:
+        """Cut back to k counters by subtracting the (k+1)-th largest count
+        from every counter and dropping those left at zero or below."""
+        if len(self._counts) <= self._k:
+            return
+        cut = sorted(self._counts.values(), reverse=True)[self._k]
+        self._counts = {item: c - cut for (item, c) in self._counts.items()
+                        if c > cut}
+
+    def estimate(self, item) -> int:
+        """Return a lower bound on the number of times item was added."""
+        return self._counts.get(item, 0)
+
+    def __getitem__(self, item):
+        return self.estimate(item)
+
+    def top(self, m=None) -> list:
+        """Return list of the m (item, count) pairs with the highest counts,
+        highest first (all of them if m is None)."""
+        ranked = sorted(self._counts.items(), key=lambda ic: -ic[1])
+        return ranked if m is None else ranked[:m]
+
+    def merge(self, other) -> None:
+        """Add the counts of summary other into this summary.
+
+        Raise ValueError unless both summaries have the same k.
+        """
+        if self._k != other._k:
+            raise ValueError('summaries must have the same k')
+        for (item, c) in other._counts.items():
+            self._counts[item] = self._counts.get(item, 0) + c
+        self._total += other._total
+        if len(self._counts) > 2 * self._k:
+            self._reduce()
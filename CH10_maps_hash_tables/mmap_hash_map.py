@@ -0,0 +1,352 @@
+from compression_strategies import MADCompression
+from hash_map_base_abc import HashMapBase
+
+import hashlib
+import mmap
+import os
+import pickle
+import struct
+
+class MmapHashMap(HashMapBase):
+    """Persistent hash map stored in a memory-mapped file.
+
+    Uses linear probing, like ProbeHashMap, over an array of fixed-width
+    slots. Each slot holds a key's 64-bit hash code and the file offset of its
+    record. Records hold the pickled key and value in the heap region.
+    Overwriting a key rewrites its record in place when the new value's
+    pickle fits there, and appends a new record otherwise. Deleting a key
+    leaves its record behind as garbage, and resizing appends a fresh slot
+    array and abandons the old one in the same way; compact() rewrites the
+    file without the garbage.
+
+    Changes reach the file's header only when flush() or close() is called.
+    Opening with readonly=True maps the file read-only, so any number of
+    processes can share one copy of a large table.
+
+    The file records the parameters of its MAD compression function, so MAD
+    is the only compression strategy it supports.
+
+    Keys are hashed from a canonical encoding with a fixed function, so
+    lookups give the same answer in every process, and a hash match is
+    confirmed by comparing the unpickled stored key with ==. Pickled bytes
+    can't serve as either: pickle output depends on object identity and, for
+    sets, on PYTHONHASHSEED. Keys must therefore be None, bool, int, float,
+    str, bytes, or tuples and frozensets of those; other keys raise
+    TypeError. Equal numbers such as 1, 1.0 and True are the same key, as
+    they are in a dict.
+    """
+    _MAGIC = b'DSAPHMM2'
+    _HEADER = struct.Struct('<8s8Q') # magic, capacity, n, deleted,
+        # table offset, heap end, MAD prime, MAD scale, MAD shift
+    _SLOT = struct.Struct('<qQ') # hash code, record offset
+    _RECORD = struct.Struct('<II') # key length, value length
+    _EMPTY = 0 # record offset of a never-used slot
+    _AVAIL = 1 # record offset of a slot vacated by a deletion
+
+    class _SlotArray:
+        """Sequence view of the current slot array inside the mapped file."""
+        __slots__ = '_owner', '_offset', '_capacity'
+
+        def __init__(self, owner, offset, capacity):
+            self._owner = owner
+            self._offset = offset
+            self._capacity = capacity
+
+        def __len__(self):
+            return self._capacity
+
+        def __getitem__(self, j):
+            """Return (hash code, record offset) tuple stored at slot j."""
+            return MmapHashMap._SLOT.unpack_from(
+                self._owner._mm, self._offset + j * MmapHashMap._SLOT.size)
+
+        def __setitem__(self, j, slot):
+            MmapHashMap._SLOT.pack_into(
+                self._owner._mm, self._offset + j * MmapHashMap._SLOT.size,
+                *slot)
+
+    def __init__(self, path, cap=11, p=109345121, readonly=False):
+        """Open the map stored at path, creating the file if necessary.
+
+        Args:
+            path (str): File backing the map.
+            cap (int): Capacity of a newly created map.
+            p (int): A large prime number, for a newly created map.
+            readonly (bool): Map the file read-only. The file must exist.
+        """
+        self._path = path
+        self._readonly = readonly
+        self._min_capacity = cap
+        self._incremental = False # tables are rebuilt in place in the file
+        self._old = None
+        self._migrate_index = 0
+        exists = os.path.exists(path) and os.path.getsize(path) > 0
+        if readonly:
+            self._file = open(path, 'rb')
+            self._mm = mmap.mmap(self._file.fileno(), 0,
+                                 access=mmap.ACCESS_READ)
+        else:
+            self._file = open(path, 'r+b' if exists else 'w+b')
+            if not exists:
+                self._file.truncate(self._HEADER.size)
+            self._mm = mmap.mmap(self._file.fileno(), 0)
+        if exists:
+            (magic, capacity, self._n, self._deleted, table_offset,
+             self._heap_end, prime, scale,
+             shift) = self._HEADER.unpack_from(self._mm, 0)
+            if magic != self._MAGIC:
+                self._mm.close()
+                self._file.close()
+                raise ValueError(f'{path} is not a MmapHashMap file')
+            self._compression = MADCompression(prime, scale, shift)
+            self._table = self._SlotArray(self, table_offset, capacity)
+        else:
+            self._compression = MADCompression(p)
+            self._heap_end = self._HEADER.size
+            self._reset_table(cap)
+            self.flush()
+
+    #### File management ####
+
+    def flush(self) -> None:
+        """Write the header and all pending changes through to the file."""
+        if self._readonly:
+            return
+        mad = self._compression
+        self._HEADER.pack_into(self._mm, 0, self._MAGIC, len(self._table),
+                               self._n, self._deleted, self._table._offset,
+                               self._heap_end, mad._prime, mad._scale,
+                               mad._shift)
+        self._mm.flush()
+
+    def close(self) -> None:
+        """Flush and release the file. The map is unusable afterward."""
+        if self._mm.closed:
+            return
+        self.flush()
+        self._mm.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def compact(self) -> None:
+        """Rewrite the file with only the live records and a fresh slot array,
+        reclaiming the space of deleted and outgrown records.
+
+        The new file is written beside the old one and then swapped in, so
+        the map on disk is never half rewritten.
+        """
+        self._check_writable()
+        old, c = self._table, len(self._table)
+        slots = bytearray(c * self._SLOT.size) # all slots _EMPTY
+        tmp = self._path + '.tmp'
+        with open(tmp, 'wb') as f:
+            f.write(bytes(self._HEADER.size))
+            end = self._HEADER.size
+            for (h, offset) in (old[j] for j in range(c)):
+                if offset <= self._AVAIL:
+                    continue
+                klen, vlen = self._RECORD.unpack_from(self._mm, offset)
+                size = self._RECORD.size + klen + vlen
+                f.write(self._mm[offset:offset + size])
+                j = self._compress(h)
+                while self._SLOT.unpack_from(slots, j * self._SLOT.size)[1]:
+                    j = (j + 1) % c
+                self._SLOT.pack_into(slots, j * self._SLOT.size, h, end)
+                end += size
+            f.write(slots)
+            mad = self._compression
+            f.seek(0)
+            f.write(self._HEADER.pack(self._MAGIC, c, self._n, 0, end,
+                                      end + len(slots), mad._prime,
+                                      mad._scale, mad._shift))
+        self._mm.close()
+        self._file.close()
+        os.replace(tmp, self._path)
+        self._file = open(self._path, 'r+b')
+        self._mm = mmap.mmap(self._file.fileno(), 0)
+        self._table = self._SlotArray(self, end, c)
+        self._heap_end = end + len(slots)
+        self._deleted = 0
+
+    def _check_writable(self):
+        if self._readonly:
+            raise TypeError('map was opened read-only')
+
+    def _allocate(self, size: int) -> int:
+        """Reserve size bytes at the end of the heap and return their offset."""
+        offset = self._heap_end
+        self._heap_end += size
+        if self._heap_end > len(self._mm): # grow the file geometrically
+            size = max(self._heap_end, 2 * len(self._mm))
+            self._mm.close()
+            self._file.truncate(size)
+            self._mm = mmap.mmap(self._file.fileno(), 0)
+        return offset
+
+    def _write_record(self, kb: bytes, vb: bytes) -> int:
+        """Append a record for key bytes kb and value bytes vb; return its
+        offset."""
+        offset = self._allocate(self._RECORD.size + len(kb) + len(vb))
+        self._RECORD.pack_into(self._mm, offset, len(kb), len(vb))
+        start = offset + self._RECORD.size
+        self._mm[start:start + len(kb)] = kb
+        self._mm[start + len(kb):start + len(kb) + len(vb)] = vb
+        return offset
+
+    def _rewrite_value(self, offset: int, vb: bytes) -> bool:
+        """Overwrite the value bytes of the record at offset with vb, if they
+        fit in the record. Return False, changing nothing, if they don't.
+
+        The record keeps its length, so a later value as long as the first
+        still fits; pickle.loads ignores the stale bytes after a shorter one.
+        """
+        klen, vlen = self._RECORD.unpack_from(self._mm, offset)
+        if len(vb) > vlen:
+            return False
+        start = offset + self._RECORD.size + klen
+        self._mm[start:start + len(vb)] = vb
+        return True
+
+    def _record_key(self, offset: int) -> bytes:
+        klen, vlen = self._RECORD.unpack_from(self._mm, offset)
+        start = offset + self._RECORD.size
+        return self._mm[start:start + klen]
+
+    def _record_value(self, offset: int):
+        klen, vlen = self._RECORD.unpack_from(self._mm, offset)
+        start = offset + self._RECORD.size + klen
+        return pickle.loads(self._mm[start:start + vlen])
+
+    #### Hashing and probing ####
+
+    @staticmethod
+    def _key_bytes(k) -> bytes:
+        return pickle.dumps(k, protocol=4)
+
+    @classmethod
+    def _canonical(cls, k) -> bytes:
+        """Return an encoding of key k that is the same for all keys equal to
+        k, in every process. Raise TypeError for unsupported key types."""
+        if k is None:
+            return b'N'
+        if isinstance(k, float) and k.is_integer():
+            k = int(k) # equal to an int, so it must encode like one
+        if isinstance(k, int): # includes bool
+            return b'i' + str(int(k)).encode()
+        if isinstance(k, float): # repr round-trips, so it is canonical
+            return b'f' + repr(k).encode()
+        if isinstance(k, str):
+            k = k.encode('utf-8', 'surrogatepass')
+            return b's' + struct.pack('<Q', len(k)) + k
+        if isinstance(k, bytes):
+            return b'b' + struct.pack('<Q', len(k)) + k
+        if isinstance(k, tuple):
+            return b't' + struct.pack('<Q', len(k)) + b''.join(
+                cls._canonical(x) for x in k)
+        if isinstance(k, frozenset): # element order varies between processes
+            return b'z' + struct.pack('<Q', len(k)) + b''.join(
+                sorted(cls._canonical(x) for x in k))
+        raise TypeError('unsupported key type: ' + type(k).__name__)
+
+    def _hash_code(self, k) -> int:
+        """Return a hash code of k that is the same in every process."""
+        digest = hashlib.blake2b(self._canonical(k), digest_size=8).digest()
+        return int.from_bytes(digest, 'little', signed=True)
+
+    def _reset_table(self, c: int) -> None:
+        self._check_writable()
+        size = c * self._SLOT.size
+        offset = self._allocate(size)
+        self._mm[offset:offset + size] = bytes(size) # all slots _EMPTY
+        self._table = self._SlotArray(self, offset, c)
+        self._n = 0
+        self._deleted = 0
+
+    def _find_slot(self, j, k, h):
+        """Search for key k, with hash code h, in bucket at index j.
+
+        Return (success, index) tuple as ProbeHashMap._find_slot does.
+        """
+        table = self._table
+        first_avail = None
+        for _ in range(len(table)): # at most one probe per slot
+            stored, offset = table[j]
+            if offset == self._EMPTY:
+                return (False, j if first_avail is None else first_avail)
+            if offset == self._AVAIL:
+                if first_avail is None:
+                    first_avail = j
+            elif stored == h and pickle.loads(self._record_key(offset)) == k:
+                return (True, j) # only unpickle when the hashes agree
+            j = (j + 1) % len(table)
+        return (False, first_avail)
+
+    def _bucket_getitem(self, j, k, h=None):
+        if h is None:
+            h = self._hash_code(k)
+        found, s = self._find_slot(j, k, h)
+        if not found:
+            raise KeyError('Key Error: ' + repr(k))
+        return self._record_value(self._table[s][1])
+
+    def _bucket_setitem(self, j, k, v, h=None):
+        self._check_writable()
+        if h is None:
+            h = self._hash_code(k)
+        found, s = self._find_slot(j, k, h)
+        vb = pickle.dumps(v, protocol=4)
+        if found and self._rewrite_value(self._table[s][1], vb):
+            return # new value fit in the existing record
+        offset = self._write_record(self._key_bytes(k), vb)
+        if not found:
+            if self._table[s][1] == self._AVAIL:
+                self._deleted -= 1
+            self._n += 1
+        self._table[s] = (h, offset)
+
+    def _bucket_delitem(self, j, k, h=None):
+        self._check_writable()
+        if h is None:
+            h = self._hash_code(k)
+        found, s = self._find_slot(j, k, h)
+        if not found:
+            raise KeyError('Key Error: ' + repr(k))
+        self._table[s] = (0, self._AVAIL)
+        self._deleted += 1
+
+    def _bucket_items(self, j):
+        """Return list of the items stored at index j."""
+        h, offset = self._table[j]
+        if offset <= self._AVAIL:
+            return []
+        kb = self._record_key(offset)
+        return [self._HashItem(pickle.loads(kb), self._record_value(offset), h)]
+
+    def _rehash(self, c: int) -> None:
+        """Build a new slot array of capacity c from the stored hash codes.
+
+        Records stay where they are; only their (hash, offset) slots move.
+        """
+        old = self._table
+        live = [slot for slot in (old[j] for j in range(len(old)))
+                if slot[1] > self._AVAIL]
+        self._reset_table(c)
+        table = self._table # reset may have remapped the file; old still works
+        for (h, offset) in live:
+            j = self._compress(h)
+            while table[j][1] != self._EMPTY:
+                j = (j + 1) % c
+            table[j] = (h, offset)
+        self._n = len(live)
+
+    def _iter_keys(self):
+        table = self._table
+        for j in range(len(table)):
+            offset = table[j][1]
+            if offset > self._AVAIL:
+                yield pickle.loads(self._record_key(offset))
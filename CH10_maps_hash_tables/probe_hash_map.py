@@ -8,47 +8,93 @@ class ProbeHashMap(HashMapBase):
         """Return True if index j is available in table."""
         return self._table[j] is None or self._table[j] is ProbeHashMap._AVAIL
 
-    def _find_slot(self, j, k):
-        """Search for key k in bucket at index j.
+    def _find_slot(self, j, k, h=None):
+        """Search for key k, with hash code h, in bucket at index j.
 
         Return (success, index) tuple as follows:
             If match found, success is True and index denotes match's location.
             If no match found, success is False and index denotes first available
                 slot.
         """
+        if h is None:
+            h = self._hash_code(k)
         firstAvail = None
-        while True:
+        for i in range(1, len(self._table) + 1): # at most one probe per slot
             if self._is_available(j):
                 if firstAvail is None:
                     firstAvail = j  #mark this as first avail
                 if self._table[j] is None: # if that index is still empty, return false
                     return (False, firstAvail) # search has failed
-            elif k == self._table[j]._key: # _table is an _Item, _Item has instance
-                                            # variables _key and _value
+            elif self._table[j]._hash == h and k == self._table[j]._key:
+                    # _table is an _HashItem; a differing cached hash rules out
+                    #   a match without calling the key's __eq__
                 return (True, j) # found a match
-            j = (j + 1) % len(self._table) # keep looking (cyclically)
+            j = self._next_slot(j, i, h) # keep looking (cyclically)
+        return (False, firstAvail) # probe sequence exhausted without a None
 
-    def _bucket_getitem(self, j, k):
-        found, s = self._find_slot(j, k)
+    def _next_slot(self, j, i, h):
+        """Return the index to probe after index j, on step i of the probe
+        sequence for hash code h. Linear probing: the next index over.
+
+        Subclasses override this hook to change the probing strategy.
+        """
+        return (j + 1) % len(self._table)
+
+    def _bucket_getitem(self, j, k, h=None):
+        found, s = self._find_slot(j, k, h)
         if not found:
             raise KeyError('Key Error: ' + repr(k)) # no match found
         return self._table[s]._value
 
-    def _bucket_setitem(self, j, k, v):
-        found, s = self._find_slot(j, k)
+    def _bucket_setitem(self, j, k, v, h=None):
+        if h is None:
+            h = self._hash_code(k)
+        found, s = self._find_slot(j, k, h)
         if not found:
-            self._table[s] = self._Item(k, v) # insert new item
+            if self._table[s] is ProbeHashMap._AVAIL:
+                self._deleted -= 1 # reusing a previously vacated slot
+            self._table[s] = self._HashItem(k, v, h) # insert new item
             self._n += 1 # size has increased
         else:
             self._table[s]._value = v # overwrite existing
 
-    def _bucket_delitem(self, j, k):
-        found, s = self._find_slot(j, k)
+    def _bucket_delitem(self, j, k, h=None):
+        found, s = self._find_slot(j, k, h)
         if not found:
             raise KeyError('Key Error: ' + repr(k)) # no match found
         self._table[s] = ProbeHashMap._AVAIL # mark as vacated
+        self._deleted += 1
+
+    def _bucket_items(self, j):
+        """Return list of the items stored at index j."""
+        if self._is_available(j):
+            return []
+        return [self._table[j]]
+
+    def probe_stats(self):
+        """Return dict of probe-length statistics over the stored items.
+
+        An item's probe length is the number of slots a successful search for
+        it examines: 1 if it sits at its home index, more if it was displaced.
+        """
+        lengths = []
+        for s in range(len(self._table)):
+            if not self._is_available(s):
+                h = self._table[s]._hash
+                j = self._compress(h)
+                i = 1
+                while j != s: # replay the probe sequence up to the item
+                    j = self._next_slot(j, i, h)
+                    i += 1
+                lengths.append(i)
+        count = len(lengths)
+        mean = sum(lengths) / count if count else 0.0
+        variance = sum((x - mean) ** 2 for x in lengths) / count if count else 0.0
+        return {'count': count, 'mean': mean, 'variance': variance,
+                'max': max(lengths, default=0),
+                'load_factor': count / len(self._table)}
 
-    def __iter__(self): # scan entire table
+    def _iter_keys(self): # scan entire table
         for j in range(len(self._table)): # scan entire table
             if not self._is_available(j):
                 yield self._table[j]._key
@@ -0,0 +1,40 @@
+"""Compare probe-length statistics of the open-addressing hash maps.
+
+Fills each map with the same string keys, deletes and re-inserts a share of
+them to add churn, then prints each strategy's probe_stats().
+"""
+
+import random
+
+from probe_hash_map import ProbeHashMap
+from quadratic_probe_hash_map import QuadraticProbeHashMap
+from double_hash_probe_hash_map import DoubleHashProbeHashMap
+from robin_hood_hash_map import RobinHoodHashMap
+
+STRATEGIES = [ProbeHashMap, QuadraticProbeHashMap, DoubleHashProbeHashMap,
+              RobinHoodHashMap]
+
+def fill(cls, keys, churn):
+    """Return a map of type cls holding keys, after churn deletions and
+    reinsertions."""
+    hmap = cls()
+    for k in keys:
+        hmap[k] = None
+    for k in random.sample(keys, churn):
+        del hmap[k]
+    for k in random.sample(keys, churn):
+        hmap[k] = None
+    return hmap
+
+def main():
+    n = 100000
+    keys = [f'key-{random.getrandbits(64):x}' for _ in range(n)]
+    print(f'{"strategy":<24}{"load":>6}{"mean":>8}{"var":>8}{"max":>6}')
+    for cls in STRATEGIES:
+        stats = fill(cls, keys, n // 4).probe_stats()
+        print(f'{cls.__name__:<24}{stats["load_factor"]:>6.2f}'
+              f'{stats["mean"]:>8.3f}{stats["variance"]:>8.3f}'
+              f'{stats["max"]:>6d}')
+
+if __name__ == '__main__':
+    main()
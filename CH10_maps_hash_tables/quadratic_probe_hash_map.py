@@ -0,0 +1,20 @@
+from hash_map_base_abc import _next_prime
+from probe_hash_map import ProbeHashMap
+
+class QuadraticProbeHashMap(ProbeHashMap):
+    """Hash map implemented with quadratic probing for collision resolution.
+
+    Step i of a probe sequence examines index (home + i*i) mod N. With N prime
+    and load factor at most 0.5, the first half of the sequence is free of
+    repeats, so an available slot is always reached.
+    """
+
+    def _reset_table(self, c: int) -> None:
+        c = _next_prime(c) # capacity must be prime
+        if self._compression.capacity(c) != c:
+            raise ValueError('compression strategy needs a non-prime capacity')
+        super()._reset_table(c)
+
+    def _next_slot(self, j, i, h):
+        # (home + i^2) - (home + (i-1)^2) = 2i - 1
+        return (j + 2 * i - 1) % len(self._table)
@@ -0,0 +1,64 @@
+from probe_hash_map import ProbeHashMap
+
+class RobinHoodHashMap(ProbeHashMap):
+    """Hash map implemented with Robin Hood linear probing.
+
+    On insertion, an item that has traveled further from its home index takes
+    the slot of one that has traveled less ("take from the rich"), which keeps
+    probe lengths close together. Searches stop as soon as they pass an item
+    closer to home than the search itself, and deletions shift the rest of the
+    cluster back one slot instead of leaving _AVAIL sentinels behind.
+    """
+
+    def _distance(self, s):
+        """Return how far the item at index s sits from its home index."""
+        return (s - self._compress(self._table[s]._hash)) % len(self._table)
+
+    def _find_slot(self, j, k, h=None):
+        """Search for key k, with hash code h, starting at its home index j.
+
+        Return (success, index) tuple as follows:
+            If match found, success is True and index denotes match's location.
+            If no match found, success is False and index denotes the slot
+                where the search stopped.
+        """
+        if h is None:
+            h = self._hash_code(k)
+        for i in range(len(self._table)):
+            item = self._table[j]
+            if item is None or self._distance(j) < i:
+                return (False, j) # k would have been placed by now
+            if item._hash == h and k == item._key:
+                return (True, j)
+            j = (j + 1) % len(self._table)
+        return (False, j)
+
+    def _bucket_setitem(self, j, k, v, h=None):
+        if h is None:
+            h = self._hash_code(k)
+        found, s = self._find_slot(j, k, h)
+        if found:
+            self._table[s]._value = v # overwrite existing
+            return
+        carry = self._HashItem(k, v, h)
+        dist = (s - j) % len(self._table)
+        while self._table[s] is not None: # displace richer items down the run
+            resident = self._distance(s)
+            if resident < dist:
+                carry, self._table[s] = self._table[s], carry
+                dist = resident
+            s = (s + 1) % len(self._table)
+            dist += 1
+        self._table[s] = carry
+        self._n += 1
+
+    def _bucket_delitem(self, j, k, h=None):
+        found, s = self._find_slot(j, k, h)
+        if not found:
+            raise KeyError('Key Error: ' + repr(k)) # no match found
+        t = (s + 1) % len(self._table)
+        while self._table[t] is not None and self._distance(t) > 0:
+            self._table[s] = self._table[t] # backward-shift deletion
+            s = t
+            t = (t + 1) % len(self._table)
+        self._table[s] = None
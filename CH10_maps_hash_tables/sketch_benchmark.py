@@ -0,0 +1,84 @@
+"""Accuracy against memory for the approximate counting structures.
+
+Streams the words of word_frequency/sherlock_holmes.txt through a
+CountMinSketch, MisraGries, SpaceSaving and HyperLogLog at several sizes and
+compares each one with the exact counts. Each structure is also built as
+four partial sketches over quarters of the text and merged, as parallel
+workers would do, to show that merging loses no accuracy.
+"""
+
+from collections import Counter
+
+from count_min_sketch import CountMinSketch
+from hyperloglog import HyperLogLog
+from misra_gries import MisraGries
+from space_saving import SpaceSaving
+from string_hash_benchmark import TEXT, read_words
+
+def merged(make, words, parts=4):
+    """Return the merge of sketches made by make() over parts slices of
+    words."""
+    sketches = []
+    for i in range(parts):
+        sketch = make()
+        sketch.add_many(words[i::parts])
+        sketches.append(sketch)
+    for sketch in sketches[1:]:
+        sketches[0].merge(sketch)
+    return sketches[0]
+
+def count_min_error(sketch, exact, total):
+    """Return (mean, max) overcount over all distinct words, as a fraction of
+    the total count."""
+    errors = [sketch.estimate(w) - c for (w, c) in exact.items()]
+    return (sum(errors) / len(errors) / total, max(errors) / total)
+
+def top_recall(summary, exact, m=20):
+    """Return the share of the true top m words found in summary's top m."""
+    truth = {w for (w, c) in exact.most_common(m)}
+    return len(truth & {w for (w, c) in summary.top(m)}) / m
+
+def main():
+    words = read_words(TEXT)
+    exact = Counter(words)
+    total = len(words)
+    print(f'{total} words, {len(exact)} distinct')
+
+    print('\nCount-Min sketch, depth 4: overcount as a share of all words')
+    print(f'{"width":>8}{"bytes":>10}{"mean":>10}{"max":>10}{"merged max":>12}')
+    for width in (64, 256, 1024, 4096):
+        sketch = CountMinSketch(width, 4)
+        sketch.add_many(words)
+        mean, worst = count_min_error(sketch, exact, total)
+        parts = merged(lambda: CountMinSketch(width, 4), words)
+        print(f'{width:>8}{sketch.nbytes():>10}{mean:>10.5f}{worst:>10.5f}'
+              f'{count_min_error(parts, exact, total)[1]:>12.5f}')
+
+    print('\nHeavy hitters: recall of the true top 20, and worst count error')
+    print(f'{"k":>8}{"MG recall":>11}{"MG error":>10}{"SS recall":>11}'
+          f'{"SS error":>10}{"merged SS":>11}')
+    for k in (20, 50, 200, 1000):
+        mg = MisraGries(k)
+        mg.add_many(words)
+        ss = SpaceSaving(k)
+        ss.add_many(words)
+        top = [w for (w, c) in exact.most_common(20)]
+        mg_error = max(exact[w] - mg.estimate(w) for w in top)
+        ss_error = max(ss.estimate(w) - exact[w] for w in top)
+        parts = merged(lambda: SpaceSaving(k), words)
+        print(f'{k:>8}{top_recall(mg, exact):>11.2f}{mg_error:>10d}'
+              f'{top_recall(ss, exact):>11.2f}{ss_error:>10d}'
+              f'{top_recall(parts, exact):>11.2f}')
+
+    print('\nHyperLogLog: distinct-word estimate')
+    print(f'{"p":>8}{"bytes":>10}{"estimate":>10}{"error":>10}{"merged":>10}')
+    for p in (6, 8, 10, 12, 14):
+        hll = HyperLogLog(p)
+        hll.add_many(words)
+        error = (hll.estimate() - len(exact)) / len(exact)
+        parts = merged(lambda: HyperLogLog(p), words)
+        print(f'{p:>8}{hll.nbytes():>10}{len(hll):>10}{error:>10.3f}'
+              f'{len(parts):>10}')
+
+if __name__ == '__main__':
+    main()
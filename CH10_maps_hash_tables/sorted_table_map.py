@@ -1,7 +1,16 @@
 from map_base_abc import MapBase
 
+from bisect import bisect_left, bisect_right
+from collections.abc import Mapping, Sequence
+from operator import itemgetter
+
 class SortedTableMap(MapBase):
-    """Map implementation using a sorted table."""
+    """Map implementation using a sorted table.
+
+    Alongside the table of _Item objects, the map keeps a parallel plain list
+    of the keys, self._keys, so that binary searches run inside the bisect
+    module's C code instead of as recursive Python calls.
+    """
 
     ### nonpublic behaviors ###
     def _find_index(self, k, low: int, high: int) -> int:
@@ -18,21 +27,84 @@ class SortedTableMap(MapBase):
             k (suitable object): Object of type suitable for use as a key in
                 a sorted table--must support comparison operators.
         """
-        if high < low:  # no element qualifies
-            return high + 1 # base case 1: found no match
+        return bisect_left(self._keys, k, low, max(low, high + 1))
+
+    def _range_indices(self, start, stop):
+        """Return (j, end) such that table[j:end] holds exactly the items with
+        start <= key < stop, with None for start or stop meaning unbounded."""
+        j = 0 if start is None else bisect_left(self._keys, start)
+        if stop is None:
+            end = len(self._keys)
         else:
-            mid = (low + high) // 2
-            if k == self._table[mid]._key:
-                return mid # base case 2: found exact match
-            elif k < self._table[mid]._key:
-                return self._find_index(k, low, mid - 1) # NB may return mid
-            else:
-                return self._find_index(k, mid + 1, high) # answer is right of mid
+            end = bisect_left(self._keys, stop, j) # never less than j
+        return (j, end)
+
+    ### nested range view classes ###
+    class _RangeView(Sequence):
+        """Read-only sequence of the (key, value) pairs at a range of table
+        indices.
+
+        Indexing, slicing, len() and reversed() go straight to the map's
+        lists, so nothing is copied up front. The indices are fixed when the
+        view is made, so a view is only meaningful until the map is next
+        modified.
+        """
+        __slots__ = '_map', '_indices'
+
+        def __init__(self, stmap, indices):
+            self._map = stmap
+            self._indices = indices # a range object of table indices
+
+        def _at(self, j):
+            return (self._map._keys[j], self._map._table[j]._value)
+
+        def __len__(self):
+            return len(self._indices)
+
+        def __getitem__(self, i):
+            if isinstance(i, slice): # a slice of a view is another view
+                return type(self)(self._map, self._indices[i])
+            return self._at(self._indices[i]) # may raise IndexError
+
+        def __iter__(self):
+            return map(self._at, self._indices)
+
+        def __reversed__(self):
+            return map(self._at, reversed(self._indices))
+
+        def keys(self):
+            """Return a view of just the keys in the range."""
+            return SortedTableMap._RangeKeys(self._map, self._indices)
+
+        def values(self):
+            """Return a view of just the values in the range."""
+            return SortedTableMap._RangeValues(self._map, self._indices)
+
+    class _RangeKeys(_RangeView):
+        """Range view that yields keys only."""
+        __slots__ = ()
+
+        def _at(self, j):
+            return self._map._keys[j]
+
+        def __iter__(self): # avoid a Python-level call per key
+            return map(self._map._keys.__getitem__, self._indices)
+
+        def __reversed__(self):
+            return map(self._map._keys.__getitem__, reversed(self._indices))
+
+    class _RangeValues(_RangeView):
+        """Range view that yields values only."""
+        __slots__ = ()
+
+        def _at(self, j):
+            return self._map._table[j]._value
 
     ### public behaviors ###
     def __init__(self):
         """Create an empty map."""
         self._table = [] # underlying table is a Python list
+        self._keys = [] # self._keys[j] is always self._table[j]._key
 
     def __len__(self):
         """Return number of items in the map."""
@@ -40,79 +112,84 @@ class SortedTableMap(MapBase):
 
     def __getitem__(self, k):
         """Return value associated with key k (raise KeyError if not found)."""
-        j = self._find_index(k, 0, len(self._table) - 1)
-        if j == len(self._table) or self._table[j]._key != k:
+        j = bisect_left(self._keys, k)
+        if j == len(self._keys) or self._keys[j] != k:
             raise KeyError('Key Error: ' + repr(k))
         return self._table[j]._value
 
     def __setitem__(self, k, v):
         """Assign value v to key k, overwriting existing value if present."""
-        j = self._find_index(k, 0, len(self._table) - 1)
-        if j < len(self._table) and self._table[j]._key == k: # if key k is already in the table
+        j = bisect_left(self._keys, k)
+        if j < len(self._keys) and self._keys[j] == k: # if key k is already in the table
             self._table[j]._value = v # reassign value
         else:
             self._table.insert(j, self._Item(k, v)) # add new item
+            self._keys.insert(j, k)
 
     def __delitem__(self, k):
         """Remove item associated with key k (raise KeyError if not found)."""
-        j = self._find_index(k, 0, len(self._table) - 1)
-        if j == len(self._table) or self._table[j]._key != k:
+        j = bisect_left(self._keys, k)
+        if j == len(self._keys) or self._keys[j] != k:
             raise KeyError('Key Error: ' + repr(k))
         self._table.pop(j) # use list object's pop method to delete item
+        self._keys.pop(j)
 
     def __iter__(self):
         """Generate the keys of the map ordered from minimum to maximum."""
-        for item in self._table:
-            yield item._key
+        yield from self._keys
 
     def __reversed__(self):
         """Generate keys of the map ordered from maximum to minimum."""
         # We're telling Python that reversed() should generate the keys as
         #   opposed to something else. Same as our __iter__ specifying that
         #   we want to generate the keys.
-        for item in reversed(self._table): # can call reversed() here because
-                                            #   self._table is a list, so it
-                                            # already has a __reversed__ method.
-            yield item._key
+        yield from reversed(self._keys) # can call reversed() here because
+                                        #   self._keys is a list, so it already
+                                        #   has a __reversed__ method.
 
     def find_min(self):
         """Return (key, value) pair with minimum key (or None if empty)."""
         if len(self._table) > 0:
-            return (self._table[0]._key, self._table[0]._value)
+            return (self._keys[0], self._table[0]._value)
         else:
             return None
 
     def find_max(self):
         """Return (key, value) pair with maximum key (or None if empty)."""
         if len(self._table) > 0:
-            return (self._table[-1]._key, self._table[-1]._value)
+            return (self._keys[-1], self._table[-1]._value)
         else:
             return None
 
     def find_ge(self, k): # "ge" -> "greater than or equal to"
         """Return (key, value) pair with least key greater than or equal to k."""
-        j = self._find_index(k, 0, len(self._table) - 1) # j's key >= k
+        j = bisect_left(self._keys, k) # j's key >= k
         if j < len(self._table):
-            return (self._table[j]._key, self._table[j]._value)
+            return (self._keys[j], self._table[j]._value)
+        else:
+            return None
+
+    def find_le(self, k): # "less than or equal to"
+        """Return (key, value) pair with greatest key less than or equal to k."""
+        j = bisect_right(self._keys, k) # j's key > k
+        if j > 0:
+            return (self._keys[j-1], self._table[j-1]._value)
         else:
             return None
 
     def find_lt(self, k): # "less than"
         """Return (key, value) pair with greatest key strictly less than k."""
-        j = self._find_index(k, 0, len(self._table) - 1) # j's key >= k
+        j = bisect_left(self._keys, k) # j's key >= k
         if j > 0:
-            return (self._table[j-1]._key, self._table[j-1]._value) # Note use of j - 1
+            return (self._keys[j-1], self._table[j-1]._value) # Note use of j - 1
         else:
             return None
 
     def find_gt(self, k):
         """Return (key, value) pair with least key strictly greater than k."""
-        j = self._find_index(k, 0, len(self._table) - 1) # j's key >= k
-        if j < len(self._table) and self._table[j]._key == k:
-            j += 1 # advance it one more to reach first item after match, i.e.
-                    # the least key strictly greater than target key k
+        j = bisect_right(self._keys, k) # j's key > k, skipping past a match
         if j < len(self._table):
-            return (self._table[j]._key, self._table[j]._value)
+            return (self._keys[j], self._table[j]._value)
         else:
             return None
 
@@ -122,13 +199,114 @@ class SortedTableMap(MapBase):
         If start is None, iteration begins with minimum key of map.
         If stop is None, iteration continues through the maximum key of map.
         """
-        if start is None:
-            j = 0
-        else:
-            j = self._find_index(start, 0, len(self._table) - 1) # find first result
-        while j < len(self._table) and\
-              (stop is None or self._table[j]._key < stop):
-            yield (self._table[j]._key, self._table[j]._value)
-            j += 1
-            
-        
+        yield from self.range_view(start, stop)
+
+    def range_view(self, start=None, stop=None):
+        """Return a read-only sequence view of the (key, value) pairs such
+        that start <= key < stop.
+
+        Both endpoints are found by binary search once, so len() of the view
+        is O(1). The view supports indexing, slicing and reversed(), and its
+        keys() and values() methods return views of just the keys or values.
+        start and stop being None mean the same as in find_range.
+        """
+        return self._RangeView(self, range(*self._range_indices(start, stop)))
+
+    ### bulk operations ###
+    def update_sorted(self, items) -> None:
+        """Insert the (key, value) pairs of items, overwriting existing values.
+
+        The batch is sorted once and merged into the table in a single pass,
+        instead of shifting the table once per new key. Runs of existing keys
+        between two batch keys are copied over as whole slices. If a key
+        appears more than once in items, its last value wins.
+
+        Args:
+            items: Iterable of (key, value) pairs, or a mapping.
+        """
+        if isinstance(items, Mapping):
+            items = items.items()
+        batch = sorted(items, key=itemgetter(0)) # stable, so later pairs
+                                                 #   stay after earlier ones
+        if not batch:
+            return
+        table = self._table
+        keys = self._keys
+        new_table = []
+        new_keys = []
+        i = 0 # next item of the old table not yet copied
+        for b in range(len(batch)):
+            k, v = batch[b]
+            if b + 1 < len(batch) and not batch[b + 1][0] > k:
+                continue # duplicate key; a later pair overrides this one
+            j = bisect_left(keys, k, i)
+            new_table.extend(table[i:j]) # old items less than k
+            new_keys.extend(keys[i:j])
+            if j < len(keys) and keys[j] == k: # key already in the table
+                table[j]._value = v
+                new_table.append(table[j])
+                new_keys.append(keys[j])
+                i = j + 1
+            else:
+                new_table.append(self._Item(k, v))
+                new_keys.append(k)
+                i = j
+        new_table.extend(table[i:])
+        new_keys.extend(keys[i:])
+        self._table = new_table
+        self._keys = new_keys
+
+    def delete_range(self, start, stop) -> int:
+        """Remove all items such that start <= key < stop. Return the number
+        of items removed.
+
+        start and stop being None mean the same as in find_range.
+        """
+        j, end = self._range_indices(start, stop)
+        del self._table[j:end] # one splice instead of one pop per item
+        del self._keys[j:end]
+        return end - j
+
+    ### order statistics ###
+    def rank(self, k) -> int:
+        """Return the number of keys strictly less than k."""
+        return self._find_index(k, 0, len(self._table) - 1)
+
+    def select(self, i: int):
+        """Return (key, value) pair with the i-th smallest key, counting from 0.
+
+        Raise IndexError unless 0 <= i < len(self).
+        """
+        if not 0 <= i < len(self._table):
+            raise IndexError('Index Error: ' + repr(i))
+        return (self._keys[i], self._table[i]._value)
+
+    def count_range(self, start, stop) -> int:
+        """Return the number of keys such that start <= key < stop.
+
+        start and stop being None mean the same as in find_range.
+        """
+        j, end = self._range_indices(start, stop)
+        return end - j
+
+    def percentile(self, p):
+        """Return (key, value) pair at the p-th percentile of the keys, by the
+        nearest-rank method (or None if empty).
+
+        That is the smallest key such that at least p percent of the keys are
+        less than or equal to it. Raise ValueError unless 0 <= p <= 100.
+        """
+        if not 0 <= p <= 100:
+            raise ValueError('percentile must be between 0 and 100')
+        n = len(self._table)
+        if n == 0:
+            return None
+        r = -(-p * n // 100) # ceil(p * n / 100), the 1-based nearest rank
+        return self.select(max(int(r), 1) - 1)
+
+    def median(self):
+        """Return (key, value) pair with the median key (or None if empty).
+
+        For an even number of keys, this is the lower of the middle two.
+        """
+        return self.percentile(50)
@@ -0,0 +1,116 @@
+import heapq
+import itertools
+
+class SpaceSaving:
+    """Top-k heavy hitters with exactly k counters (Space-Saving).
+
+    An item without a counter takes over the counter with the smallest count
+    m once all k are in use. Its count becomes m plus its own count, and m is
+    recorded as that counter's possible overcount. A reported count is never
+    less than the true count, and never more than it by more than n / k,
+    where n is the total count seen.
+
+    The smallest counter is found with a heap of (count, tiebreak, item)
+    entries that is updated lazily. An entry whose count is out of date is
+    skipped when it reaches the top, and the heap is rebuilt once it has too
+    many stale entries.
+
+    Summaries can be merged (Agarwal et al., "Mergeable Summaries"): an item
+    missing from one summary is charged that summary's smallest count.
+    """
+
+    def __init__(self, k=100):
+        """Create an empty summary with k counters."""
+        self._k = k
+        self._counts = {}
+        self._errors = {} # possible overcount of each counter
+        self._heap = [] # (count, tiebreak, item) entries; some may be stale
+        self._tiebreak = itertools.count() # items themselves may not compare
+        self._total = 0
+
+    def __len__(self):
+        """Return the total count added to the summary."""
+        return self._total
+
+    def _min_item(self):
+        """Return the item with the smallest count (summary must be full)."""
+        heap = self._heap
+        while heap[0][0] != self._counts.get(heap[0][2]): # stale entry
+            heapq.heappop(heap)
+        return heap[0][2]
+
+    def _rebuild_heap(self) -> None:
+        self._heap = [(c, next(self._tiebreak), item)
+                      for (item, c) in self._counts.items()]
+        heapq.heapify(self._heap)
+
+    def add(self, item, count=1) -> None:
+        """Add count occurrences of item."""
+        self._total += count
+        counts = self._counts
+        if item in counts:
+            counts[item] += count
+        elif len(counts) < self._k:
+            counts[item] = count
+            self._errors[item] = 0
+        else: # take over the smallest counter
+            victim = self._min_item()
+            floor = counts.pop(victim)
+            del self._errors[victim]
+            counts[item] = floor + count
+            self._errors[item] = floor
+        heapq.heappush(self._heap, (counts[item], next(self._tiebreak), item))
+        if len(self._heap) > 4 * self._k: # mostly stale; start over
+            self._rebuild_heap()
+
+    def add_many(self, items) -> None:
+        """Add one occurrence of each of items."""
+        for item in items:
+            self.add(item)
+
+    def _floor(self) -> int:
+        """Return the smallest count, which bounds the count of any item
+        without a counter, or 0 if some counter is unused."""
+        if len(self._counts) < self._k:
+            return 0
+        return self._counts[self._min_item()]
+
+    def estimate(self, item) -> int:
+        """Return an upper bound on the number of times item was added."""
+        count = self._counts.get(item)
+        return self._floor() if count is None else count
+
+    def __getitem__(self, item):
+        return self.estimate(item)
+
+    def guaranteed(self, item) -> int:
+        """Return a lower bound on the number of times item was added."""
+        if item not in self._counts:
+            return 0
+        return self._counts[item] - self._errors[item]
+
+    def top(self, m=None) -> list:
+        """Return list of the m (item, count) pairs with the highest counts,
+        highest first (all of them if m is None)."""
+        ranked = sorted(self._counts.items(), key=lambda ic: -ic[1])
+        return ranked if m is None else ranked[:m]
+
+    def merge(self, other) -> None:
+        """Add the counts of summary other into this summary.
+
+        Raise ValueError unless both summaries have the same k.
+        """
+        if self._k != other._k:
+            raise ValueError('summaries must have the same k')
+        mine, theirs = self._floor(), other._floor()
+        counts, errors = {}, {}
+        for item in self._counts.keys() | other._counts.keys():
+            counts[item] = (self._counts.get(item, mine) +
+                            other._counts.get(item, theirs))
+            errors[item] = (self._errors.get(item, mine) +
+                            other._errors.get(item, theirs))
+        keep = heapq.nlargest(self._k, counts, key=counts.__getitem__)
+        self._counts = {item: counts[item] for item in keep}
+        self._errors = {item: errors[item] for item in keep}
+        self._total += other._total
+        self._rebuild_heap()
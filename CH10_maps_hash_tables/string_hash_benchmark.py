@@ -0,0 +1,66 @@
+"""Compare collision rate against throughput for the string hash families.
+
+Hashes every word of word_frequency/sherlock_holmes.txt one at a time and as
+one batch, then counts collisions among the distinct words. It counts both
+full hash codes and slots of a table with about two slots per word.
+"""
+
+import os
+import time
+
+from hash_code_cyclic_shift import hash_code as reference_cyclic_shift
+from hash_map_base_abc import _next_prime
+from probe_hash_map import ProbeHashMap
+from string_hash_families import CyclicShiftHash, FNV1aHash, PolynomialHash
+
+TEXT = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                    'word_frequency', 'sherlock_holmes.txt')
+
+FAMILIES = [('builtin hash', hash),
+            ('reference cyclic shift', reference_cyclic_shift),
+            ('cyclic shift', CyclicShiftHash()),
+            ('polynomial a=33', PolynomialHash(33)),
+            ('polynomial a=41', PolynomialHash(41)),
+            ('FNV-1a', FNV1aHash())]
+
+def read_words(filename):
+    """Return list of the lowercase alphabetic words in filename."""
+    words = []
+    with open(filename, encoding='UTF-8') as f:
+        for piece in f.read().lower().split():
+            word = ''.join(c for c in piece if c.isalpha())
+            if word:
+                words.append(word)
+    return words
+
+def rate(f, arg, count):
+    """Return millions of words per second for f(arg) covering count words."""
+    start = time.perf_counter()
+    f(arg)
+    return count / (time.perf_counter() - start) / 1e6
+
+def main():
+    words = read_words(TEXT)
+    distinct = sorted(set(words))
+    slots = _next_prime(2 * len(distinct))
+    print(f'{len(words)} words, {len(distinct)} distinct, {slots} slots')
+    print(f'{"family":<24}{"scalar M/s":>12}{"batch M/s":>11}'
+          f'{"code coll.":>12}{"slot coll.":>12}{"map fill s":>12}')
+    for (name, f) in FAMILIES:
+        scalar = rate(lambda ws: [f(w) for w in ws], words, len(words))
+        many = getattr(f, 'many', None)
+        batch = f'{rate(many, words, len(words)):>11.2f}' if many else \
+                f'{"-":>11}'
+        codes = [f(w) for w in distinct]
+        code_collisions = len(distinct) - len(set(codes))
+        slot_collisions = len(distinct) - len({h % slots for h in codes})
+        start = time.perf_counter()
+        hmap = ProbeHashMap(hash_code=f)
+        for w in words:
+            hmap[w] = hmap.get(w, 0) + 1
+        fill = time.perf_counter() - start
+        print(f'{name:<24}{scalar:>12.2f}{batch}{code_collisions:>12d}'
+              f'{slot_collisions:>12d}{fill:>12.2f}')
+
+if __name__ == '__main__':
+    main()
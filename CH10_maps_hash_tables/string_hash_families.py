@@ -0,0 +1,125 @@
+"""Families of string hash codes with scalar and batch interfaces.
+
+Every family hashes the UTF-8 bytes of a string, so for ASCII text
+CyclicShiftHash gives the same codes as hash_code_cyclic_shift.hash_code.
+Codes are returned as signed 64-bit ints, which NumPy and HashMapBase's
+batch methods can take without overflow.
+
+An instance is callable on one key and can be passed to any HashMapBase map
+as its hash_code function. The many() method hashes a whole batch in one
+call. With NumPy installed, it hashes position j of every string at once, so
+Python-level work grows with the longest string instead of with the total
+amount of text.
+"""
+
+try:
+    import numpy as np
+except ImportError: # many() falls back to a pure-Python loop
+    np = None
+
+_MASK64 = (1 << 64) - 1
+
+def _signed64(h: int) -> int:
+    """Return the signed 64-bit int with the same bits as h mod 2**64."""
+    h &= _MASK64
+    return h - (1 << 64) if h >> 63 else h
+
+def _to_bytes(s) -> bytes:
+    """Return the UTF-8 encoding of str s, or the bytes of bytes-like s."""
+    if isinstance(s, str):
+        return s.encode('utf-8')
+    return bytes(memoryview(s)) # raises TypeError for non-bytes-like keys
+
+class _StringHashFamily:
+    """Base class for a hash code computed one byte at a time.
+
+    Subclasses set _initial and implement _step(h, c) for Python ints and
+    _step_array(h, c) for NumPy uint64 arrays.
+    """
+    _initial = 0
+
+    def __call__(self, s) -> int:
+        """Return the hash code of str or bytes-like s."""
+        h = self._initial
+        for c in _to_bytes(s):
+            h = self._step(h, c)
+        return _signed64(h)
+
+    def many(self, strings) -> list:
+        """Return list of hash codes, one per string.
+
+        Args:
+            strings: Sequence of str or bytes-like objects, or a single
+                bytes-like buffer, whose whitespace-separated tokens are
+                hashed.
+        """
+        if isinstance(strings, (bytes, bytearray, memoryview)):
+            encoded = bytes(strings).split()
+        else:
+            try:
+                encoded = list(map(str.encode, strings)) # all str; stays in C
+            except TypeError: # some are bytes-like
+                encoded = [_to_bytes(s) for s in strings]
+        if np is None or len(encoded) < 2:
+            return [self(s) for s in encoded]
+        n = len(encoded)
+        lengths = np.fromiter(map(len, encoded), dtype=np.int64, count=n)
+        flat = np.frombuffer(b''.join(encoded), dtype=np.uint8)
+        starts = np.zeros(n, dtype=np.int64)
+        np.cumsum(lengths[:-1], out=starts[1:])
+        # Sort longest first, so the strings still being hashed at position j
+        #   are always a prefix of the arrays.
+        order = np.argsort(-lengths, kind='stable')
+        neg_lengths = -lengths[order]
+        starts = starts[order]
+        h = np.full(n, self._initial, dtype=np.uint64)
+        for j in range(int(-neg_lengths[0]) if n else 0):
+            active = int(np.searchsorted(neg_lengths, -j)) # lengths > j
+            c = flat[starts[:active] + j].astype(np.uint64)
+            h[:active] = self._step_array(h[:active], c)
+        codes = np.empty_like(h)
+        codes[order] = h
+        return codes.view(np.int64).tolist()
+
+class CyclicShiftHash(_StringHashFamily):
+    """Cyclic-shift hash code over 32 bits, as in hash_code_cyclic_shift."""
+
+    def __init__(self, shift=5):
+        """Create a cyclic-shift family rotating by shift bits per byte."""
+        self._shift = shift
+
+    def _step(self, h, c):
+        h = (h << self._shift & 0xFFFFFFFF) | (h >> (32 - self._shift))
+        return h + c
+
+    def _step_array(self, h, c):
+        left = np.uint64(self._shift)
+        right = np.uint64(32 - self._shift)
+        return ((h << left) & np.uint64(0xFFFFFFFF) | (h >> right)) + c
+
+class PolynomialHash(_StringHashFamily):
+    """Polynomial hash code: the bytes are the coefficients of a polynomial,
+    evaluated at a by Horner's rule, mod 2**64."""
+
+    def __init__(self, a=33):
+        """Create a polynomial family evaluated at a (33, 37, 39 and 41 give
+        few collisions on English words)."""
+        self._a = a
+
+    def _step(self, h, c):
+        return (h * self._a + c) & _MASK64
+
+    def _step_array(self, h, c):
+        return h * np.uint64(self._a) + c # uint64 arithmetic wraps mod 2**64
+
+class FNV1aHash(_StringHashFamily):
+    """64-bit FNV-1a hash code: xor in each byte, then multiply by the FNV
+    prime."""
+    _initial = 0xCBF29CE484222325 # FNV offset basis
+    _PRIME = 0x100000001B3
+
+    def _step(self, h, c):
+        return ((h ^ c) * self._PRIME) & _MASK64
+
+    def _step_array(self, h, c):
+        return (h ^ c) * np.uint64(self._PRIME)
@@ -0,0 +1,135 @@
+import random
+import unittest
+
+from blocked_sorted_table_map import BlockedSortedTableMap
+from sorted_table_map import SortedTableMap
+
+class TestBasicTable(unittest.TestCase):
+    """Basic-coverage tests."""
+
+    def setUp(self):
+        self.bmap = BlockedSortedTableMap()
+
+    def test_init(self):
+        self.assertIsInstance(self.bmap, BlockedSortedTableMap)
+        self.assertEqual(len(self.bmap), 0)
+
+    def test_setitem_getitem(self):
+        with self.assertRaises(KeyError):
+            self.bmap["key"]
+        self.bmap["key"] = "value"
+        self.assertEqual(self.bmap["key"], "value")
+        self.bmap["key"] = "updated value"
+        self.assertEqual(self.bmap["key"], "updated value")
+        self.assertEqual(len(self.bmap), 1)
+
+    def test_delitem(self):
+        with self.assertRaises(KeyError):
+            del self.bmap["key"]
+        self.bmap["key"] = "value"
+        del self.bmap["key"]
+        self.assertEqual(len(self.bmap), 0)
+        self.assertEqual(self.bmap._keys, [])
+        self.assertEqual(self.bmap._maxes, [])
+        with self.assertRaises(KeyError):
+            self.bmap["key"]
+
+    def test_iter_and_reversed(self):
+        for i in [3, 1, 4, 0, 2]:
+            self.bmap[i] = i
+        self.assertEqual(list(self.bmap), [0, 1, 2, 3, 4])
+        self.assertEqual(list(reversed(self.bmap)), [4, 3, 2, 1, 0])
+
+    def test_find_key_methods_return_none_when_table_empty(self):
+        k = 1
+        self.assertIsNone(self.bmap.find_min())
+        self.assertIsNone(self.bmap.find_max())
+        self.assertIsNone(self.bmap.find_ge(k))
+        self.assertIsNone(self.bmap.find_le(k))
+        self.assertIsNone(self.bmap.find_lt(k))
+        self.assertIsNone(self.bmap.find_gt(k))
+        self.assertEqual(list(self.bmap.find_range(None, None)), [])
+
+class TestAccessorsWithAlphabetTable(unittest.TestCase):
+    """Uses a table of 26 (number, letter) k-v pairs, split over several
+    small blocks, to test the methods that return min, max, less than, etc."""
+
+    def setUp(self):
+        self.bmap = BlockedSortedTableMap(load=2)
+        for i in range(26):
+            self.bmap[i] = chr(ord("a") + i)
+
+    def test_blocks_are_bounded(self):
+        self.assertGreater(len(self.bmap._keys), 1)
+        for keys in self.bmap._keys:
+            self.assertLessEqual(len(keys), 4)
+        self.assertEqual(self.bmap._maxes, [keys[-1] for keys in self.bmap._keys])
+
+    def test_find_min_max(self):
+        self.assertEqual(self.bmap.find_min(), (0, "a"))
+        self.assertEqual(self.bmap.find_max(), (25, "z"))
+
+    def test_find_comparisons(self):
+        self.assertEqual(self.bmap.find_ge(15), (15, "p"))
+        self.assertEqual(self.bmap.find_ge(14.5), (15, "p"))
+        self.assertEqual(self.bmap.find_le(15), (15, "p"))
+        self.assertEqual(self.bmap.find_le(15.5), (15, "p"))
+        self.assertEqual(self.bmap.find_lt(15), (14, "o"))
+        self.assertEqual(self.bmap.find_gt(15), (16, "q"))
+
+    def test_find_across_block_boundaries(self):
+        for b in range(len(self.bmap._maxes) - 1):
+            last = self.bmap._maxes[b]
+            self.assertEqual(self.bmap.find_gt(last)[0], last + 1)
+            self.assertEqual(self.bmap.find_lt(last + 1)[0], last)
+
+    def test_find_at_table_ends(self):
+        self.assertEqual(self.bmap.find_ge(-5), (0, "a"))
+        self.assertIsNone(self.bmap.find_ge(26))
+        self.assertIsNone(self.bmap.find_lt(0))
+        self.assertIsNone(self.bmap.find_le(-1))
+        self.assertIsNone(self.bmap.find_gt(25))
+        self.assertEqual(self.bmap.find_le(100), (25, "z"))
+
+    def test_find_range(self):
+        expected = [(i, chr(ord("a") + i)) for i in range(15)]
+        self.assertEqual(list(self.bmap.find_range(None, 15)), expected)
+        expected = [(i, chr(ord("a") + i)) for i in range(10, 20)]
+        self.assertEqual(list(self.bmap.find_range(10, 20)), expected)
+        self.assertEqual(len(list(self.bmap.find_range(None, None))), 26)
+        self.assertEqual(list(self.bmap.find_range(20, 10)), [])
+
+class TestAgainstSortedTableMap(unittest.TestCase):
+    """Random operations should leave both sorted maps in the same state."""
+
+    def test_random_operations(self):
+        rng = random.Random(13)
+        bmap = BlockedSortedTableMap(load=4)
+        stmap = SortedTableMap()
+        for step in range(3000):
+            k = rng.randrange(200)
+            if rng.random() < 0.6:
+                bmap[k] = stmap[k] = step
+            elif k in stmap:
+                del bmap[k]
+                del stmap[k]
+            else:
+                with self.assertRaises(KeyError):
+                    del bmap[k]
+            if step % 100 == 0:
+                self.assertEqual(list(bmap.items()), list(stmap.items()))
+                self.assertEqual(bmap._maxes, [keys[-1] for keys in bmap._keys])
+                for keys in bmap._keys:
+                    self.assertTrue(0 < len(keys) <= 8)
+        self.assertEqual(len(bmap), len(stmap))
+        self.assertEqual(list(bmap.items()), list(stmap.items()))
+        for k in range(-1, 201, 7):
+            self.assertEqual(bmap.find_ge(k), stmap.find_ge(k))
+            self.assertEqual(bmap.find_le(k), stmap.find_le(k))
+            self.assertEqual(bmap.find_lt(k), stmap.find_lt(k))
+            self.assertEqual(bmap.find_gt(k), stmap.find_gt(k))
+            self.assertEqual(list(bmap.find_range(k, k + 30)),
+                             list(stmap.find_range(k, k + 30)))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -3,6 +3,23 @@ import unittest
 from chain_hash_map import ChainHashMap
 from unsorted_table_map import UnsortedTableMap
 
+class CountingKey:
+    """Key that counts calls to __hash__ and __eq__, with a chosen hash code."""
+    hash_calls = 0
+    eq_calls = 0
+
+    def __init__(self, name, h):
+        self.name = name
+        self.h = h
+
+    def __hash__(self):
+        CountingKey.hash_calls += 1
+        return self.h
+
+    def __eq__(self, other):
+        CountingKey.eq_calls += 1
+        return self.name == other.name
+
 class TestSimpleMap(unittest.TestCase):
     """Basic-coverage functionality tests."""
 
@@ -76,6 +93,12 @@ class TestSimpleMap(unittest.TestCase):
             self.chmap[i] = i
         self.assertEqual(len(self.chmap), 4)
 
+    def test_bucket_setitem_reports_insert(self):
+        j = self.chmap._hash_function("key")
+        self.assertTrue(self.chmap._bucket_setitem(j, "key", 1))
+        self.assertFalse(self.chmap._bucket_setitem(j, "key", 2))
+        self.assertEqual(len(self.chmap), 1)
+
     def test_resize(self):
         # default capacity should be 11
         assert len(self.chmap._table) == 11
@@ -88,5 +111,185 @@ class TestSimpleMap(unittest.TestCase):
         expected_new_size = 11 * 2 - 1
         self.assertEqual(len(self.chmap._table), expected_new_size)
 
+    def test_shrink(self):
+        for i in range(200):
+            self.chmap[i] = i
+        grown = len(self.chmap._table)
+        for i in range(195):
+            del self.chmap[i]
+        self.assertLess(len(self.chmap._table), grown)
+        for i in range(195, 200):
+            self.assertEqual(self.chmap[i], i)
+
+class TestIncrementalResize(unittest.TestCase):
+    """Tests for the incremental-rehash mode."""
+
+    def setUp(self):
+        self.chmap = ChainHashMap(incremental=True)
+
+    def test_resize_keeps_old_table_until_drained(self):
+        for i in range(6): # 6th item crosses load factor 0.5 at capacity 11
+            self.chmap[i] = i
+        self.assertEqual(len(self.chmap._table), 21)
+        self.assertIsNotNone(self.chmap._old) # old table not drained yet
+        self.assertEqual(len(self.chmap), 6)
+        for i in range(6):
+            self.assertEqual(self.chmap[i], i) # each access moves buckets over
+        self.assertIsNone(self.chmap._old)
+        self.assertEqual(len(self.chmap), 6)
+
+    def test_operations_during_migration(self):
+        for i in range(6):
+            self.chmap[i] = i
+        assert self.chmap._old is not None
+        self.chmap[5] = "five" # overwrite a key that may be in either table
+        del self.chmap[4]
+        with self.assertRaises(KeyError):
+            del self.chmap[4]
+        self.assertEqual(self.chmap[5], "five")
+        self.assertEqual(len(self.chmap), 5)
+
+    def test_iter_during_migration(self):
+        for i in range(6):
+            self.chmap[i] = i
+        assert self.chmap._old is not None
+        self.assertEqual(sorted(self.chmap), list(range(6)))
+
+    def test_many_items(self):
+        for i in range(1000):
+            self.chmap[i] = i
+        for i in range(0, 1000, 2):
+            del self.chmap[i]
+        self.assertEqual(len(self.chmap), 500)
+        self.assertEqual(sorted(self.chmap.keys()), list(range(1, 1000, 2)))
+        for i in range(1, 1000, 2):
+            self.assertEqual(self.chmap[i], i)
+
+class TestCachedHashCodes(unittest.TestCase):
+    """Tests that items cache their keys' full hash codes."""
+
+    def setUp(self):
+        self.chmap = ChainHashMap()
+
+    def test_resize_does_not_rehash(self):
+        CountingKey.hash_calls = 0
+        for i in range(50): # several resizes along the way
+            self.chmap[CountingKey(i, i)] = i
+        self.assertEqual(CountingKey.hash_calls, 50) # once per insertion
+
+    def test_hash_mismatch_skips_eq(self):
+        """Keys whose hash codes differ by a multiple of the MAD prime share a
+        bucket, but only the key actually searched for should be compared."""
+        p = self.chmap._compression._prime
+        for i in range(4):
+            self.chmap[CountingKey(i, i * p)] = i
+        CountingKey.eq_calls = 0
+        for i in range(4):
+            self.assertEqual(self.chmap[CountingKey(i, i * p)], i)
+        self.assertEqual(CountingKey.eq_calls, 4)
+
+class TestBulkLoad(unittest.TestCase):
+    """Tests for from_items and update_many."""
+
+    class CountingMap(ChainHashMap):
+        """Map that counts how many times its table gets rebuilt."""
+        def _rehash(self, c):
+            type(self).rehashes += 1
+            super()._rehash(c)
+
+    def test_from_items_sizes_table_once(self):
+        self.CountingMap.rehashes = 0
+        pairs = [(i, str(i)) for i in range(1000)]
+        chmap = self.CountingMap.from_items(pairs)
+        self.assertEqual(self.CountingMap.rehashes, 1)
+        self.assertEqual(len(chmap._table), 2001)
+        self.assertEqual(len(chmap), 1000)
+        for i in range(1000):
+            self.assertEqual(chmap[i], str(i))
+
+    def test_from_mapping(self):
+        chmap = ChainHashMap.from_items({"a": 1, "b": 2})
+        self.assertEqual(sorted(chmap.items()), [("a", 1), ("b", 2)])
+
+    def test_iterator_with_size_hint(self):
+        chmap = ChainHashMap.from_items(((i, i) for i in range(500)), size_hint=500)
+        self.assertEqual(len(chmap._table), 1001)
+        self.assertEqual(len(chmap), 500)
+
+    def test_iterator_longer_than_hint_still_grows(self):
+        chmap = ChainHashMap.from_items(((i, i) for i in range(500)), size_hint=10)
+        self.assertEqual(len(chmap), 500)
+        self.assertLessEqual(len(chmap), len(chmap._table) // 2)
+        for i in range(500):
+            self.assertEqual(chmap[i], i)
+
+    def test_update_many_overwrites(self):
+        chmap = ChainHashMap()
+        for i in range(10):
+            chmap[i] = 0
+        chmap.update_many([(i, 1) for i in range(5, 20)])
+        self.assertEqual(len(chmap), 20)
+        self.assertEqual(chmap[4], 0)
+        self.assertEqual(chmap[5], 1)
+
+    def test_update_many_during_migration(self):
+        chmap = ChainHashMap(incremental=True)
+        for i in range(6):
+            chmap[i] = i
+        assert chmap._old is not None
+        chmap.update_many([(i, i) for i in range(6, 100)])
+        self.assertIsNone(chmap._old)
+        self.assertEqual(sorted(chmap), list(range(100)))
+
+class TestBatchAccess(unittest.TestCase):
+    """Tests for get_many, contains_many and set_many."""
+
+    def setUp(self):
+        self.chmap = ChainHashMap()
+        for i in range(50):
+            self.chmap[str(i)] = i
+
+    def test_compress_many_matches_compress(self):
+        hashes = [hash(str(i)) for i in range(100)] + [-2 ** 63, 2 ** 63 - 1]
+        self.assertEqual(self.chmap._compress_many(hashes),
+                         [self.chmap._compress(h) for h in hashes])
+
+    def test_large_prime_avoids_int64_overflow(self):
+        chmap = ChainHashMap(p=2 ** 61 - 1)
+        for i in range(1000):
+            chmap[i] = i
+        self.assertEqual(chmap.get_many(range(1000)), list(range(1000)))
+        self.assertTrue(all(chmap.contains_many(range(1000))))
+        hashes = list(range(1000)) + [-2 ** 63, 2 ** 63 - 1]
+        self.assertEqual(chmap._compress_many(hashes),
+                         [chmap._compress(h) for h in hashes])
+
+    def test_get_many(self):
+        keys = ["3", "missing", "49"]
+        self.assertEqual(self.chmap.get_many(keys), [3, None, 49])
+        self.assertEqual(self.chmap.get_many(keys, default=-1), [3, -1, 49])
+
+    def test_contains_many(self):
+        self.chmap["none"] = None # a stored None still counts as present
+        self.assertEqual(self.chmap.contains_many(["0", "none", "missing"]),
+                         [True, True, False])
+
+    def test_set_many(self):
+        self.chmap.set_many([str(i) for i in range(40, 140)], range(100))
+        self.assertEqual(len(self.chmap), 140)
+        self.assertEqual(self.chmap["39"], 39)
+        self.assertEqual(self.chmap["40"], 0)
+        self.assertEqual(self.chmap["139"], 99)
+        with self.assertRaises(ValueError):
+            self.chmap.set_many(["a", "b"], [1])
+
+    def test_batches_during_migration(self):
+        chmap = ChainHashMap(incremental=True)
+        for i in range(6):
+            chmap[i] = i
+        assert chmap._old is not None
+        chmap.set_many([5, 6], ["five", "six"])
+        self.assertEqual(chmap.get_many([0, 5, 6, 7]), [0, "five", "six", None])
+
 if __name__ == '__main__':
     unittest.main()
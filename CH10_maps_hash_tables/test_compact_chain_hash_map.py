@@ -0,0 +1,68 @@
+import unittest
+
+from compact_chain_hash_map import CompactChainHashMap
+from map_base_abc import MapBase
+
+class TestCompactChainHashMap(unittest.TestCase):
+    """Basic-coverage tests."""
+
+    def setUp(self):
+        self.ccmap = CompactChainHashMap()
+        self.p = self.ccmap._compression._prime # hash codes i * p share a slot
+
+    def test_singleton_stored_inline(self):
+        self.ccmap["key"] = "value"
+        slot = self.ccmap._table[self.ccmap._hash_function("key")]
+        self.assertIsInstance(slot, MapBase._HashItem)
+        self.assertEqual(slot._value, "value")
+
+    def test_collision_promotes_to_chain(self):
+        self.ccmap[0] = "a"
+        self.ccmap[self.p] = "b"
+        slot = self.ccmap._table[self.ccmap._hash_function(0)]
+        self.assertIsInstance(slot, CompactChainHashMap._Chain)
+        self.assertEqual(slot._keys, [0, self.p])
+        self.assertEqual(slot._values, ["a", "b"])
+        self.assertEqual(self.ccmap[self.p], "b")
+
+    def test_delete_demotes_to_singleton(self):
+        self.ccmap[0] = "a"
+        self.ccmap[self.p] = "b"
+        del self.ccmap[0]
+        slot = self.ccmap._table[self.ccmap._hash_function(self.p)]
+        self.assertIsInstance(slot, MapBase._HashItem)
+        self.assertEqual(self.ccmap[self.p], "b")
+        del self.ccmap[self.p]
+        self.assertIsNone(self.ccmap._table[self.ccmap._hash_function(0)])
+        self.assertEqual(len(self.ccmap), 0)
+
+    def test_bucket_setitem_reports_insert(self):
+        j = self.ccmap._hash_function(0)
+        self.assertTrue(self.ccmap._bucket_setitem(j, 0, "a"))
+        self.assertFalse(self.ccmap._bucket_setitem(j, 0, "b"))
+        self.assertTrue(self.ccmap._bucket_setitem(j, self.p, "c"))
+        self.assertFalse(self.ccmap._bucket_setitem(j, self.p, "d"))
+        self.assertEqual(len(self.ccmap), 2)
+
+    def test_missing_keys(self):
+        self.ccmap[0] = "a"
+        self.ccmap[self.p] = "b"
+        with self.assertRaises(KeyError):
+            self.ccmap[2 * self.p]
+        with self.assertRaises(KeyError):
+            del self.ccmap[2 * self.p]
+        with self.assertRaises(KeyError):
+            self.ccmap["missing"]
+
+    def test_many_items(self):
+        for i in range(1000):
+            self.ccmap[i] = i
+        for i in range(0, 1000, 2):
+            del self.ccmap[i]
+        self.assertEqual(len(self.ccmap), 500)
+        self.assertEqual(sorted(self.ccmap), list(range(1, 1000, 2)))
+        for i in range(1, 1000, 2):
+            self.assertEqual(self.ccmap[i], i)
+
+if __name__ == '__main__':
+    unittest.main()
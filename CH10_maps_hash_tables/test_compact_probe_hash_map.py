@@ -0,0 +1,119 @@
+import unittest
+
+from compact_probe_hash_map import CompactProbeHashMap
+
+class CountingKey:
+    """Key whose equality checks are counted, with a chosen hash code."""
+    eq_calls = 0
+
+    def __init__(self, name, h):
+        self.name = name
+        self.h = h
+
+    def __hash__(self):
+        return self.h
+
+    def __eq__(self, other):
+        CountingKey.eq_calls += 1
+        return self.name == other.name
+
+class TestCompactProbeHashMap(unittest.TestCase):
+    """Basic-coverage tests."""
+
+    def setUp(self):
+        self.cpmap = CompactProbeHashMap()
+
+    def test_init(self):
+        self.assertIsInstance(self.cpmap, CompactProbeHashMap)
+        self.assertEqual(len(self.cpmap), 0)
+
+    def test_index_slot_points_into_entry_lists(self):
+        key = "test key"
+        j = self.cpmap._hash_function(key)
+        self.cpmap[key] = 7
+        e = self.cpmap._table[j]
+        self.assertEqual(self.cpmap._keys[e], key)
+        self.assertEqual(self.cpmap._values[e], 7)
+        self.assertEqual(self.cpmap._hashes[e], hash(key))
+
+    def test_setitem_getitem(self):
+        self.cpmap["key"] = "value"
+        self.assertEqual(self.cpmap["key"], "value")
+        self.cpmap["key"] = "updated"
+        self.assertEqual(self.cpmap["key"], "updated")
+        self.assertEqual(len(self.cpmap), 1)
+
+    def test_getitem_raises_key_error(self):
+        with self.assertRaises(KeyError):
+            self.cpmap["missing"]
+
+    def test_delitem(self):
+        self.cpmap["delete me"] = 1
+        del self.cpmap["delete me"]
+        self.assertEqual(len(self.cpmap), 0)
+        with self.assertRaises(KeyError):
+            self.cpmap["delete me"]
+        with self.assertRaises(KeyError):
+            del self.cpmap["delete me"]
+
+    def test_iter_is_insertion_ordered(self):
+        keys = ["c", "a", "d", "b"]
+        for key in keys:
+            self.cpmap[key] = key
+        del self.cpmap["a"]
+        self.assertEqual(list(self.cpmap), ["c", "d", "b"])
+
+    def test_resize_drops_deleted_entries(self):
+        for i in range(100):
+            self.cpmap[i] = i
+        for i in range(0, 100, 2):
+            del self.cpmap[i]
+        for i in range(100, 300):
+            self.cpmap[i] = i
+        self.assertEqual(len(self.cpmap), 250)
+        for i in range(1, 100, 2):
+            self.assertEqual(self.cpmap[i], i)
+        for i in range(100, 300):
+            self.assertEqual(self.cpmap[i], i)
+        self.assertLess(len(self.cpmap._keys), 300) # compacted at least once
+
+    def test_churn_keeps_entry_lists_bounded(self):
+        """Deleting and reinserting reuses _DUMMY slots; the dead entries
+        those leave behind must still get compacted away."""
+        for i in range(1000):
+            self.cpmap[i] = i
+        for step in range(20000):
+            k = step % 1000
+            del self.cpmap[k]
+            self.cpmap[k] = step
+        self.assertEqual(len(self.cpmap), 1000)
+        self.assertLessEqual(len(self.cpmap._keys),
+                             self.cpmap._load_limit(len(self.cpmap._table)))
+        self.assertEqual(self.cpmap[999], 19999)
+        cpmap = CompactProbeHashMap()
+        for step in range(10000): # one key, set and deleted over and over
+            cpmap["k"] = step
+            del cpmap["k"]
+        self.assertLessEqual(len(cpmap._keys), len(cpmap._table))
+
+    def test_hash_mismatch_skips_eq(self):
+        """Keys in the same probe run but with different full hash codes
+        shouldn't be compared with __eq__; only the actual match should be."""
+        for i in range(5):
+            self.cpmap[CountingKey(i, i)] = i
+        CountingKey.eq_calls = 0
+        for i in range(5):
+            self.assertEqual(self.cpmap[CountingKey(i, i)], i) # equal, not same
+        self.assertEqual(CountingKey.eq_calls, 5)
+
+    def test_incremental(self):
+        cpmap = CompactProbeHashMap(incremental=True)
+        for i in range(500):
+            cpmap[i] = i
+        for i in range(0, 500, 5):
+            del cpmap[i]
+        self.assertEqual(len(cpmap), 400)
+        self.assertEqual(sorted(cpmap), [i for i in range(500) if i % 5])
+
+if __name__ == '__main__':
+    unittest.main()
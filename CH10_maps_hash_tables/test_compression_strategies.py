@@ -0,0 +1,131 @@
+import unittest
+from unittest import mock
+
+import compression_strategies
+from chain_hash_map import ChainHashMap
+from compact_probe_hash_map import CompactProbeHashMap
+from compression_strategies import (FibonacciCompression, MADCompression,
+                                    TabulationCompression)
+from concurrent_hash_map import ConcurrentHashMap
+from double_hash_probe_hash_map import DoubleHashProbeHashMap
+from probe_hash_map import ProbeHashMap
+from quadratic_probe_hash_map import QuadraticProbeHashMap
+
+HASHES = [0, 1, -1, 42, -42, 2**63 - 1, -2**63, 123456789123456789,
+          hash("a string"), hash("another string"), 2**70 + 5, -2**70]
+
+def is_power_of_two(n):
+    return n > 0 and n & (n - 1) == 0
+
+class TestStrategies(unittest.TestCase):
+    """Basic-coverage tests."""
+
+    def setUp(self):
+        # Fixed MAD parameters: some random scales spread consecutive hash
+        #   codes over only a few slots of a small table.
+        self.strategies = [MADCompression(scale=12345677, shift=3),
+                           FibonacciCompression(), TabulationCompression(seed=1)]
+
+    def test_mad_accepts_any_capacity(self):
+        mad = MADCompression()
+        for c in (1, 11, 21, 100):
+            self.assertEqual(mad.capacity(c), c)
+
+    def test_power_of_two_capacities(self):
+        for strategy in self.strategies[1:]:
+            self.assertEqual(strategy.capacity(1), 1)
+            self.assertEqual(strategy.capacity(11), 16)
+            self.assertEqual(strategy.capacity(16), 16)
+            self.assertEqual(strategy.capacity(17), 32)
+
+    def test_compress_in_range(self):
+        for strategy in self.strategies:
+            for n in (1, 2, 16, 1024):
+                n = strategy.capacity(n)
+                for h in HASHES:
+                    self.assertTrue(0 <= strategy.compress(h, n) < n)
+
+    def test_fibonacci_keeps_top_bits(self):
+        fib = FibonacciCompression()
+        for h in HASHES[:10]:
+            product = (h * FibonacciCompression._GOLDEN) % 2**64
+            self.assertEqual(fib.compress(h, 1024), product >> 54)
+
+    def test_tabulation_is_seeded(self):
+        a, b = TabulationCompression(seed=7), TabulationCompression(seed=7)
+        self.assertEqual([a.compress(h, 64) for h in HASHES],
+                         [b.compress(h, 64) for h in HASHES])
+
+    def test_spread(self):
+        """Consecutive hash codes should fill most of a small table."""
+        for strategy in self.strategies:
+            n = strategy.capacity(64)
+            used = {strategy.compress(h, n) for h in range(1000, 1064)}
+            self.assertGreater(len(used), n // 2)
+
+    def test_compress_many_matches_compress(self):
+        for strategy in self.strategies:
+            for n in (1, 16, 64):
+                n = strategy.capacity(n)
+                self.assertEqual(strategy.compress_many(HASHES, n),
+                                 [strategy.compress(h, n) for h in HASHES])
+                self.assertEqual(strategy.compress_many(HASHES[:10], n),
+                                 [strategy.compress(h, n) for h in HASHES[:10]])
+
+    def test_compress_many_without_numpy(self):
+        for strategy in self.strategies:
+            expected = strategy.compress_many(HASHES[:10], 64)
+            with mock.patch.object(compression_strategies, "np", None):
+                self.assertEqual(strategy.compress_many(HASHES[:10], 64),
+                                 expected)
+
+class TestMapsWithStrategies(unittest.TestCase):
+    """Maps built on each strategy."""
+
+    def test_tables_stay_valid_through_resizes(self):
+        for cls in (ChainHashMap, ProbeHashMap, CompactProbeHashMap):
+            for strategy in (FibonacciCompression(), TabulationCompression()):
+                for incremental in (False, True):
+                    hmap = cls(compression=strategy, incremental=incremental)
+                    self.assertEqual(len(hmap._table), 16)
+                    for i in range(1000):
+                        hmap[i] = i
+                        self.assertTrue(is_power_of_two(len(hmap._table)))
+                    for i in range(990):
+                        del hmap[i]
+                        self.assertTrue(is_power_of_two(len(hmap._table)))
+                    self.assertEqual(sorted(hmap), list(range(990, 1000)))
+
+    def test_bulk_methods_round_capacity(self):
+        hmap = ChainHashMap(compression=FibonacciCompression())
+        hmap.update_many((i, i) for i in range(300))
+        self.assertTrue(is_power_of_two(len(hmap._table)))
+        hmap.set_many(range(300, 700), range(400))
+        self.assertTrue(is_power_of_two(len(hmap._table)))
+        self.assertEqual(hmap.get_many([5, 350, 1000]), [5, 50, None])
+
+    def test_default_mad_growth(self):
+        chmap = ChainHashMap()
+        self.assertIsInstance(chmap._compression, MADCompression)
+        for i in range(6):
+            chmap[i] = i
+        self.assertEqual(len(chmap._table), 21) # 2 * 11 - 1; MAD takes any size
+
+    def test_prime_table_maps_reject_power_of_two_strategies(self):
+        for cls in (QuadraticProbeHashMap, DoubleHashProbeHashMap):
+            cls(compression=MADCompression())
+            with self.assertRaises(ValueError):
+                cls(compression=FibonacciCompression())
+
+    def test_concurrent_map_passes_strategy_to_segments(self):
+        strategy = TabulationCompression()
+        cmap = ConcurrentHashMap(segments=4, compression=strategy)
+        for i in range(500):
+            cmap[i] = i
+        for seg in cmap._segments:
+            self.assertIs(seg._compression, strategy)
+            self.assertTrue(is_power_of_two(len(seg._table)))
+        self.assertEqual([cmap[i] for i in range(500)], list(range(500)))
+
+if __name__ == '__main__':
+    unittest.main()
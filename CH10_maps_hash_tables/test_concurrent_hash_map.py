@@ -0,0 +1,77 @@
+import threading
+import unittest
+
+from concurrent_hash_map import ConcurrentHashMap
+
+class TestConcurrentHashMap(unittest.TestCase):
+    """Basic-coverage tests."""
+
+    def setUp(self):
+        self.cmap = ConcurrentHashMap(segments=4)
+
+    def test_setitem_getitem(self):
+        self.cmap["key"] = "value"
+        self.assertEqual(self.cmap["key"], "value")
+        self.cmap["key"] = "updated"
+        self.assertEqual(self.cmap["key"], "updated")
+        self.assertEqual(len(self.cmap), 1)
+
+    def test_missing_keys(self):
+        with self.assertRaises(KeyError):
+            self.cmap["missing"]
+        with self.assertRaises(KeyError):
+            del self.cmap["missing"]
+        self.assertIsNone(self.cmap.get("missing"))
+        self.assertNotIn("missing", self.cmap)
+
+    def test_stored_none_is_present(self):
+        self.cmap["none"] = None
+        self.assertIn("none", self.cmap)
+        self.assertIsNone(self.cmap["none"])
+
+    def test_delete_leaves_version_even(self):
+        self.cmap[1] = 1
+        with self.assertRaises(KeyError):
+            del self.cmap[2] # failed write still ends the write section
+        for seg in self.cmap._segments:
+            self.assertEqual(seg._version % 2, 0)
+
+    def test_segments_resize_independently(self):
+        for i in range(400):
+            self.cmap[i * 4] = i # every key lands in segment 0
+        sizes = [len(seg._table) for seg in self.cmap._segments]
+        self.assertGreater(sizes[0], 11)
+        self.assertEqual(sizes[1:], [11, 11, 11])
+
+    def test_iter(self):
+        for i in range(100):
+            self.cmap[i] = i
+        self.assertEqual(sorted(self.cmap), list(range(100)))
+
+    def test_threads(self):
+        """Threads writing their own keys while reading everyone's shouldn't
+        lose updates or see values that were never written."""
+        errors = []
+
+        def work(t):
+            for i in range(2000):
+                self.cmap[(t, i)] = i
+                value = self.cmap.get(((t + 1) % 4, i))
+                if value is not None and value != i:
+                    errors.append(value)
+            for i in range(0, 2000, 2):
+                del self.cmap[(t, i)]
+
+        threads = [threading.Thread(target=work, args=(t,)) for t in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+        self.assertEqual(len(self.cmap), 4 * 1000)
+        for t in range(4):
+            for i in range(1, 2000, 2):
+                self.assertEqual(self.cmap[(t, i)], i)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+import random
+import unittest
+from collections import Counter
+from unittest import mock
+
+import count_min_sketch
+from count_min_sketch import CountMinSketch
+
+def zipf_words(n, seed=3):
+    """Return n words whose frequencies fall off roughly as 1 / rank."""
+    rng = random.Random(seed)
+    vocabulary = [f"word{i}" for i in range(2000)]
+    weights = [1 / (i + 1) for i in range(2000)]
+    return rng.choices(vocabulary, weights, k=n)
+
+class TestCountMinSketch(unittest.TestCase):
+    """Basic-coverage tests."""
+
+    def setUp(self):
+        self.words = zipf_words(20000)
+        self.exact = Counter(self.words)
+
+    def test_add_and_estimate(self):
+        cms = CountMinSketch(256, 4)
+        cms.add("x")
+        cms.add("x", 4)
+        self.assertEqual(cms.estimate("x"), 5)
+        self.assertEqual(cms["x"], 5)
+        self.assertEqual(cms.estimate("never added"), 0)
+        self.assertEqual(len(cms), 5)
+
+    def test_never_underestimates(self):
+        cms = CountMinSketch(128, 4)
+        cms.add_many(self.words)
+        for (w, c) in self.exact.items():
+            self.assertGreaterEqual(cms.estimate(w), c)
+
+    def test_error_bound(self):
+        epsilon = 0.005
+        cms = CountMinSketch.from_error(epsilon, 0.01)
+        self.assertEqual((cms._width, cms._depth), (544, 5))
+        cms.add_many(self.words)
+        over = [cms.estimate(w) - c for (w, c) in self.exact.items()]
+        bad = sum(1 for e in over if e > epsilon * len(self.words))
+        self.assertLess(bad, 0.02 * len(over))
+
+    def test_add_many_matches_add(self):
+        one, many = CountMinSketch(64, 3), CountMinSketch(64, 3)
+        for w in self.words[:500]:
+            one.add(w)
+        many.add_many(self.words[:500])
+        many.add_many([])
+        self.assertEqual(one._counts, many._counts)
+        self.assertEqual(len(one), len(many))
+        with mock.patch.object(count_min_sketch, "np", None):
+            plain = CountMinSketch(64, 3)
+            plain.add_many(self.words[:500])
+        self.assertEqual(plain._counts, one._counts)
+
+    def test_merge_equals_single_sketch(self):
+        whole = CountMinSketch(128, 4)
+        whole.add_many(self.words)
+        parts = [CountMinSketch(128, 4) for _ in range(3)]
+        for i, part in enumerate(parts):
+            part.add_many(self.words[i::3])
+        parts[0].merge(parts[1])
+        with mock.patch.object(count_min_sketch, "np", None):
+            parts[0].merge(parts[2])
+        self.assertEqual(parts[0]._counts, whole._counts)
+        self.assertEqual(len(parts[0]), len(whole))
+
+    def test_merge_rejects_mismatched_sketches(self):
+        cms = CountMinSketch(128, 4)
+        for other in (CountMinSketch(64, 4), CountMinSketch(128, 3),
+                      CountMinSketch(128, 4, seed=1)):
+            with self.assertRaises(ValueError):
+                cms.merge(other)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,121 @@
+import unittest
+
+from compression_strategies import FibonacciCompression, MADCompression
+from cuckoo_hash_map import CuckooHashMap
+
+def fixed_mad():
+    """Return a MAD function with fixed parameters, so that which keys
+    collide doesn't change from run to run."""
+    return MADCompression(scale=12345677, shift=3)
+
+class TestCuckooHashMap(unittest.TestCase):
+    """Basic-coverage tests."""
+
+    def setUp(self):
+        self.chmap = CuckooHashMap(compression=fixed_mad(), seed=0)
+
+    def check_placement(self, chmap):
+        """Assert every item is in one of its two buckets or the stash."""
+        for j, bucket in enumerate(chmap._table):
+            if bucket is not None:
+                self.assertLessEqual(len(bucket), CuckooHashMap._SLOTS)
+                for item in bucket:
+                    self.assertIn(j, chmap._buckets(item._hash))
+        self.assertLessEqual(len(chmap._stash), CuckooHashMap._STASH_SIZE)
+
+    def test_setitem_getitem(self):
+        self.chmap["key"] = 1
+        self.chmap["key"] = 2
+        self.assertEqual(self.chmap["key"], 2)
+        self.assertEqual(len(self.chmap), 1)
+        with self.assertRaises(KeyError):
+            self.chmap["missing"]
+
+    def test_two_buckets_differ(self):
+        differ = sum(j != alt for (j, alt) in
+                     (self.chmap._buckets(hash(i)) for i in range(100)))
+        self.assertGreater(differ, 80)
+
+    def test_high_load_before_growing(self):
+        cap = len(self.chmap._table)
+        for i in range(int(cap * CuckooHashMap._MAX_LOAD)):
+            self.chmap[i] = i
+        self.assertEqual(len(self.chmap._table), cap) # ~90% of slots in use
+        self.check_placement(self.chmap)
+        for i in range(len(self.chmap)):
+            self.assertEqual(self.chmap[i], i)
+
+    def test_colliding_keys_go_to_stash(self):
+        chmap = CuckooHashMap(hash_code=lambda k: 12345,
+                              compression=fixed_mad(), seed=0)
+        j, alt = chmap._buckets(12345)
+        self.assertNotEqual(j, alt) # precondition: two distinct buckets
+        keys = range(2 * CuckooHashMap._SLOTS + 1)
+        for k in keys: # same hash code, so the same two buckets
+            chmap[k] = k
+        self.assertEqual(len(chmap._stash), 1)
+        for k in keys:
+            self.assertEqual(chmap[k], k)
+        del chmap[0]
+        self.assertEqual(len(chmap), len(keys) - 1)
+        self.assertEqual(sorted(chmap), list(range(1, len(keys))))
+
+    def test_overfull_stash_grows_table(self):
+        chmap = CuckooHashMap(hash_code=lambda k: k, compression=fixed_mad(),
+                              seed=0)
+        cap = len(chmap._table)
+        room = 2 * CuckooHashMap._SLOTS + CuckooHashMap._STASH_SIZE
+        keys = [h for h in range(10000)
+                if set(chmap._buckets(h)) <= {0, 1}][:room + 1]
+        self.assertEqual(len(keys), room + 1) # precondition: one key too many
+            # for buckets 0 and 1 plus the stash, far below the load limit
+        for k in keys:
+            chmap[k] = k
+        self.assertGreater(len(chmap._table), cap)
+        self.check_placement(chmap)
+        self.assertEqual(sorted(chmap), keys)
+
+    def test_equal_hash_codes_lengthen_stash(self):
+        chmap = CuckooHashMap(hash_code=lambda k: 0, compression=fixed_mad(),
+                              seed=0)
+        for i in range(50):
+            chmap[i] = i
+        self.assertLess(len(chmap._table), 100) # didn't grow without bound
+        self.assertEqual([chmap[i] for i in range(50)], list(range(50)))
+
+    def test_many_items(self):
+        for i in range(5000):
+            self.chmap[str(i)] = i
+        self.check_placement(self.chmap)
+        for i in range(0, 5000, 3):
+            del self.chmap[str(i)]
+        self.assertEqual(len(self.chmap), 3333)
+        self.assertEqual(sorted(self.chmap.values()),
+                         [i for i in range(5000) if i % 3])
+        with self.assertRaises(KeyError):
+            del self.chmap["0"]
+
+    def test_incremental(self):
+        chmap = CuckooHashMap(incremental=True, compression=fixed_mad(),
+                              seed=0)
+        for i in range(3000):
+            chmap[str(i)] = i
+        for i in range(0, 3000, 2):
+            del chmap[str(i)]
+        self.assertEqual(sorted(chmap.values()), list(range(1, 3000, 2)))
+
+    def test_power_of_two_compression(self):
+        chmap = CuckooHashMap(compression=FibonacciCompression(), seed=0)
+        for i in range(2000):
+            chmap[i] = i
+        self.check_placement(chmap)
+        self.assertEqual([chmap[i] for i in range(2000)], list(range(2000)))
+
+    def test_batch_methods(self):
+        self.chmap.update_many((i, i) for i in range(500))
+        self.chmap.set_many(range(500, 1000), range(500))
+        self.check_placement(self.chmap)
+        self.assertEqual(self.chmap.get_many([3, 700, 1000]), [3, 200, None])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,43 @@
+import unittest
+
+from double_hash_probe_hash_map import DoubleHashProbeHashMap
+
+class TestDoubleHashProbeHashMap(unittest.TestCase):
+    """Basic-coverage tests."""
+
+    def setUp(self):
+        self.dmap = DoubleHashProbeHashMap()
+
+    def test_capacity_is_prime(self):
+        self.assertEqual(len(DoubleHashProbeHashMap(cap=20)._table), 23)
+
+    def test_probe_sequence_visits_every_slot(self):
+        n = len(self.dmap._table)
+        for h in (0, 7, 12345):
+            j = 0
+            seen = {j}
+            for i in range(1, n):
+                j = self.dmap._next_slot(j, i, h)
+                seen.add(j)
+            self.assertEqual(len(seen), n)
+
+    def test_setitem_getitem_delitem(self):
+        for i in range(200):
+            self.dmap[str(i)] = i
+        for i in range(0, 200, 2):
+            del self.dmap[str(i)]
+        self.assertEqual(len(self.dmap), 100)
+        for i in range(1, 200, 2):
+            self.assertEqual(self.dmap[str(i)], i)
+        with self.assertRaises(KeyError):
+            del self.dmap["0"]
+
+    def test_probe_stats(self):
+        for i in range(100):
+            self.dmap[str(i)] = i
+        stats = self.dmap.probe_stats()
+        self.assertEqual(stats['count'], 100)
+        self.assertGreaterEqual(stats['max'], 1)
+
+if __name__ == '__main__':
+    unittest.main()
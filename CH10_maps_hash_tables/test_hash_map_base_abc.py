@@ -0,0 +1,63 @@
+import unittest
+
+from chain_hash_map import ChainHashMap
+from compact_chain_hash_map import CompactChainHashMap
+from compact_probe_hash_map import CompactProbeHashMap
+from compression_strategies import MADCompression
+from cuckoo_hash_map import CuckooHashMap
+from double_hash_probe_hash_map import DoubleHashProbeHashMap
+from probe_hash_map import ProbeHashMap
+from quadratic_probe_hash_map import QuadraticProbeHashMap
+from robin_hood_hash_map import RobinHoodHashMap
+
+MAPS = (ProbeHashMap, ChainHashMap, CompactProbeHashMap, CompactChainHashMap,
+        QuadraticProbeHashMap, DoubleHashProbeHashMap, RobinHoodHashMap,
+        CuckooHashMap)
+
+class TestIterationDuringMigration(unittest.TestCase):
+    """Reading the map while iterating over it mid-migration, where every
+    lookup moves buckets between the tables."""
+
+    def migrating(self, cls, n=200):
+        """Return a map of class cls holding keys 0..n-1 (at least), with an
+        incremental migration in progress."""
+        hmap = cls(incremental=True,
+                   compression=MADCompression(scale=12345677, shift=3))
+        i = 0
+        while i < n or hmap._old is None:
+            hmap[i] = i
+            i += 1
+        return hmap
+
+    def test_lookups_while_iterating_keys(self):
+        for cls in MAPS:
+            with self.subTest(cls=cls.__name__):
+                hmap = self.migrating(cls)
+                seen = []
+                for k in hmap:
+                    self.assertEqual(hmap[k], k) # moves buckets over
+                    seen.append(k)
+                self.assertEqual(sorted(seen), list(range(len(hmap))))
+
+    def test_lookups_while_iterating_items(self):
+        for cls in MAPS:
+            with self.subTest(cls=cls.__name__):
+                hmap = self.migrating(cls)
+                seen = []
+                for (k, v) in hmap.items():
+                    self.assertEqual(hmap[k], v)
+                    seen.append(k)
+                self.assertEqual(sorted(seen), list(range(len(hmap))))
+
+    def test_lookups_while_iterating_values(self):
+        for cls in MAPS:
+            with self.subTest(cls=cls.__name__):
+                hmap = self.migrating(cls)
+                seen = []
+                for v in hmap.values():
+                    self.assertEqual(hmap[v], v)
+                    seen.append(v)
+                self.assertEqual(sorted(seen), list(range(len(hmap))))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+import unittest
+from unittest import mock
+
+import hyperloglog
+from hyperloglog import HyperLogLog
+
+class TestHyperLogLog(unittest.TestCase):
+    """Basic-coverage tests."""
+
+    def setUp(self):
+        self.items = [f"item-{i}" for i in range(30000)]
+
+    def test_empty_and_small(self):
+        hll = HyperLogLog(10)
+        self.assertEqual(len(hll), 0)
+        for item in ["a", "b", "c", "a", "b"]:
+            hll.add(item)
+        self.assertEqual(len(hll), 3) # linear counting is near exact here
+        self.assertEqual(hll.nbytes(), 1024)
+
+    def test_accuracy(self):
+        for p in (10, 14):
+            hll = HyperLogLog(p)
+            hll.add_many(self.items * 2) # duplicates don't count
+            error = abs(hll.estimate() - len(self.items)) / len(self.items)
+            self.assertLess(error, 4 * 1.04 / (1 << p) ** 0.5)
+
+    def test_add_many_matches_add(self):
+        for p in (4, 9, 16):
+            one, many = HyperLogLog(p), HyperLogLog(p)
+            for item in self.items[:3000]:
+                one.add(item)
+            many.add_many(self.items[:3000])
+            many.add_many([])
+            self.assertEqual(one._registers, many._registers)
+            with mock.patch.object(hyperloglog, "np", None):
+                plain = HyperLogLog(p)
+                plain.add_many(self.items[:3000])
+            self.assertEqual(plain._registers, one._registers)
+
+    def test_merge_equals_single_sketch(self):
+        whole = HyperLogLog(12)
+        whole.add_many(self.items)
+        parts = [HyperLogLog(12) for _ in range(3)]
+        for i, part in enumerate(parts):
+            part.add_many(self.items[i::3])
+        parts[0].merge(parts[1])
+        with mock.patch.object(hyperloglog, "np", None):
+            parts[0].merge(parts[2])
+        self.assertEqual(parts[0]._registers, whole._registers)
+
+    def test_rejects_bad_parameters(self):
+        with self.assertRaises(ValueError):
+            HyperLogLog(3)
+        with self.assertRaises(ValueError):
+            HyperLogLog(10).merge(HyperLogLog(11))
+        with self.assertRaises(ValueError):
+            HyperLogLog(10).merge(HyperLogLog(10, seed=5))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+import unittest
+from collections import Counter
+
+from misra_gries import MisraGries
+from test_count_min_sketch import zipf_words
+
+class TestMisraGries(unittest.TestCase):
+    """Basic-coverage tests."""
+
+    def setUp(self):
+        self.words = zipf_words(20000)
+        self.exact = Counter(self.words)
+
+    def test_exact_while_counters_suffice(self):
+        mg = MisraGries(10)
+        mg.add_many("abracadabra")
+        self.assertEqual(mg.estimate("a"), 5)
+        self.assertEqual(mg["r"], 2)
+        self.assertEqual(mg.top(1), [("a", 5)])
+        self.assertEqual(sorted(mg.top(3)[1:]), [("b", 2), ("r", 2)])
+        self.assertEqual(len(mg), 11)
+
+    def test_error_bound(self):
+        k = 50
+        mg = MisraGries(k)
+        mg.add_many(self.words)
+        self.assertLessEqual(len(mg._counts), 2 * k)
+        bound = len(self.words) / (k + 1)
+        for (w, c) in self.exact.items():
+            self.assertLessEqual(mg.estimate(w), c)
+            self.assertGreaterEqual(mg.estimate(w), c - bound)
+
+    def test_frequent_items_kept(self):
+        k = 20
+        mg = MisraGries(k)
+        mg.add_many(self.words)
+        for (w, c) in self.exact.items():
+            if c > len(self.words) / (k + 1):
+                self.assertIn(w, dict(mg.top()))
+
+    def test_weighted_add(self):
+        mg = MisraGries(2)
+        mg.add("a", 10)
+        mg.add("b", 3)
+        mg.add("c", 1)
+        mg.add("d", 1)
+        mg.add("e", 1)
+        self.assertEqual(len(mg), 16)
+        self.assertEqual(mg.top(1)[0][0], "a")
+        self.assertGreaterEqual(mg.estimate("a"), 10 - 16 / 3)
+
+    def test_merge(self):
+        k = 50
+        parts = [MisraGries(k) for _ in range(4)]
+        for i, part in enumerate(parts):
+            part.add_many(self.words[i::4])
+        for part in parts[1:]:
+            parts[0].merge(part)
+        merged = parts[0]
+        self.assertEqual(len(merged), len(self.words))
+        bound = len(self.words) / (k + 1)
+        for (w, c) in self.exact.items():
+            self.assertLessEqual(merged.estimate(w), c)
+            self.assertGreaterEqual(merged.estimate(w), c - bound)
+        with self.assertRaises(ValueError):
+            merged.merge(MisraGries(k + 1))
+
+if __name__ == '__main__':
+    unittest.main()
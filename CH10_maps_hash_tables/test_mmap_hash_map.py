@@ -0,0 +1,148 @@
+import os
+import tempfile
+import unittest
+
+from chain_hash_map import ChainHashMap
+from mmap_hash_map import MmapHashMap
+
+class TestMmapHashMap(unittest.TestCase):
+    """Basic-coverage tests, each against a fresh temporary file."""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'test.map')
+        self.mmap = MmapHashMap(self.path)
+
+    def tearDown(self):
+        self.mmap.close()
+        self.directory.cleanup()
+
+    def test_setitem_getitem(self):
+        self.mmap["key"] = "value"
+        self.assertEqual(self.mmap["key"], "value")
+        self.mmap["key"] = ["updated", 1]
+        self.assertEqual(self.mmap["key"], ["updated", 1])
+        self.assertEqual(len(self.mmap), 1)
+
+    def test_getitem_raises_key_error(self):
+        with self.assertRaises(KeyError):
+            self.mmap["missing"]
+
+    def test_delitem(self):
+        self.mmap[("tuple", "key")] = 1
+        del self.mmap[("tuple", "key")]
+        self.assertEqual(len(self.mmap), 0)
+        with self.assertRaises(KeyError):
+            del self.mmap[("tuple", "key")]
+
+    def test_equal_tuple_keys_match(self):
+        """Equal keys pickle differently when one repeats an object; they
+        must still be the same key."""
+        s = 'ab'
+        self.mmap[(s, s)] = 1
+        other = ('ab', ''.join(['a', 'b'])) # two distinct string objects
+        self.assertIn(other, self.mmap)
+        self.assertEqual(self.mmap[other], 1)
+        self.mmap[other] = 2
+        self.assertEqual(len(self.mmap), 1)
+        self.assertEqual(self.mmap[(s, s)], 2)
+
+    def test_equal_numbers_and_frozensets(self):
+        self.mmap[1] = 'one'
+        self.assertEqual(self.mmap[1.0], 'one')
+        self.assertEqual(self.mmap[True], 'one')
+        self.mmap[frozenset({'x', 'y', (1, 2.5)})] = 'set'
+        self.assertEqual(self.mmap[frozenset([(1, 2.5), 'y', 'x'])], 'set')
+        self.assertEqual(MmapHashMap._canonical(frozenset({'x', 'y'})),
+                         MmapHashMap._canonical(frozenset({'y', 'x'})))
+
+    def test_rejects_unsupported_keys(self):
+        with self.assertRaises(TypeError):
+            self.mmap[object()] = 1
+
+    def test_resize_and_iter(self):
+        for i in range(1000):
+            self.mmap[i] = str(i)
+        for i in range(0, 1000, 2):
+            del self.mmap[i]
+        self.assertEqual(len(self.mmap), 500)
+        self.assertEqual(sorted(self.mmap), list(range(1, 1000, 2)))
+        for i in range(1, 1000, 2):
+            self.assertEqual(self.mmap[i], str(i))
+
+    def test_reopen_after_close(self):
+        for i in range(100):
+            self.mmap[f"key {i}"] = i
+        self.mmap.close()
+        with MmapHashMap(self.path) as reopened:
+            self.assertEqual(len(reopened), 100)
+            self.assertEqual(reopened["key 42"], 42)
+            reopened["key 100"] = 100
+        self.mmap = MmapHashMap(self.path)
+        self.assertEqual(self.mmap["key 100"], 100)
+
+    def test_readonly(self):
+        self.mmap["key"] = "value"
+        self.mmap.flush()
+        with MmapHashMap(self.path, readonly=True) as shared:
+            self.assertEqual(shared["key"], "value")
+            self.assertEqual(list(shared), ["key"])
+            with self.assertRaises(TypeError):
+                shared["other"] = 1
+            with self.assertRaises(TypeError):
+                del shared["key"]
+
+    def test_from_existing_map(self):
+        source = ChainHashMap()
+        for i in range(200):
+            source[i] = i * i
+        self.mmap.close()
+        os.remove(self.path)
+        self.mmap = MmapHashMap.from_items(source, path=self.path)
+        self.mmap.flush()
+        with MmapHashMap(self.path, readonly=True) as shared:
+            self.assertEqual(len(shared), 200)
+            self.assertEqual(shared[15], 225)
+
+    def test_overwrites_reuse_records(self):
+        self.mmap["key"] = b"x" * 100
+        self.mmap.flush()
+        size = os.path.getsize(self.path)
+        for i in range(2000): # same size, or smaller, fits in place
+            self.mmap["key"] = bytes([i % 256]) * (100 - i % 3)
+        self.mmap.flush()
+        self.assertEqual(os.path.getsize(self.path), size)
+        self.assertEqual(self.mmap["key"], bytes([1999 % 256]) * 99)
+
+    def test_compact(self):
+        for i in range(100):
+            self.mmap[i] = i
+        for n in range(1, 50): # growing values must be appended
+            for i in range(0, 100, 2):
+                self.mmap[i] = "v" * n
+        for i in range(1, 100, 4):
+            del self.mmap[i]
+        self.mmap.flush()
+        size = os.path.getsize(self.path)
+        self.mmap.compact()
+        self.assertLess(os.path.getsize(self.path), size // 4)
+        self.assertFalse(os.path.exists(self.path + '.tmp'))
+        expected = {i: "v" * 49 if i % 2 == 0 else i
+                    for i in range(100) if i % 4 != 1}
+        self.assertEqual(dict(self.mmap.items()), expected)
+        self.mmap[1000] = "new" # still writable after the swap
+        self.mmap.close()
+        with MmapHashMap(self.path, readonly=True) as shared:
+            self.assertEqual(len(shared), len(expected) + 1)
+            self.assertEqual(shared[1000], "new")
+            self.assertEqual(shared[98], "v" * 49)
+
+    def test_rejects_other_files(self):
+        other = os.path.join(self.directory.name, 'other')
+        with open(other, 'wb') as f:
+            f.write(b'not a map' * 20)
+        with self.assertRaises(ValueError):
+            MmapHashMap(other)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,8 +1,26 @@
 import unittest
 
+from compression_strategies import MADCompression
 from probe_hash_map import ProbeHashMap
 from map_base_abc import MapBase
 
+class CountingKey:
+    """Key that counts calls to __hash__ and __eq__, with a chosen hash code."""
+    hash_calls = 0
+    eq_calls = 0
+
+    def __init__(self, name, h):
+        self.name = name
+        self.h = h
+
+    def __hash__(self):
+        CountingKey.hash_calls += 1
+        return self.h
+
+    def __eq__(self, other):
+        CountingKey.eq_calls += 1
+        return self.name == other.name
+
 class TestSimpleMap(unittest.TestCase):
     """Basic-coverage tests."""
 
@@ -107,11 +125,238 @@ class TestSimpleMap(unittest.TestCase):
             self.phmap[i] = i
         self.assertEqual(len(self.phmap), 4)
 
+    def test_probe_stats(self):
+        self.assertEqual(self.phmap.probe_stats()['count'], 0)
+        p = self.phmap._compression._prime
+        for i in range(3): # same home index, so a cluster of three
+            self.phmap[i * p] = i
+        stats = self.phmap.probe_stats()
+        self.assertEqual(stats['count'], 3)
+        self.assertEqual(stats['max'], 3)
+        self.assertEqual(stats['mean'], 2)
+
     def test_iter(self):
         for i in range(5):
             self.phmap[i] = i
         for key, value in self.phmap.items():
             self.assertEqual(key, value)
 
+class TestIncrementalResize(unittest.TestCase):
+    """Tests for the incremental-rehash mode."""
+
+    def setUp(self):
+        self.phmap = ProbeHashMap(incremental=True)
+
+    def test_resize_keeps_old_table_until_drained(self):
+        for i in range(6): # 6th item crosses load factor 0.5 at capacity 11
+            self.phmap[i] = i
+        self.assertEqual(len(self.phmap._table), 21)
+        self.assertIsNotNone(self.phmap._old) # old table not drained yet
+        self.assertEqual(len(self.phmap), 6)
+        for i in range(6):
+            self.assertEqual(self.phmap[i], i) # each access moves buckets over
+        self.assertIsNone(self.phmap._old)
+        self.assertEqual(len(self.phmap), 6)
+
+    def test_operations_during_migration(self):
+        for i in range(6):
+            self.phmap[i] = i
+        assert self.phmap._old is not None
+        self.phmap[5] = "five" # overwrite a key that may be in either table
+        del self.phmap[4]
+        with self.assertRaises(KeyError):
+            del self.phmap[4]
+        self.assertEqual(self.phmap[5], "five")
+        self.assertEqual(len(self.phmap), 5)
+
+    def test_iter_during_migration(self):
+        for i in range(6):
+            self.phmap[i] = i
+        assert self.phmap._old is not None
+        self.assertEqual(sorted(self.phmap), list(range(6)))
+
+    def test_items_and_values_during_migration(self):
+        """Views must not migrate buckets under the iteration."""
+        for scale in range(1, 200):
+            phmap = ProbeHashMap(incremental=True,
+                                 compression=MADCompression(scale=scale,
+                                                            shift=0))
+            for i in range(12):
+                phmap[i] = str(i)
+            assert phmap._old is not None
+            self.assertEqual(sorted(phmap.items()),
+                             sorted((i, str(i)) for i in range(12)))
+            self.assertEqual(sorted(phmap.values()),
+                             sorted(str(i) for i in range(12)))
+            self.assertIsNotNone(phmap._old) # iterating moved nothing
+
+    def test_many_items(self):
+        for i in range(1000):
+            self.phmap[i] = i
+        for i in range(0, 1000, 2):
+            del self.phmap[i]
+        self.assertEqual(len(self.phmap), 500)
+        self.assertEqual(sorted(self.phmap.keys()), list(range(1, 1000, 2)))
+        for i in range(1, 1000, 2):
+            self.assertEqual(self.phmap[i], i)
+
+class TestCachedHashCodes(unittest.TestCase):
+    """Tests that items cache their keys' full hash codes."""
+
+    def setUp(self):
+        self.phmap = ProbeHashMap()
+
+    def test_resize_does_not_rehash(self):
+        CountingKey.hash_calls = 0
+        for i in range(50): # several resizes along the way
+            self.phmap[CountingKey(i, i)] = i
+        self.assertEqual(CountingKey.hash_calls, 50) # once per insertion
+
+    def test_hash_mismatch_skips_eq(self):
+        """Keys whose hash codes differ by a multiple of the MAD prime share a
+        bucket, but only the key actually searched for should be compared."""
+        p = self.phmap._compression._prime
+        for i in range(4):
+            self.phmap[CountingKey(i, i * p)] = i
+        CountingKey.eq_calls = 0
+        for i in range(4):
+            self.assertEqual(self.phmap[CountingKey(i, i * p)], i)
+        self.assertEqual(CountingKey.eq_calls, 4)
+
+class TestDeletionMarkers(unittest.TestCase):
+    """Tests for _AVAIL tracking, cleanup and shrinking."""
+
+    def setUp(self):
+        self.phmap = ProbeHashMap()
+
+    def count_avail(self):
+        return sum(1 for x in self.phmap._table if x is ProbeHashMap._AVAIL)
+
+    def test_deleted_count_tracks_markers(self):
+        for i in range(4):
+            self.phmap[i] = i
+        del self.phmap[0]
+        del self.phmap[1]
+        self.assertEqual(self.phmap._deleted, 2)
+        self.assertEqual(self.phmap._deleted, self.count_avail())
+
+    def test_churn_keeps_empty_slots(self):
+        """Insert/delete churn with ever-new keys shouldn't be able to fill
+        the table with _AVAIL markers."""
+        for i in range(1000):
+            self.phmap[i] = i
+            if i >= 3:
+                del self.phmap[i - 3]
+        self.assertEqual(len(self.phmap), 3)
+        self.assertEqual(self.phmap._deleted, self.count_avail())
+        self.assertLessEqual(len(self.phmap) + self.phmap._deleted,
+                             len(self.phmap._table) // 2)
+        # some slot is still None, so unsuccessful searches still end
+        self.assertTrue(any(x is None for x in self.phmap._table))
+
+    def test_shrinks_when_emptied(self):
+        for i in range(200):
+            self.phmap[i] = i
+        grown = len(self.phmap._table)
+        for i in range(200):
+            del self.phmap[i]
+        self.assertLess(len(self.phmap._table), grown)
+        self.assertGreaterEqual(len(self.phmap._table), 11)
+        self.phmap["again"] = 1
+        self.assertEqual(self.phmap["again"], 1)
+
+class TestBulkLoad(unittest.TestCase):
+    """Tests for from_items and update_many."""
+
+    class CountingMap(ProbeHashMap):
+        """Map that counts how many times its table gets rebuilt."""
+        def _rehash(self, c):
+            type(self).rehashes += 1
+            super()._rehash(c)
+
+    def test_from_items_sizes_table_once(self):
+        self.CountingMap.rehashes = 0
+        pairs = [(i, str(i)) for i in range(1000)]
+        phmap = self.CountingMap.from_items(pairs)
+        self.assertEqual(self.CountingMap.rehashes, 1)
+        self.assertEqual(len(phmap._table), 2001)
+        self.assertEqual(len(phmap), 1000)
+        for i in range(1000):
+            self.assertEqual(phmap[i], str(i))
+
+    def test_from_mapping(self):
+        phmap = ProbeHashMap.from_items({"a": 1, "b": 2})
+        self.assertEqual(sorted(phmap.items()), [("a", 1), ("b", 2)])
+
+    def test_iterator_with_size_hint(self):
+        phmap = ProbeHashMap.from_items(((i, i) for i in range(500)), size_hint=500)
+        self.assertEqual(len(phmap._table), 1001)
+        self.assertEqual(len(phmap), 500)
+
+    def test_iterator_longer_than_hint_still_grows(self):
+        phmap = ProbeHashMap.from_items(((i, i) for i in range(500)), size_hint=10)
+        self.assertEqual(len(phmap), 500)
+        self.assertLessEqual(len(phmap), len(phmap._table) // 2)
+        for i in range(500):
+            self.assertEqual(phmap[i], i)
+
+    def test_update_many_overwrites(self):
+        phmap = ProbeHashMap()
+        for i in range(10):
+            phmap[i] = 0
+        phmap.update_many([(i, 1) for i in range(5, 20)])
+        self.assertEqual(len(phmap), 20)
+        self.assertEqual(phmap[4], 0)
+        self.assertEqual(phmap[5], 1)
+
+    def test_update_many_during_migration(self):
+        phmap = ProbeHashMap(incremental=True)
+        for i in range(6):
+            phmap[i] = i
+        assert phmap._old is not None
+        phmap.update_many([(i, i) for i in range(6, 100)])
+        self.assertIsNone(phmap._old)
+        self.assertEqual(sorted(phmap), list(range(100)))
+
+class TestBatchAccess(unittest.TestCase):
+    """Tests for get_many, contains_many and set_many."""
+
+    def setUp(self):
+        self.phmap = ProbeHashMap()
+        for i in range(50):
+            self.phmap[str(i)] = i
+
+    def test_compress_many_matches_compress(self):
+        hashes = [hash(str(i)) for i in range(100)] + [-2 ** 63, 2 ** 63 - 1]
+        self.assertEqual(self.phmap._compress_many(hashes),
+                         [self.phmap._compress(h) for h in hashes])
+
+    def test_get_many(self):
+        keys = ["3", "missing", "49"]
+        self.assertEqual(self.phmap.get_many(keys), [3, None, 49])
+        self.assertEqual(self.phmap.get_many(keys, default=-1), [3, -1, 49])
+
+    def test_contains_many(self):
+        self.phmap["none"] = None # a stored None still counts as present
+        self.assertEqual(self.phmap.contains_many(["0", "none", "missing"]),
+                         [True, True, False])
+
+    def test_set_many(self):
+        self.phmap.set_many([str(i) for i in range(40, 140)], range(100))
+        self.assertEqual(len(self.phmap), 140)
+        self.assertEqual(self.phmap["39"], 39)
+        self.assertEqual(self.phmap["40"], 0)
+        self.assertEqual(self.phmap["139"], 99)
+        with self.assertRaises(ValueError):
+            self.phmap.set_many(["a", "b"], [1])
+
+    def test_batches_during_migration(self):
+        phmap = ProbeHashMap(incremental=True)
+        for i in range(6):
+            phmap[i] = i
+        assert phmap._old is not None
+        phmap.set_many([5, 6], ["five", "six"])
+        self.assertEqual(phmap.get_many([0, 5, 6, 7]), [0, "five", "six", None])
+
 if __name__ == '__main__':
     unittest.main()
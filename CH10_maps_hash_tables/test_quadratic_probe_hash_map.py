@@ -0,0 +1,44 @@
+import unittest
+
+from quadratic_probe_hash_map import QuadraticProbeHashMap
+
+class TestQuadraticProbeHashMap(unittest.TestCase):
+    """Basic-coverage tests."""
+
+    def setUp(self):
+        self.qmap = QuadraticProbeHashMap()
+
+    def test_capacity_is_prime(self):
+        self.assertEqual(len(QuadraticProbeHashMap(cap=20)._table), 23)
+        for i in range(6): # forces a resize from 11 to a prime near 21
+            self.qmap[i] = i
+        self.assertEqual(len(self.qmap._table), 23)
+
+    def test_next_slot_is_quadratic(self):
+        n = len(self.qmap._table)
+        j = home = 3
+        for i in range(1, 6):
+            j = self.qmap._next_slot(j, i, 0)
+            self.assertEqual(j, (home + i * i) % n)
+
+    def test_setitem_getitem_delitem(self):
+        for i in range(200):
+            self.qmap[i] = str(i)
+        for i in range(0, 200, 2):
+            del self.qmap[i]
+        self.assertEqual(len(self.qmap), 100)
+        for i in range(1, 200, 2):
+            self.assertEqual(self.qmap[i], str(i))
+        with self.assertRaises(KeyError):
+            self.qmap[0]
+
+    def test_probe_stats(self):
+        for i in range(100):
+            self.qmap[(i, "key")] = i
+        stats = self.qmap.probe_stats()
+        self.assertEqual(stats['count'], 100)
+        self.assertGreaterEqual(stats['mean'], 1)
+        self.assertGreaterEqual(stats['max'], stats['mean'])
+
+if __name__ == '__main__':
+    unittest.main()
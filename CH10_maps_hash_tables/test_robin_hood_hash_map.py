@@ -0,0 +1,62 @@
+import unittest
+
+from robin_hood_hash_map import RobinHoodHashMap
+
+class TestRobinHoodHashMap(unittest.TestCase):
+    """Basic-coverage tests."""
+
+    def setUp(self):
+        self.rhmap = RobinHoodHashMap()
+
+    def fill_one_home(self, count):
+        """Insert count keys that all share a home index."""
+        p = self.rhmap._compression._prime
+        for i in range(count):
+            self.rhmap[i * p] = i # hash codes congruent mod p compress alike
+
+    def test_setitem_getitem(self):
+        self.rhmap["key"] = 1
+        self.rhmap["key"] = 2
+        self.assertEqual(self.rhmap["key"], 2)
+        self.assertEqual(len(self.rhmap), 1)
+
+    def test_collisions_form_one_cluster(self):
+        self.fill_one_home(4)
+        p = self.rhmap._compression._prime
+        for i in range(4):
+            self.assertEqual(self.rhmap[i * p], i)
+        self.assertEqual(self.rhmap.probe_stats()['max'], 4)
+
+    def test_delete_shifts_back_instead_of_leaving_avail(self):
+        self.fill_one_home(4)
+        p = self.rhmap._compression._prime
+        del self.rhmap[0]
+        self.assertFalse(any(x is RobinHoodHashMap._AVAIL
+                             for x in self.rhmap._table))
+        self.assertEqual(self.rhmap.probe_stats()['max'], 3)
+        for i in range(1, 4):
+            self.assertEqual(self.rhmap[i * p], i)
+        with self.assertRaises(KeyError):
+            del self.rhmap[0]
+
+    def test_many_items(self):
+        for i in range(500):
+            self.rhmap[str(i)] = i
+        for i in range(0, 500, 3):
+            del self.rhmap[str(i)]
+        self.assertEqual(len(self.rhmap), 333)
+        self.assertEqual(sorted(self.rhmap.values()),
+                         [i for i in range(500) if i % 3])
+        self.assertFalse(any(x is RobinHoodHashMap._AVAIL
+                             for x in self.rhmap._table))
+
+    def test_incremental(self):
+        rhmap = RobinHoodHashMap(incremental=True)
+        for i in range(300):
+            rhmap[str(i)] = i
+        for i in range(0, 300, 2):
+            del rhmap[str(i)]
+        self.assertEqual(sorted(rhmap.values()), list(range(1, 300, 2)))
+
+if __name__ == '__main__':
+    unittest.main()
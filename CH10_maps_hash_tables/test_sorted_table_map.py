@@ -130,7 +130,219 @@ class TestAccessorsWithAlphabetTable(unittest.TestCase):
         self.assertIsNone(empty_stmap.find_ge(k))
         self.assertIsNone(empty_stmap.find_lt(k))
         self.assertIsNone(empty_stmap.find_gt(k))
-        
+        self.assertIsNone(empty_stmap.find_le(k))
+
+    def test_find_le(self):
+        # Greatest key less than or equal to 15 should be 15.
+        self.assertEqual(self.stmap.find_le(15), (15, "p"))
+        self.assertEqual(self.stmap.find_le(15.5), (15, "p"))
+        self.assertIsNone(self.stmap.find_le(-1))
+        self.assertEqual(self.stmap.find_le(100), self.stmap.find_max())
+
+    def test_find_at_table_ends(self):
+        self.assertEqual(self.stmap.find_ge(-5), (0, "a"))
+        self.assertIsNone(self.stmap.find_ge(26))
+        self.assertIsNone(self.stmap.find_lt(0))
+        self.assertIsNone(self.stmap.find_gt(25))
+        self.assertEqual(self.stmap.find_gt(24.5), (25, "z"))
+
+    def test_find_range_stop_before_start(self):
+        self.assertEqual(list(self.stmap.find_range(start=20, stop=10)), [])
+
+class TestKeyList(unittest.TestCase):
+    """Tests for the parallel key list behind the bisect-based searches."""
+
+    def setUp(self):
+        self.stmap = SortedTableMap()
+
+    def assertKeysInSync(self):
+        self.assertEqual(self.stmap._keys,
+                         [item._key for item in self.stmap._table])
+
+    def test_keys_follow_inserts_and_deletes(self):
+        for k in [5, 1, 9, 3, 7, 1, 9]:
+            self.stmap[k] = str(k)
+            self.assertKeysInSync()
+        for k in [1, 9, 5]:
+            del self.stmap[k]
+            self.assertKeysInSync()
+        self.assertEqual(list(self.stmap), [3, 7])
+        self.assertEqual(list(reversed(self.stmap)), [7, 3])
+
+    def test_find_index(self):
+        for k in range(0, 20, 2):
+            self.stmap[k] = k
+        self.assertEqual(self.stmap._find_index(6, 0, 9), 3)
+        self.assertEqual(self.stmap._find_index(7, 0, 9), 4)
+        self.assertEqual(self.stmap._find_index(100, 0, 9), 10) # high + 1
+        self.assertEqual(self.stmap._find_index(0, 5, 9), 5)
+        self.assertEqual(self.stmap._find_index(6, 5, 4), 5) # empty range
+
+class TestBulkOperations(unittest.TestCase):
+    """Tests for update_sorted and delete_range."""
+
+    def setUp(self):
+        self.stmap = SortedTableMap()
+        for k in range(0, 20, 2):
+            self.stmap[k] = "old"
+
+    def assertKeysInSync(self):
+        self.assertEqual(self.stmap._keys,
+                         [item._key for item in self.stmap._table])
+
+    def test_update_sorted_merges(self):
+        self.stmap.update_sorted([(15, "new"), (-1, "new"), (4, "new"),
+                                  (25, "new"), (5, "new")])
+        self.assertKeysInSync()
+        self.assertEqual(list(self.stmap),
+                         [-1, 0, 2, 4, 5, 6, 8, 10, 12, 14, 15, 16, 18, 25])
+        self.assertEqual(self.stmap[4], "new") # overwritten in place
+        self.assertEqual(self.stmap[6], "old")
+        self.assertEqual(len(self.stmap), 14)
+
+    def test_update_sorted_matches_setitem(self):
+        pairs = [((i * 37) % 101, i) for i in range(300)] # many duplicates
+        expected = SortedTableMap()
+        for k, v in pairs:
+            expected[k] = v
+        actual = SortedTableMap()
+        actual.update_sorted(pairs)
+        self.assertEqual(list(actual.items()), list(expected.items()))
+
+    def test_update_sorted_last_duplicate_wins(self):
+        self.stmap.update_sorted([(3, "first"), (3, "second"), (2, "a"),
+                                  (2, "b")])
+        self.assertEqual(self.stmap[3], "second")
+        self.assertEqual(self.stmap[2], "b")
+        self.assertKeysInSync()
+
+    def test_update_sorted_accepts_mapping_and_empty(self):
+        self.stmap.update_sorted({})
+        self.assertEqual(len(self.stmap), 10)
+        self.stmap.update_sorted({1: "one", 0: "zero"})
+        self.assertEqual(self.stmap.find_min(), (0, "zero"))
+        self.assertEqual(self.stmap[1], "one")
+        empty = SortedTableMap()
+        empty.update_sorted(iter([(2, "b"), (1, "a")]))
+        self.assertEqual(list(empty.items()), [(1, "a"), (2, "b")])
+
+    def test_delete_range(self):
+        self.assertEqual(self.stmap.delete_range(3, 9), 3) # 4, 6 and 8
+        self.assertKeysInSync()
+        self.assertEqual(list(self.stmap), [0, 2, 10, 12, 14, 16, 18])
+        self.assertEqual(self.stmap.delete_range(None, 2), 1)
+        self.assertEqual(self.stmap.delete_range(14, None), 3)
+        self.assertEqual(list(self.stmap), [2, 10, 12])
+
+    def test_delete_range_removes_nothing(self):
+        self.assertEqual(self.stmap.delete_range(9, 3), 0)
+        self.assertEqual(self.stmap.delete_range(100, None), 0)
+        self.assertEqual(len(self.stmap), 10)
+        self.assertEqual(self.stmap.delete_range(None, None), 10)
+        self.assertEqual(len(self.stmap), 0)
+        self.assertKeysInSync()
+class TestRangeView(unittest.TestCase):
+    """Tests for range_view and its keys and values views."""
+
+    def setUp(self):
+        self.stmap = SortedTableMap()
+        for i in range(26):
+            self.stmap[i] = chr(ord("a") + i)
+        self.view = self.stmap.range_view(10, 20)
+
+    def test_len(self):
+        self.assertEqual(len(self.view), 10)
+        self.assertEqual(len(self.stmap.range_view()), 26)
+        self.assertEqual(len(self.stmap.range_view(20, 10)), 0)
+        self.assertEqual(len(self.stmap.range_view(None, 3)), 3)
+        self.assertEqual(len(self.stmap.range_view(23.5, None)), 2)
+
+    def test_iter_matches_find_range(self):
+        self.assertEqual(list(self.view), list(self.stmap.find_range(10, 20)))
+        self.assertEqual(list(reversed(self.view)),
+                         list(self.stmap.find_range(10, 20))[::-1])
+
+    def test_indexing(self):
+        self.assertEqual(self.view[0], (10, "k"))
+        self.assertEqual(self.view[-1], (19, "t"))
+        with self.assertRaises(IndexError):
+            self.view[10]
+
+    def test_slicing(self):
+        sub = self.view[2:5]
+        self.assertEqual(list(sub), [(12, "m"), (13, "n"), (14, "o")])
+        self.assertEqual(list(self.view[::-3].keys()), [19, 16, 13, 10])
+        self.assertEqual(len(self.view[8:100]), 2)
+
+    def test_keys_and_values(self):
+        keys = self.view.keys()
+        values = self.view.values()
+        self.assertEqual(list(keys), list(range(10, 20)))
+        self.assertEqual(list(values), [chr(ord("a") + i) for i in range(10, 20)])
+        self.assertEqual(list(reversed(keys)), list(range(19, 9, -1)))
+        self.assertEqual(keys[-2], 18)
+        self.assertEqual(values[1:3][0], "l")
+        self.assertEqual(len(keys), 10)
+        self.assertIn(15, keys)
+        self.assertNotIn(25, keys)
+
+    def test_empty_map(self):
+        view = SortedTableMap().range_view()
+        self.assertEqual(len(view), 0)
+        self.assertEqual(list(view), [])
+        self.assertEqual(list(view.keys()), [])
+class TestOrderStatistics(unittest.TestCase):
+    """Tests for rank, select, count_range, percentile and median."""
+
+    def setUp(self):
+        self.stmap = SortedTableMap()
+        for k in range(10, 110, 10): # keys 10, 20, ..., 100
+            self.stmap[k] = k // 10
+
+    def test_rank(self):
+        self.assertEqual(self.stmap.rank(10), 0)
+        self.assertEqual(self.stmap.rank(35), 3)
+        self.assertEqual(self.stmap.rank(40), 3) # strictly less than
+        self.assertEqual(self.stmap.rank(1000), 10)
+        self.assertEqual(SortedTableMap().rank(5), 0)
+
+    def test_select(self):
+        self.assertEqual(self.stmap.select(0), (10, 1))
+        self.assertEqual(self.stmap.select(9), (100, 10))
+        for i in range(10):
+            self.assertEqual(self.stmap.rank(self.stmap.select(i)[0]), i)
+        with self.assertRaises(IndexError):
+            self.stmap.select(10)
+        with self.assertRaises(IndexError):
+            self.stmap.select(-1)
+
+    def test_count_range(self):
+        self.assertEqual(self.stmap.count_range(20, 50), 3)
+        self.assertEqual(self.stmap.count_range(None, 50), 4)
+        self.assertEqual(self.stmap.count_range(55, None), 5)
+        self.assertEqual(self.stmap.count_range(None, None), 10)
+        self.assertEqual(self.stmap.count_range(50, 20), 0)
+        self.assertEqual(self.stmap.count_range(20, 50),
+                         len(list(self.stmap.find_range(20, 50))))
+
+    def test_percentile(self):
+        self.assertEqual(self.stmap.percentile(0), (10, 1))
+        self.assertEqual(self.stmap.percentile(10), (10, 1))
+        self.assertEqual(self.stmap.percentile(11), (20, 2))
+        self.assertEqual(self.stmap.percentile(90), (90, 9))
+        self.assertEqual(self.stmap.percentile(99.5), (100, 10))
+        self.assertEqual(self.stmap.percentile(100), (100, 10))
+        self.assertIsNone(SortedTableMap().percentile(50))
+        with self.assertRaises(ValueError):
+            self.stmap.percentile(101)
+        with self.assertRaises(ValueError):
+            self.stmap.percentile(-1)
+
+    def test_median(self):
+        self.assertEqual(self.stmap.median(), (50, 5)) # lower middle
+        self.stmap[110] = 11
+        self.assertEqual(self.stmap.median(), (60, 6))
+        self.assertIsNone(SortedTableMap().median())
 
 if __name__ == '__main__':
     unittest.main()
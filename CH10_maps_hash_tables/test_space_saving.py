@@ -0,0 +1,73 @@
+import unittest
+from collections import Counter
+
+from space_saving import SpaceSaving
+from test_count_min_sketch import zipf_words
+
+class TestSpaceSaving(unittest.TestCase):
+    """Basic-coverage tests."""
+
+    def setUp(self):
+        self.words = zipf_words(20000)
+        self.exact = Counter(self.words)
+
+    def assertWithinBounds(self, ss, k):
+        bound = len(self.words) / k
+        for (w, c) in self.exact.items():
+            self.assertGreaterEqual(ss.estimate(w), c)
+            self.assertLessEqual(ss.estimate(w), c + bound)
+            self.assertLessEqual(ss.guaranteed(w), c)
+
+    def test_exact_while_counters_suffice(self):
+        ss = SpaceSaving(10)
+        ss.add_many("abracadabra")
+        self.assertEqual(ss.estimate("a"), 5)
+        self.assertEqual(ss["b"], 2)
+        self.assertEqual(ss.estimate("z"), 0) # counters to spare
+        self.assertEqual(ss.guaranteed("a"), 5)
+        self.assertEqual(len(ss), 11)
+
+    def test_takeover(self):
+        ss = SpaceSaving(2)
+        ss.add("a", 5)
+        ss.add("b", 2)
+        ss.add("c")
+        self.assertEqual(ss.estimate("c"), 3) # took over b's count of 2
+        self.assertEqual(ss.guaranteed("c"), 1)
+        self.assertEqual(ss.estimate("b"), 3) # bounded by the smallest count
+        self.assertEqual(ss.top(), [("a", 5), ("c", 3)])
+
+    def test_unorderable_items(self):
+        ss = SpaceSaving(2)
+        for item in [1, "one", (1,), 1, None, "one"]:
+            ss.add(item)
+        self.assertEqual(len(ss._counts), 2)
+
+    def test_error_bound(self):
+        k = 50
+        ss = SpaceSaving(k)
+        ss.add_many(self.words)
+        self.assertEqual(len(ss._counts), k)
+        self.assertLessEqual(len(ss._heap), 4 * k)
+        self.assertWithinBounds(ss, k)
+        self.assertEqual([w for (w, c) in ss.top(3)],
+                         [w for (w, c) in self.exact.most_common(3)])
+
+    def test_merge(self):
+        k = 50
+        parts = [SpaceSaving(k) for _ in range(4)]
+        for i, part in enumerate(parts):
+            part.add_many(self.words[i::4])
+        for part in parts[1:]:
+            parts[0].merge(part)
+        merged = parts[0]
+        self.assertEqual(len(merged), len(self.words))
+        self.assertEqual(len(merged._counts), k)
+        self.assertWithinBounds(merged, k)
+        merged.add_many(["after merge"] * 3) # heap still works
+        self.assertGreaterEqual(merged.estimate("after merge"), 3)
+        with self.assertRaises(ValueError):
+            merged.merge(SpaceSaving(k + 1))
+
+if __name__ == '__main__':
+    unittest.main()
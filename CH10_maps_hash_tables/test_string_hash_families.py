@@ -0,0 +1,122 @@
+import unittest
+from unittest import mock
+
+import string_hash_families
+from chain_hash_map import ChainHashMap
+from compact_probe_hash_map import CompactProbeHashMap
+from hash_code_cyclic_shift import hash_code
+from probe_hash_map import ProbeHashMap
+from string_hash_families import CyclicShiftHash, FNV1aHash, PolynomialHash
+
+FAMILIES = [CyclicShiftHash(), CyclicShiftHash(7), PolynomialHash(),
+            PolynomialHash(41), FNV1aHash()]
+
+WORDS = ["the", "adventures", "of", "sherlock", "holmes", "", "a",
+         "naïve", "café", "x" * 70, "stop", "pots", "tops"]
+
+class CountingFamily(PolynomialHash):
+    """Polynomial family that counts calls to many()."""
+    batches = 0
+
+    def many(self, strings):
+        CountingFamily.batches += 1
+        return super().many(strings)
+
+class TestFamilies(unittest.TestCase):
+    """Basic-coverage tests."""
+
+    def test_cyclic_shift_matches_reference_on_ascii(self):
+        cyclic = CyclicShiftHash()
+        for word in WORDS:
+            if word.isascii():
+                self.assertEqual(cyclic(word), hash_code(word))
+
+    def test_fnv1a_known_values(self):
+        fnv = FNV1aHash()
+        self.assertEqual(fnv("") & (2**64 - 1), 0xCBF29CE484222325)
+        self.assertEqual(fnv("a") & (2**64 - 1), 0xAF63DC4C8601EC8C)
+        self.assertEqual(fnv("foobar") & (2**64 - 1), 0x85944171F73967E8)
+
+    def test_polynomial_is_horner(self):
+        self.assertEqual(PolynomialHash(33)("ab"), 97 * 33 + 98)
+
+    def test_str_and_bytes_agree(self):
+        for family in FAMILIES:
+            for word in WORDS:
+                self.assertEqual(family(word), family(word.encode("utf-8")))
+
+    def test_codes_are_signed_64_bit(self):
+        for family in FAMILIES:
+            for code in family.many(WORDS):
+                self.assertTrue(-2**63 <= code < 2**63)
+
+    def test_rejects_non_string_keys(self):
+        with self.assertRaises(TypeError):
+            FNV1aHash()(12)
+
+class TestBatch(unittest.TestCase):
+    """many() must give exactly the codes of the scalar call."""
+
+    def test_many_matches_scalar(self):
+        for family in FAMILIES:
+            self.assertEqual(family.many(WORDS), [family(w) for w in WORDS])
+
+    def test_many_accepts_bytes_and_mixed(self):
+        mixed = [w.encode("utf-8") if i % 2 else w for i, w in enumerate(WORDS)]
+        for family in FAMILIES:
+            self.assertEqual(family.many(mixed), [family(w) for w in WORDS])
+
+    def test_many_splits_buffer(self):
+        buffer = b"the  quick\nbrown\tfox "
+        for family in FAMILIES:
+            self.assertEqual(family.many(buffer),
+                             [family(w) for w in ["the", "quick", "brown",
+                                                  "fox"]])
+            self.assertEqual(family.many(bytearray(buffer)),
+                             family.many(buffer))
+
+    def test_many_small_batches(self):
+        for family in FAMILIES:
+            self.assertEqual(family.many([]), [])
+            self.assertEqual(family.many(["one"]), [family("one")])
+            self.assertEqual(family.many(["", ""]), [family("")] * 2)
+
+    def test_many_without_numpy(self):
+        expected = [f.many(WORDS) for f in FAMILIES]
+        with mock.patch.object(string_hash_families, "np", None):
+            self.assertEqual([f.many(WORDS) for f in FAMILIES], expected)
+
+class TestPluggableHashCode(unittest.TestCase):
+    """Families can replace hash() in any HashMapBase map."""
+
+    def test_maps_use_family(self):
+        for cls in (ChainHashMap, ProbeHashMap, CompactProbeHashMap):
+            for family in FAMILIES:
+                hmap = cls(hash_code=family)
+                for i, word in enumerate(WORDS * 3):
+                    hmap[word] = i
+                self.assertEqual(len(hmap), len(WORDS))
+                for word in WORDS:
+                    self.assertEqual(hmap[word], 2 * len(WORDS) +
+                                     WORDS.index(word))
+                self.assertEqual(hmap._hash_code("of"), family("of"))
+
+    def test_incremental_map_keeps_family(self):
+        hmap = ProbeHashMap(incremental=True, hash_code=FNV1aHash())
+        words = [f"word{i}" for i in range(300)]
+        for word in words:
+            hmap[word] = word
+        for word in words[::3]:
+            del hmap[word]
+        self.assertEqual(sorted(hmap), sorted(set(words) - set(words[::3])))
+
+    def test_batch_methods_call_many(self):
+        hmap = ChainHashMap(hash_code=CountingFamily())
+        CountingFamily.batches = 0
+        hmap.set_many(WORDS, range(len(WORDS)))
+        self.assertEqual(hmap.get_many(["the", "missing", "café"], -1),
+                         [0, -1, WORDS.index("café")])
+        self.assertEqual(CountingFamily.batches, 2)
+
+if __name__ == '__main__':
+    unittest.main()
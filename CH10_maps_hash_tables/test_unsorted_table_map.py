@@ -57,5 +57,30 @@ class TestSimpleTable(unittest.TestCase):
         for key in self.table.keys():
             self.assertIsNotNone(self.table[key])
 
+class TestHashedVariants(unittest.TestCase):
+    """Tests for the hash-aware methods used by ChainHashMap buckets."""
+
+    def setUp(self):
+        self.table = UnsortedTableMap()
+
+    def test_setitem_getitem_hashed(self):
+        self.assertTrue(self.table._setitem_hashed("key", 1, hash("key")))
+        self.assertEqual(self.table._getitem_hashed("key", hash("key")), 1)
+        self.assertFalse(self.table._setitem_hashed("key", 2, hash("key")))
+        self.assertEqual(len(self.table), 1)
+        self.assertEqual(self.table["key"], 2) # plain access still works
+
+    def test_hash_mismatch_is_a_miss(self):
+        self.table._setitem_hashed("key", 1, 5)
+        with self.assertRaises(KeyError):
+            self.table._getitem_hashed("key", 6)
+
+    def test_delitem_hashed(self):
+        self.table._setitem_hashed("key", 1, 5)
+        with self.assertRaises(KeyError):
+            self.table._delitem_hashed("key", 6)
+        self.table._delitem_hashed("key", 5)
+        self.assertEqual(len(self.table), 0)
+
 if __name__ == '__main__':
     unittest.main()
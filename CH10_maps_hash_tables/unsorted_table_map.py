@@ -39,3 +39,32 @@ class UnsortedTableMap(MapBase):
         """Generate iteration of the map's keys."""
         for item in self._table:
             yield item._key
+
+    #### Hash-aware variants, used when the table is a hash map's bucket ####
+        # Items are _HashItem objects, so a differing cached hash code rules
+        #   out a match before the key's __eq__ is ever called.
+
+    def _getitem_hashed(self, k, h):
+        """Return value associated with key k having hash code h."""
+        for item in self._table:
+            if item._hash == h and k == item._key:
+                return item._value
+        raise KeyError('Key Error: ' + repr(k))
+
+    def _setitem_hashed(self, k, v, h) -> bool:
+        """Assign value v to key k having hash code h. Return True if k was
+        new to the table, False if an existing value was overwritten."""
+        for item in self._table:
+            if item._hash == h and k == item._key:
+                item._value = v
+                return False
+        self._table.append(self._HashItem(k, v, h))
+        return True
+
+    def _delitem_hashed(self, k, h):
+        """Remove item with key k having hash code h."""
+        for j in range(len(self._table)):
+            if self._table[j]._hash == h and k == self._table[j]._key:
+                self._table.pop(j)
+                return
+        raise KeyError('Key Error: ' + repr(k))
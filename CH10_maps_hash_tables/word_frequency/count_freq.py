@@ -21,5 +21,6 @@ def max_word(filename):
     print(f"{max_word} occurs '{max_count}' times")
     return (max_word, max_count)
 
-filename = 'sherlock_holmes.txt'
-max_word(filename)
+if __name__ == '__main__':
+    filename = 'sherlock_holmes.txt'
+    max_word(filename)
@@ -0,0 +1,133 @@
+"""Streaming, parallel word count.
+
+Counts words the same way count_freq.max_word does: the text is lowercased
+and split on whitespace, and each piece keeps only its alphabetic
+characters. The file is read in fixed-size chunks, so memory stays bounded by
+the chunk size plus the vocabulary. It is split into byte ranges that start
+and end on whitespace, and a process pool counts the ranges, merging the
+partial counts as they arrive.
+
+Usage: python stream_word_count.py FILE [-k TOP] [-p PROCESSES] [-c CHUNK]
+"""
+
+import argparse
+import codecs
+from collections import Counter
+import heapq
+import multiprocessing
+import os
+import re
+import time
+
+_WHITESPACE_BYTE = re.compile(rb'[ \t\n\r\x0b\x0c\x1c-\x1f]') # never inside
+    # a multibyte UTF-8 sequence, and str.split() splits on all of them
+
+def _words(pieces):
+    """Generate the words in pieces, keeping only alphabetic characters."""
+    for piece in pieces:
+        if piece.isalpha(): # the common case needs no rebuilding
+            yield piece
+        else:
+            word = ''.join(c for c in piece if c.isalpha())
+            if word:
+                yield word
+
+def count_range(filename, start, end, chunk_size=1 << 20) -> Counter:
+    """Return Counter of the words in bytes [start, end) of filename.
+
+    The range should begin and end at whitespace (or at the ends of the file).
+    Reads chunk_size bytes at a time. A piece cut off by the end of a chunk
+    is carried over to the next chunk rather than counted as two words.
+    """
+    counts = Counter()
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    carry = '' # unfinished piece from the end of the previous chunk
+    with open(filename, 'rb') as f:
+        f.seek(start)
+        remaining = end - start
+        while remaining > 0:
+            block = f.read(min(chunk_size, remaining))
+            if not block:
+                break
+            remaining -= len(block)
+            text = carry + decoder.decode(block, final=remaining <= 0)
+            carry = ''
+            if remaining > 0 and text and not text[-1].isspace():
+                parts = text.rsplit(None, 1) # scans back over last piece only
+                carry = parts.pop()
+                text = parts[0] if parts else ''
+            counts.update(_words(text.lower().split()))
+    if carry:
+        counts.update(_words(carry.lower().split()))
+    return counts
+
+def _count_range_args(args):
+    return count_range(*args)
+
+def split_points(filename, parts: int) -> list:
+    """Return sorted list of byte offsets cutting filename into about parts
+    ranges, each cut placed on a whitespace byte. The list starts with 0 and
+    ends with the file size."""
+    size = os.path.getsize(filename)
+    points = [0]
+    with open(filename, 'rb') as f:
+        for i in range(1, parts):
+            pos = max(size * i // parts, points[-1])
+            f.seek(pos)
+            while pos < size: # advance to the next whitespace byte
+                block = f.read(1 << 16)
+                match = _WHITESPACE_BYTE.search(block)
+                if match:
+                    pos += match.start()
+                    break
+                pos += len(block)
+            if points[-1] < pos < size:
+                points.append(pos)
+    points.append(size)
+    return points
+
+def count_words(filename, processes=None, chunk_size=1 << 20) -> Counter:
+    """Return Counter of all words in filename.
+
+    Args:
+        processes (int): Worker processes; defaults to the CPU count. With 1,
+            the file is counted in this process.
+        chunk_size (int): Bytes read at a time by each worker.
+    """
+    if processes is None:
+        processes = os.cpu_count() or 1
+    if processes == 1:
+        return count_range(filename, 0, os.path.getsize(filename), chunk_size)
+    points = split_points(filename, 4 * processes) # several ranges per worker
+                                                   #   to even out the load
+    jobs = [(filename, points[i], points[i + 1], chunk_size)
+            for i in range(len(points) - 1)]
+    counts = Counter()
+    with multiprocessing.Pool(processes) as pool:
+        for partial in pool.imap_unordered(_count_range_args, jobs):
+            counts.update(partial) # merge as each range finishes
+    return counts
+
+def top_words(counts, k=10) -> list:
+    """Return list of the k (word, count) pairs with the highest counts, most
+    frequent first. Ties go to the alphabetically first word."""
+    return heapq.nsmallest(k, counts.items(), key=lambda wc: (-wc[1], wc[0]))
+
+def main():
+    parser = argparse.ArgumentParser(description='Count words in a text file.')
+    parser.add_argument('filename')
+    parser.add_argument('-k', '--top', type=int, default=10)
+    parser.add_argument('-p', '--processes', type=int, default=None)
+    parser.add_argument('-c', '--chunk-size', type=int, default=1 << 20)
+    args = parser.parse_args()
+    start = time.perf_counter()
+    counts = count_words(args.filename, args.processes, args.chunk_size)
+    elapsed = time.perf_counter() - start
+    tokens = sum(counts.values())
+    for (word, count) in top_words(counts, args.top):
+        print(f'{word:<20}{count:>12}')
+    print(f'{tokens} words ({len(counts)} distinct) in {elapsed:.2f}s: '
+          f'{tokens / elapsed:,.0f} words per second')
+
+if __name__ == '__main__':
+    main()
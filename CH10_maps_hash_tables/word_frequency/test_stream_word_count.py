@@ -0,0 +1,72 @@
+import os
+import tempfile
+import unittest
+from collections import Counter
+
+from stream_word_count import count_range, count_words, split_points, top_words
+
+SHERLOCK = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                        'sherlock_holmes.txt')
+
+def reference_counts(filename):
+    """Count words the way count_freq.max_word does, all in memory."""
+    counts = Counter()
+    for piece in open(filename, encoding='UTF-8').read().lower().split():
+        word = ''.join(c for c in piece if c.isalpha())
+        if word:
+            counts[word] += 1
+    return counts
+
+class TestStreamWordCount(unittest.TestCase):
+    """Basic-coverage tests."""
+
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp(suffix='.txt')
+        with os.fdopen(fd, 'w', encoding='UTF-8') as f:
+            f.write("The cat's hat\nthe CAT, the ÉLAN élan naïve 42 -- "
+                    "Straße\tstraße end")
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def test_matches_reference_at_every_chunk_size(self):
+        expected = reference_counts(self.path)
+        size = os.path.getsize(self.path)
+        for chunk_size in range(1, 20):
+            self.assertEqual(count_range(self.path, 0, size, chunk_size),
+                             expected)
+
+    def test_split_points_fall_on_whitespace(self):
+        with open(self.path, 'rb') as f:
+            data = f.read()
+        points = split_points(self.path, 6)
+        self.assertEqual(points[0], 0)
+        self.assertEqual(points[-1], len(data))
+        self.assertEqual(points, sorted(set(points)))
+        for p in points[1:-1]:
+            self.assertTrue(data[p:p + 1].isspace())
+        total = Counter()
+        for i in range(len(points) - 1):
+            total.update(count_range(self.path, points[i], points[i + 1], 3))
+        self.assertEqual(total, reference_counts(self.path))
+
+    def test_top_words(self):
+        counts = Counter({'b': 3, 'a': 3, 'c': 5, 'd': 1})
+        self.assertEqual(top_words(counts, 3), [('c', 5), ('a', 3), ('b', 3)])
+        self.assertEqual(top_words(counts, 10)[-1], ('d', 1))
+        self.assertEqual(top_words(Counter(), 3), [])
+
+class TestSherlock(unittest.TestCase):
+    """Whole-file counts, in one process and across a pool."""
+
+    def test_single_process(self):
+        counts = count_words(SHERLOCK, processes=1, chunk_size=4096)
+        self.assertEqual(counts, reference_counts(SHERLOCK))
+        self.assertEqual(top_words(counts, 1), [('the', 5805)])
+
+    def test_process_pool(self):
+        counts = count_words(SHERLOCK, processes=2, chunk_size=1 << 14)
+        self.assertEqual(counts, reference_counts(SHERLOCK))
+
+if __name__ == '__main__':
+    unittest.main()
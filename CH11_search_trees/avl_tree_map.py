@@ -72,3 +72,6 @@ class AVLTreeMap(TreeMap):
 
     def _rebalance_delete(self, p):
         self._rebalance(p)
+
+    def _rebalance_build(self, node, depth, height):
+        node._height = height # a leaf has height 1, as in _recompute_height
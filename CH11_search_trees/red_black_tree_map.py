@@ -67,6 +67,15 @@ class RedBlackTreeMap(TreeMap):
                     self._set_black(self.right(grand))
                     self._resolve_red(grand) # recur at red grandparent
 
+    #### Support for bulk loading
+    def _rebalance_build(self, node, depth, height):
+        # A perfectly balanced tree has every leaf on its deepest level or
+        #   the one above. Making just the deepest level red gives every path
+        #   from the root the same number of black nodes, with no red node
+        #   under another. The root stays black even if it is that level.
+        max_depth = len(self).bit_length() - 1
+        node._red = 0 < depth == max_depth
+
     #### Support for deletions
     def _rebalance_delete(self, p):
         """
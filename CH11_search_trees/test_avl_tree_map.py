@@ -147,18 +147,35 @@ class TestSimpleAVLTree(unittest.TestCase):
         self.tree._add_right(temp, self.tree._Item(91, self.val))
         self.assertTrue(self.tree._isbalanced(self.tree.root()))
         self.tree[92] = self.val
-        
-
-    
-        
-
-    
-        
-
-    
 
-    
-    
+class TestFromSorted(unittest.TestCase):
+    """Bulk loading sets valid heights."""
+
+    def check_heights(self, node):
+        """Assert node's subtree has correct heights and is balanced; return
+        its height."""
+        if node is None:
+            return 0
+        left = self.check_heights(node._left)
+        right = self.check_heights(node._right)
+        self.assertLessEqual(abs(left - right), 1)
+        self.assertEqual(node._height, 1 + max(left, right))
+        return node._height
+
+    def test_heights(self):
+        for n in (0, 1, 2, 3, 7, 8, 100, 1000):
+            tree = AVLTreeMap.from_sorted((k, k) for k in range(n))
+            self.assertEqual(len(tree), n)
+            self.check_heights(tree._root)
+
+    def test_updates_after_bulk_load(self):
+        tree = AVLTreeMap.from_sorted((k, k) for k in range(0, 200, 2))
+        for k in range(1, 200, 2):
+            tree[k] = k
+        for k in range(0, 200, 3):
+            del tree[k]
+        self.check_heights(tree._root)
+        self.assertEqual(list(tree), [k for k in range(200) if k % 3])
 
 if __name__ == '__main__':
     unittest.main()
@@ -265,8 +265,38 @@ class TestSimpleRedBlackTree(unittest.TestCase):
         del self.tree[14]
         self.assertTrue(self.tree.is_empty())
 
+class TestFromSorted(unittest.TestCase):
+    """Bulk loading sets valid colors."""
+
+    def black_height(self, node):
+        """Assert the red-black properties below node; return its black
+        height."""
+        if node is None:
+            return 1
+        for child in (node._left, node._right):
+            if node._red and child is not None:
+                self.assertFalse(child._red) # no red node has a red child
+        left = self.black_height(node._left)
+        self.assertEqual(left, self.black_height(node._right))
+        return left + (0 if node._red else 1)
+
+    def test_colors(self):
+        for n in (0, 1, 2, 3, 4, 7, 8, 100, 1000):
+            tree = RedBlackTreeMap.from_sorted((k, k) for k in range(n))
+            self.assertEqual(list(tree), list(range(n)))
+            if n:
+                self.assertFalse(tree._root._red)
+            self.black_height(tree._root)
+
+    def test_updates_after_bulk_load(self):
+        tree = RedBlackTreeMap.from_sorted((k, k) for k in range(0, 200, 2))
+        for k in range(1, 200, 2):
+            tree[k] = k
+        for k in range(0, 200, 3):
+            del tree[k]
+        self.assertFalse(tree._root._red)
+        self.black_height(tree._root)
+        self.assertEqual(list(tree), [k for k in range(200) if k % 3])
 
 if __name__ == '__main__':
     unittest.main()
-
-
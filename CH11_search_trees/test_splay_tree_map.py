@@ -57,6 +57,37 @@ class TestSimpleSplayTree(unittest.TestCase):
         self.pos87 = self.tree._add_left(temp1, self.tree._Item(87, self.val87))
         self.pos89 = self.tree._add_right(temp1, self.tree._Item(89, self.val))
 
+    def test_iteration_does_not_splay(self):
+        keys = list(self.tree)
+        self.assertEqual(keys, sorted(keys))
+        self.assertEqual([k for (k, v) in self.tree.items()], keys)
+        self.assertEqual(len(list(self.tree.values())), len(keys))
+        self.assertEqual(list(reversed(self.tree)), keys[::-1])
+        self.assertEqual(self.tree.root().key(), self.root_key)
+
+    def test_reads_while_iterating(self):
+        keys = sorted(self.tree)
+        seen = []
+        for k in self.tree:
+            self.tree[k] # splays k to the root
+            seen.append(k)
+        self.assertEqual(seen, keys)
+        seen = []
+        for k in reversed(self.tree):
+            self.tree[k]
+            seen.append(k)
+        self.assertEqual(seen, keys[::-1])
+        seen = []
+        for (k, v) in self.tree.items():
+            self.assertEqual(self.tree[k], v)
+            seen.append(k)
+        self.assertEqual(seen, keys)
+
+    def test_find_range_splays_start(self):
+        self.assertEqual([k for (k, v) in self.tree.find_range(50, 55)],
+                         [50, 53, 54])
+        self.assertEqual(self.tree.root().key(), 50)
+
     def test_insertion(self): # "coverage"s all of _splay except zig-zag case
         inserted_key = 90
         self.tree[inserted_key] = self.val
@@ -6,10 +6,33 @@ ch10_directory = '../CH10_maps_hash_tables' # for MapBase
 sys.path.insert(0, os.path.abspath(ch8_directory))
 sys.path.insert(1, os.path.abspath(ch10_directory))
 
+import random
 import unittest
 
+from avl_tree_map import AVLTreeMap
+from red_black_tree_map import RedBlackTreeMap
+from splay_tree_map import SplayTreeMap
+from tree_aggregates import MAX, MIN, SUM, Aggregate
 from tree_map import TreeMap
 
+MAP_CLASSES = (TreeMap, AVLTreeMap, RedBlackTreeMap, SplayTreeMap)
+
+def random_maps(n=300, seed=0, aggregate=None):
+    """Generate (map, sorted keys) pairs, one per class in MAP_CLASSES, after
+    the same random insertions and deletions."""
+    for cls in MAP_CLASSES:
+        rng = random.Random(seed)
+        tmap, present = cls(aggregate=aggregate), set()
+        for i in range(n):
+            k = rng.randrange(2 * n)
+            if k in present and rng.random() < 0.4:
+                del tmap[k]
+                present.remove(k)
+            else:
+                tmap[k] = str(k)
+                present.add(k)
+        yield (tmap, sorted(present))
+
 class TestBasics(unittest.TestCase):
     """Most-basic tests that don't even use a mock tree object."""
 
@@ -317,6 +340,211 @@ class TestSimpleTreeMap(unittest.TestCase):
         with self.assertRaises(KeyError):
             del self.tree[9001]
 
+class TestIterativeSearch(unittest.TestCase):
+    """Search on trees deeper than the recursion limit."""
+
+    def setUp(self):
+        self.depth = sys.getrecursionlimit() + 500
+        self.tree = TreeMap()
+        for k in range(0, 2 * self.depth, 2): # sorted input: one long path
+            self.tree[k] = str(k)
+
+    def test_search_node_returns_match_or_last_node(self):
+        node = self.tree._search_node(self.tree._root, 10)
+        self.assertIsInstance(node, TreeMap._Node)
+        self.assertEqual(node._element._key, 10)
+        node = self.tree._search_node(self.tree._root, 11)
+        self.assertEqual(node._element._key, 12) # 11 would go left of 12
+
+    def test_accessors_on_deep_tree(self):
+        last = 2 * self.depth - 2
+        self.assertEqual(self.tree[last], str(last))
+        self.tree[last] = 'updated'
+        self.assertEqual(self.tree[last], 'updated')
+        self.assertEqual(self.tree.find_ge(last - 1), (last, 'updated'))
+        self.assertEqual(list(self.tree.find_range(last - 3)),
+                         [(last - 2, str(last - 2)), (last, 'updated')])
+        del self.tree[last]
+        self.assertEqual(len(self.tree), self.depth - 1)
+        with self.assertRaises(KeyError):
+            self.tree[last]
+
+class TestInorderIteration(unittest.TestCase):
+    """Node-level iteration over keys, values and items."""
+
+    def setUp(self):
+        self.tree = TreeMap()
+        for k in (44, 17, 88, 8, 32, 65, 97, 28, 54, 82, 93):
+            self.tree[k] = str(k)
+        self.keys = sorted(self.tree)
+
+    def test_reversed(self):
+        self.assertEqual(list(reversed(self.tree)), self.keys[::-1])
+        self.assertEqual(list(reversed(TreeMap())), [])
+
+    def test_items_and_values(self):
+        self.assertEqual(list(self.tree.items()),
+                         [(k, str(k)) for k in self.keys])
+        self.assertEqual(list(self.tree.values()), [str(k) for k in self.keys])
+        self.assertEqual(list(reversed(self.tree.values())),
+                         [str(k) for k in reversed(self.keys)])
+        self.assertEqual(len(self.tree.items()), len(self.keys))
+        self.assertIn((32, '32'), self.tree.items())
+
+    def test_iter_nodes_from_start(self):
+        for start in (0, 8, 30, 32, 60, 97, 100):
+            expected = [k for k in self.keys if k >= start]
+            self.assertEqual([node._element._key for node in
+                              self.tree._iter_nodes(start)], expected)
+
+    def test_find_range_bounds(self):
+        self.assertEqual([k for (k, v) in self.tree.find_range(30, 88)],
+                         [32, 44, 54, 65, 82])
+        self.assertEqual(list(self.tree.find_range(98)), [])
+        self.assertEqual(list(TreeMap().find_range(1, 2)), [])
+
+    def test_deep_tree(self):
+        tree = TreeMap()
+        n = sys.getrecursionlimit() + 500
+        for k in range(n, 0, -1): # one long path of left children
+            tree[k] = k
+        self.assertEqual(list(tree), list(range(1, n + 1)))
+        self.assertEqual(list(reversed(tree)), list(range(n, 0, -1)))
+
+class TestOrderStatistics(unittest.TestCase):
+    """Subtree sizes and the queries built on them, for every subclass."""
+
+    def check_sizes(self, node):
+        """Assert subtree sizes are right below node; return node's size."""
+        if node is None:
+            return 0
+        size = 1 + self.check_sizes(node._left) + self.check_sizes(node._right)
+        self.assertEqual(node._size, size)
+        return size
+
+    def test_sizes_maintained(self):
+        for (tmap, keys) in random_maps():
+            with self.subTest(cls=type(tmap).__name__):
+                self.assertEqual(self.check_sizes(tmap._root), len(keys))
+
+    def test_rank_and_select(self):
+        for (tmap, keys) in random_maps():
+            with self.subTest(cls=type(tmap).__name__):
+                for (i, k) in enumerate(keys):
+                    self.assertEqual(tmap.select(i), (k, str(k)))
+                    self.assertEqual(tmap.rank(k), i)
+                    self.assertEqual(tmap.rank(k + 0.5), i + 1)
+                self.assertEqual(tmap.rank(-1), 0)
+                with self.assertRaises(IndexError):
+                    tmap.select(len(keys))
+                with self.assertRaises(IndexError):
+                    tmap.select(-1)
+
+    def test_count_range(self):
+        for (tmap, keys) in random_maps():
+            with self.subTest(cls=type(tmap).__name__):
+                for (start, stop) in ((None, None), (100, 400), (None, 250),
+                                      (250, None), (400, 100), (-5, 9999)):
+                    expected = len(list(tmap.find_range(start, stop)))
+                    self.assertEqual(tmap.count_range(start, stop), expected)
+
+    def test_percentile_and_median(self):
+        tmap = AVLTreeMap()
+        self.assertIsNone(tmap.median())
+        for k in range(1, 11):
+            tmap[k] = k
+        self.assertEqual(tmap.median(), (5, 5))
+        self.assertEqual(tmap.percentile(0), (1, 1))
+        self.assertEqual(tmap.percentile(91), (10, 10))
+        self.assertEqual(tmap.percentile(100), (10, 10))
+        with self.assertRaises(ValueError):
+            tmap.percentile(101)
+
+class TestRangeAggregates(unittest.TestCase):
+    """reduce_range over subtree aggregates, for every subclass."""
+
+    RANGES = ((None, None), (100, 400), (None, 250), (250, None), (400, 100),
+              (-5, 9999), (17, 18), (599, 600))
+
+    def check_aggregate(self, aggregate, expected):
+        """Compare reduce_range with expected(list of (key, value) pairs)."""
+        for (tmap, keys) in random_maps(aggregate=aggregate):
+            with self.subTest(cls=type(tmap).__name__):
+                for (start, stop) in self.RANGES:
+                    items = list(tmap.find_range(start, stop))
+                    self.assertEqual(tmap.reduce_range(start, stop),
+                                     expected(items))
+
+    def test_key_order_is_kept(self):
+        concat = Aggregate(lambda a, b: a + b, (), lambda k, v: (k,))
+        self.check_aggregate(concat,
+                             lambda items: tuple(k for (k, v) in items))
+
+    def test_sum_min_max(self):
+        keys = Aggregate(lambda a, b: a + b, 0, lambda k, v: k)
+        self.check_aggregate(keys, lambda items: sum(k for (k, v) in items))
+        largest = Aggregate(MAX.combine, MAX.identity, lambda k, v: k)
+        self.check_aggregate(largest, lambda items: max(
+            (k for (k, v) in items), default=MAX.identity))
+
+    def test_values_and_overwrites(self):
+        for cls in MAP_CLASSES:
+            tmap = cls(aggregate=SUM)
+            for k in range(50):
+                tmap[k] = k
+            tmap[10] = 1000 # overwrite changes the sums above it
+            del tmap[20]
+            self.assertEqual(tmap.reduce_range(), sum(range(50)) + 990 - 20)
+            self.assertEqual(tmap.reduce_range(10, 11), 1000)
+            self.assertEqual(tmap.reduce_range(20, 21), 0)
+            tmap = cls(aggregate=MIN)
+            self.assertEqual(tmap.reduce_range(), MIN.identity)
+
+    def test_interval_max(self):
+        """Intervals keyed by start, valued by end: does any interval starting
+        before x reach past it?"""
+        tmap = RedBlackTreeMap(aggregate=MAX)
+        for (start, end) in ((1, 3), (2, 9), (5, 6), (7, 8), (10, 12)):
+            tmap[start] = end
+        self.assertEqual(tmap.reduce_range(None, 5), 9)
+        self.assertEqual(tmap.reduce_range(5, 10), 8)
+
+    def test_requires_aggregate(self):
+        with self.assertRaises(ValueError):
+            TreeMap().reduce_range()
+
+class TestFromSorted(unittest.TestCase):
+    """Bulk loading from sorted or unsorted input, for every subclass."""
+
+    def test_sorted_input(self):
+        for cls in MAP_CLASSES:
+            tmap = cls.from_sorted([(k, str(k)) for k in range(100)])
+            self.assertIsInstance(tmap, cls)
+            self.assertEqual(list(tmap.items()),
+                             [(k, str(k)) for k in range(100)])
+            self.assertEqual(tmap.select(37), (37, '37'))
+            self.assertLessEqual(self.height(tmap._root), 7) # log2(100) + 1
+
+    def height(self, node):
+        if node is None:
+            return 0
+        return 1 + max(self.height(node._left), self.height(node._right))
+
+    def test_unsorted_input_and_duplicates(self):
+        pairs = [(5, 'a'), (1, 'b'), (5, 'c'), (3, 'd'), (1, 'e'), (5, 'f')]
+        for cls in MAP_CLASSES:
+            tmap = cls.from_sorted(pairs)
+            self.assertEqual(list(tmap.items()), [(1, 'e'), (3, 'd'),
+                                                  (5, 'f')])
+            self.assertEqual(tmap.rank(5), 2)
+
+    def test_mapping_and_aggregate(self):
+        tmap = AVLTreeMap.from_sorted({k: k for k in range(10)},
+                                      aggregate=SUM)
+        self.assertEqual(tmap.reduce_range(), 45)
+        self.assertEqual(tmap.reduce_range(3, 6), 12)
+        self.assertEqual(len(TreeMap.from_sorted([])), 0)
+
 class TestRestructure(unittest.TestCase):
     """Specialized ad hoc tests to confirm _restructure correctly performs a trinode
     restructuring."""
@@ -0,0 +1,40 @@
+"""Monoid aggregates for TreeMap's augmented nodes.
+
+Pass one to a tree map's constructor, e.g. AVLTreeMap(aggregate=SUM), and
+every node keeps the aggregate of its subtree, so reduce_range(start, stop)
+combines O(log n) stored values instead of visiting every item in range.
+"""
+
+import math
+import operator
+
+class Aggregate:
+    """An associative combine function with an identity element, applied to
+    a measure of each item.
+
+    combine need not be commutative: items are always combined in key order.
+    """
+
+    def __init__(self, combine, identity, measure=None):
+        """Create an aggregate.
+
+        Args:
+            combine (callable): Associative function of two measures.
+            identity: Value x with combine(x, y) == combine(y, x) == y for
+                every y; the result over an empty range.
+            measure (callable): Function of (key, value) giving the item's
+                contribution. The value itself if None.
+        """
+        self.combine = combine
+        self.identity = identity
+        if measure is not None:
+            self.measure = measure
+
+    def measure(self, k, v):
+        """Return the contribution of the item with key k and value v."""
+        return v
+
+SUM = Aggregate(operator.add, 0) # sum of values
+MIN = Aggregate(min, math.inf) # least value
+MAX = Aggregate(max, -math.inf) # greatest value; with (start, end) intervals
+    # keyed by start and valued by end, the classic interval-tree augmentation
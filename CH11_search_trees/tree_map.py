@@ -9,8 +9,34 @@ sys.path.insert(1, os.path.abspath(ch10_directory))
 from linked_binary_tree import LinkedBinaryTree
 from map_base_abc import MapBase
 
+from collections.abc import ItemsView, Mapping, ValuesView
+from operator import itemgetter
+
 class TreeMap(LinkedBinaryTree, MapBase):
-    """Sorted map implementation using a binary search tree."""
+    """Sorted map implementation using a binary search tree.
+
+    Every node records the size of its subtree, which _rotate and the
+    nonpublic updaters keep current, so the order-statistic queries (rank,
+    select, count_range, percentile, median) take time proportional to the
+    height of the tree. A map created with an aggregate from tree_aggregates
+    keeps that aggregate of each subtree the same way, for reduce_range.
+    """
+
+    #### Nested _Node class ####
+    class _Node(LinkedBinaryTree._Node):
+        """Node class that also counts the nodes in its subtree."""
+        __slots__ = '_size', '_agg' # node count and aggregate of subtree
+
+        def __init__(self, element, parent=None, left=None, right=None):
+            super().__init__(element, parent, left, right)
+            self._size = 1 # new nodes are leaves; callers update ancestors
+            self._agg = None # set by TreeMap._recompute if map aggregates
+
+        def left_size(self):
+            return self._left._size if self._left is not None else 0
+
+        def right_size(self):
+            return self._right._size if self._right is not None else 0
 
     #### override LinkedBinaryTree's Position class ####
     class Position(LinkedBinaryTree.Position):
@@ -22,7 +48,109 @@ class TreeMap(LinkedBinaryTree, MapBase):
             """Return value from the position's key-value pair."""
             return self.element()._value
 
+    def __init__(self, aggregate=None):
+        """Create an empty map.
+
+        Args:
+            aggregate (Aggregate): Monoid from tree_aggregates to maintain
+                over every subtree, for reduce_range. None for no aggregate.
+        """
+        super().__init__()
+        self._aggregate = aggregate
+        self._rotations = 0 # lets iterators notice that the tree changed shape
+
+    #### Bulk loading ####
+
+    @classmethod
+    def from_sorted(cls, items, **kwargs):
+        """Return a new map holding the (key, value) pairs of items, built
+        as a perfectly balanced tree in O(n) time.
+
+        Items in strictly increasing key order are linked up directly, with
+        no searches or rotations. Otherwise they are sorted first, and if a
+        key appears more than once, its last value wins.
+
+        Args:
+            items: Iterable of (key, value) pairs, or a mapping.
+            **kwargs: Passed through to the map's constructor.
+        """
+        tmap = cls(**kwargs)
+        if isinstance(items, Mapping):
+            items = items.items()
+        pairs = list(items)
+        if any(not a[0] < b[0] for (a, b) in zip(pairs, pairs[1:])):
+            pairs.sort(key=itemgetter(0)) # stable, so later duplicates last
+            pairs = [pairs[i] for i in range(len(pairs))
+                     if i + 1 == len(pairs) or pairs[i][0] < pairs[i + 1][0]]
+        tmap._size = len(pairs)
+        tmap._root = tmap._build_balanced(pairs, 0, len(pairs), None, 0)[0]
+        return tmap
+
+    def _build_balanced(self, pairs, lo, hi, parent, depth):
+        """Link pairs[lo:hi] into a balanced subtree under node parent.
+
+        Return (subtree root node or None, subtree height).
+        """
+        if lo >= hi:
+            return (None, 0)
+        mid = (lo + hi) // 2 # middle pair becomes the subtree root
+        node = self._Node(self._Item(*pairs[mid]), parent)
+        node._left, left_height = self._build_balanced(pairs, lo, mid, node,
+                                                       depth + 1)
+        node._right, right_height = self._build_balanced(pairs, mid + 1, hi,
+                                                         node, depth + 1)
+        height = 1 + max(left_height, right_height)
+        self._recompute(node) # size and aggregate, after both children
+        self._rebalance_build(node, depth, height)
+        return (node, height)
+
+    #### Views over items and values ####
+        # MutableMapping's default views look every key up again (which
+        #   splays a SplayTreeMap on each step); these walk the nodes.
+
+    class _ItemsView(ItemsView):
+        def __iter__(self):
+            for node in self._mapping._iter_nodes():
+                yield (node._element._key, node._element._value)
+
+        def __reversed__(self):
+            for node in self._mapping._iter_nodes_reversed():
+                yield (node._element._key, node._element._value)
+
+    class _ValuesView(ValuesView):
+        def __iter__(self):
+            for node in self._mapping._iter_nodes():
+                yield node._element._value
+
+        def __reversed__(self):
+            for node in self._mapping._iter_nodes_reversed():
+                yield node._element._value
+
+    def items(self):
+        """Return a view of the (key, value) pairs, in key order."""
+        return self._ItemsView(self)
+
+    def values(self):
+        """Return a view of the values, in key order."""
+        return self._ValuesView(self)
+
     #### nonpublic utilities ####
+    def _search_node(self, node, k):
+        """Return the node of node's subtree having key k, or the last node
+        searched.
+
+        Walks the _Node links iteratively, so it creates no Positions and
+        can't hit the recursion limit however unbalanced the tree is.
+        """
+        while True:
+            key = node._element._key
+            if k == key: # found match
+                return node
+            child = node._left if k < key else node._right
+            if child is None: # no match; node is the last one searched
+                return node
+            node = child
+
     def _subtree_search(self, p, k):
         """Return Position of p's subtree having key k, or last node
         searched.
@@ -31,18 +159,66 @@ class TreeMap(LinkedBinaryTree, MapBase):
             p (Position): Root Position of the subtree that will be searched.
             k (any): Value of key to search for. Of appropriate type for the tree.
         """
-            # TODO ^ or won't the keys actually always be hashed to ints for
-            #   purposes of the ultimate, underlying tree?
-        #print(f"SEARCHING p.key()={p.key()} FOR k={k}")
-        if k == p.key(): # base case 1: found match
-            return p
-        elif k < p.key(): # search left subtree recursively
-            if self.left(p) is not None:
-                return self._subtree_search(self.left(p), k)
-        else: # search right subtree recursively
-            if self.right(p) is not None:
-                return self._subtree_search(self.right(p), k)
-        return p # base case 2: No match, return the final node searched
+        return self._make_position(self._search_node(p._node, k))
+
+    def _iter_nodes(self, start=None):
+        """Generate the nodes in key order, beginning with the least key
+        greater than or equal to start (with the minimum key if start is
+        None).
+
+        Keeps the nodes still to be visited on an explicit stack, so it
+        creates no Positions and never climbs back up through parents. A
+        rotation, which a splay tree makes on every access, leaves the stack
+        stale, so after one it is rebuilt past the last node yielded.
+        """
+        if start is None:
+            stack = self._iter_stack(lambda k: False)
+        else:
+            stack = self._iter_stack(lambda k: k < start)
+        rotations = self._rotations
+        while stack:
+            node = stack.pop()
+            yield node
+            if self._rotations != rotations: # tree restructured meanwhile
+                rotations = self._rotations
+                last = node._element._key
+                stack = self._iter_stack(lambda k: not last < k)
+                continue
+            node = node._right # then everything between node and stack[-1]
+            while node is not None:
+                stack.append(node)
+                node = node._left
+
+    def _iter_nodes_reversed(self):
+        """Generate the nodes in decreasing key order, as _iter_nodes."""
+        stack = self._iter_stack(lambda k: False, reverse=True)
+        rotations = self._rotations
+        while stack:
+            node = stack.pop()
+            yield node
+            if self._rotations != rotations:
+                rotations = self._rotations
+                last = node._element._key
+                stack = self._iter_stack(lambda k: not k < last, reverse=True)
+                continue
+            node = node._left
+            while node is not None:
+                stack.append(node)
+                node = node._right
+
+    def _iter_stack(self, skip, reverse=False):
+        """Return the stack an in-order walk (in decreasing order if reverse)
+        starts from: the nodes on the way down from the root whose keys k
+        don't satisfy skip(k), with the first one to visit on top."""
+        stack = []
+        node = self._root
+        while node is not None:
+            if skip(node._element._key): # node and its near side come before
+                node = node._left if reverse else node._right
+            else:
+                stack.append(node)
+                node = node._right if reverse else node._left
+        return stack
 
     def _subtree_first_position(self, p):
         """Return Position of first item (item with minimum key in the tree)
@@ -113,7 +289,7 @@ class TreeMap(LinkedBinaryTree, MapBase):
         if self.is_empty():
             return None
         else:
-            p = self._subtree_search(self.root(), k)
+            p = self._make_position(self._search_node(self._root, k))
             self._rebalance_access(p)  # hook for balanced-tree subclasses
             return p
 
@@ -142,17 +318,149 @@ class TreeMap(LinkedBinaryTree, MapBase):
         If start is None, iteration begins with minimum key in the map.
         If stop is None, iteration continues through the maximum key in the map.
         """
-        if not self.is_empty():
-            if start is None:
-                p = self.first()
+        if start is not None and not self.is_empty():
+            self.find_position(start) # access hook, e.g. splays near start
+        for node in self._iter_nodes(start):
+            item = node._element
+            if stop is not None and not item._key < stop:
+                break
+            yield (item._key, item._value)
+
+    #### Order statistics ####
+
+    def rank(self, k) -> int:
+        """Return the number of keys strictly less than k."""
+        r = 0
+        node = self._root
+        while node is not None:
+            if node._element._key < k: # node and its left subtree count
+                r += 1 + node.left_size()
+                node = node._right
             else:
-                # Initialize p with logic similar to find_ge().
-                p = self.find_position(start)
-                if p.key() < start: # If there's no key exactly equal to start 
-                    p = self.after(p)
-            while p is not None and (stop is None or p.key() < stop):
-                yield (p.key(), p.value())
-                p = self.after(p)
+                node = node._left
+        return r
+
+    def select(self, i: int):
+        """Return (key, value) pair with the i-th smallest key, counting from 0.
+
+        Raise IndexError unless 0 <= i < len(self).
+        """
+        if not 0 <= i < len(self):
+            raise IndexError(f'IndexError: {repr(i)}')
+        node = self._root
+        while True:
+            left = node.left_size()
+            if i < left:
+                node = node._left
+            elif i == left:
+                return (node._element._key, node._element._value)
+            else: # skip node and its left subtree
+                i -= left + 1
+                node = node._right
+
+    def count_range(self, start=None, stop=None) -> int:
+        """Return the number of keys such that start <= key < stop.
+
+        start and stop being None mean the same as in find_range.
+        """
+        low = 0 if start is None else self.rank(start)
+        high = len(self) if stop is None else self.rank(stop)
+        return max(high - low, 0)
+
+    def percentile(self, p):
+        """Return (key, value) pair at the p-th percentile of the keys, by the
+        nearest-rank method (or None if empty).
+
+        That is the smallest key such that at least p percent of the keys are
+        less than or equal to it. Raise ValueError unless 0 <= p <= 100.
+        """
+        if not 0 <= p <= 100:
+            raise ValueError('percentile must be between 0 and 100')
+        n = len(self)
+        if n == 0:
+            return None
+        r = -(-p * n // 100) # ceil(p * n / 100), the 1-based nearest rank
+        return self.select(max(int(r), 1) - 1)
+
+    def median(self):
+        """Return (key, value) pair with the median key (or None if empty).
+
+        For an even number of keys, this is the lower of the middle two.
+        """
+        return self.percentile(50)
+
+    #### Range aggregates ####
+
+    def _measure(self, node):
+        return self._aggregate.measure(node._element._key,
+                                       node._element._value)
+
+    def _reduce_ge(self, node, start):
+        """Return the aggregate of the keys >= start in node's subtree."""
+        agg = self._aggregate
+        if node is None:
+            return agg.identity
+        if start is None:
+            return node._agg
+        pieces = [] # from the right end of the range leftward
+        while node is not None:
+            if node._element._key < start:
+                node = node._right
+            else: # node and its right subtree are all in range
+                piece = self._measure(node)
+                if node._right is not None:
+                    piece = agg.combine(piece, node._right._agg)
+                pieces.append(piece)
+                node = node._left
+        result = agg.identity
+        for piece in reversed(pieces):
+            result = agg.combine(result, piece)
+        return result
+
+    def _reduce_lt(self, node, stop):
+        """Return the aggregate of the keys < stop in node's subtree."""
+        agg = self._aggregate
+        if node is None:
+            return agg.identity
+        if stop is None:
+            return node._agg
+        result = agg.identity
+        while node is not None:
+            if node._element._key < stop: # node and its left subtree in range
+                if node._left is not None:
+                    result = agg.combine(result, node._left._agg)
+                result = agg.combine(result, self._measure(node))
+                node = node._right
+            else:
+                node = node._left
+        return result
+
+    def reduce_range(self, start=None, stop=None):
+        """Return the aggregate over all items such that start <= key < stop,
+        combining O(log n) stored subtree aggregates on a balanced tree.
+
+        start and stop being None mean the same as in find_range. Return the
+        aggregate's identity if there are no such items. Raise ValueError if
+        the map was created without an aggregate.
+        """
+        agg = self._aggregate
+        if agg is None:
+            raise ValueError('map was created without an aggregate')
+        node = self._root
+        while node is not None: # find the top node in range, if any
+            key = node._element._key
+            if stop is not None and not key < stop:
+                node = node._left
+            elif start is not None and key < start:
+                node = node._right
+            else:
+                break
+        if node is None:
+            return agg.identity
+        # All of node's left subtree is < stop and all of its right >= start
+        result = agg.combine(self._reduce_ge(node._left, start),
+                             self._measure(node))
+        return agg.combine(result, self._reduce_lt(node._right, stop))
 
     #### Accessor and updater methods ####
 
@@ -161,20 +469,23 @@ class TreeMap(LinkedBinaryTree, MapBase):
         if self.is_empty():
             raise KeyError(f'KeyError: {repr(k)}')
         else:
-            p = self._subtree_search(self.root(), k)
+            node = self._search_node(self._root, k)
+            p = self._make_position(node) # the only Position created
             self._rebalance_access(p) # hook for balanced-tree subclass
-            if k != p.key():
+            if k != node._element._key:
                 raise KeyError(f'KeyError: {repr(k)}')
-            return p.value()
+            return node._element._value
 
     def __setitem__(self, k, v):
         """Assign value v to key k, overwriting existing value if present."""
         if self.is_empty(): # Easy case where new kvp is simply the root
             leaf = self._add_root(self._Item(k, v)) # from LinkedBinaryTree
         else:
-            p = self._subtree_search(self.root(), k)
+            p = self._make_position(self._search_node(self._root, k))
             if p.key() == k: # If that key is already in the tree
                 p.element()._value = v # Replace existing item's value
+                if self._aggregate is not None:
+                    self._refresh_path(p._node)
                 self._rebalance_access(p) # hood for balanced-tree subclass
                 return
             else: # If key k is new to the tree...
@@ -187,10 +498,13 @@ class TreeMap(LinkedBinaryTree, MapBase):
 
     def __iter__(self):
         """Generate an iteration of all keys in the map in order."""
-        p = self.first() # Abstractions from the traversal methods have already done nearly
-        while p is not None: # all the work. 
-            yield p.key()
-            p = self.after(p)
+        for node in self._iter_nodes(): # no Positions, no parent walks
+            yield node._element._key
+
+    def __reversed__(self):
+        """Generate an iteration of all keys in the map in reverse order."""
+        for node in self._iter_nodes_reversed():
+            yield node._element._key
 
     def delete(self, p):
         """Remove the item at given Position."""
@@ -208,13 +522,64 @@ class TreeMap(LinkedBinaryTree, MapBase):
     def __delitem__(self, k):
         """Remove item associated with key k (raise KeyError if not found)."""
         if not self.is_empty():
-            p = self._subtree_search(self.root(), k)
+            p = self._make_position(self._search_node(self._root, k))
             if k == p.key():
                 self.delete(p) # rely on positional version
                 return # successful deletion complete
             self._rebalance_access(p) # hook for balanced tree subclasses
         raise KeyError(f'KeyError: {repr(k)}')
 
+    #### Structural updaters that maintain subtree summaries ####
+
+    def _recompute(self, node) -> None:
+        """Recompute node's subtree size and aggregate from its children."""
+        node._size = 1 + node.left_size() + node.right_size()
+        agg = self._aggregate
+        if agg is not None:
+            value = self._measure(node)
+            if node._left is not None:
+                value = agg.combine(node._left._agg, value)
+            if node._right is not None:
+                value = agg.combine(value, node._right._agg)
+            node._agg = value
+
+    def _refresh_path(self, node) -> None:
+        """Recompute node and each of its ancestors, bottom up."""
+        while node is not None:
+            self._recompute(node)
+            node = node._parent
+
+    def _add_root(self, e):
+        root = super()._add_root(e)
+        self._recompute(root._node)
+        return root
+
+    def _add_left(self, p, e):
+        leaf = super()._add_left(p, e)
+        self._refresh_path(leaf._node)
+        return leaf
+
+    def _add_right(self, p, e):
+        leaf = super()._add_right(p, e)
+        self._refresh_path(leaf._node)
+        return leaf
+
+    def _replace(self, p, e):
+        old = super()._replace(p, e)
+        if self._aggregate is not None: # sizes don't change
+            self._refresh_path(p._node)
+        return old
+
+    def _delete(self, p):
+        parent = self._validate(p)._parent
+        element = super()._delete(p)
+        self._refresh_path(parent)
+        return element
+
+    def _attach(self, p, t1, t2) -> None:
+        super()._attach(p, t1, t2)
+        self._refresh_path(p._node)
+
     #### Hooks for rebalancer methods ####
 
     def _rebalance_access(self, p):
@@ -230,6 +595,17 @@ class TreeMap(LinkedBinaryTree, MapBase):
     def _rebalance_delete(self, p):
         pass
 
+    def _rebalance_build(self, node, depth: int, height: int):
+        """Set any balance data of a node just linked in by from_sorted.
+
+        Args:
+            node (_Node): Node whose subtrees are complete.
+            depth (int): Number of edges from the root down to node.
+            height (int): Number of nodes on the longest path from node down
+                to a leaf, counting both.
+        """
+        pass
+
     #### Nonpublic methods for rotating and restructuring
         # Factory-ed here for reusability in inheritor classes
 
@@ -267,6 +643,9 @@ class TreeMap(LinkedBinaryTree, MapBase):
         else:
             self._relink(y, x._left, False) # x._left becomes right child of y
             self._relink(x, y, True) # y becomes left child of x
+        self._recompute(y) # y is now x's child, so it goes first
+        self._recompute(x)
+        self._rotations += 1
 
     def _restructure(self, x) -> Position:
         """Perform trinode restructure of Position x with parent/grandparent."""